@@ -1,54 +1,156 @@
 """
 Flask API 主应用
 """
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, stream_with_context
 from flask_cors import CORS
 import pandas as pd
+import numpy as np
+import functools
+import json
 import os
 import sys
+import threading
 
 # 添加路径
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from app.services.model_registry import ModelRegistry, ModelWatcher, local_model_path
+from app.services.micro_batcher import MicroBatcher
+from app.services.prediction_cache import PredictionCache
 from app.services.predictor import ResumePredictor
+from app.services.candidate_index import CandidateIndex
+from app.services.pool_scores import PoolScores
+from app.services.resume_index import ResumeIndex
+from app.services.scoring_jobs import ScoringJobs
+from app.services.statistics import ResumeStatistics
+from app.utils.resume_store import default_store_dir, load_resume_data
+from app.utils.resume_stream import CSV, iter_stream_chunks, stream_format
 
 app = Flask(__name__)
 CORS(app)
 
-# 加载模型
-MODEL_PATH = os.path.join(os.path.dirname(__file__), 'trained_models', 'resume_model.pkl')
+# 加载模型：优先使用模型注册表中当前发布的版本，并在发布新版本时热加载
+REGISTRY_DIR = os.path.join(os.path.dirname(__file__), 'trained_models', 'registry')
+# 注册表为空时使用的单独模型产物目录（不存在时使用旧版单文件模型 resume_model.pkl）
+MODEL_PATH = os.path.join(os.path.dirname(__file__), 'trained_models', 'resume_model')
+# 预测结果缓存的共享存储（SQLite 文件），设为 None 时只在进程内缓存；多个工作进程时可共享彼此的结果
+PREDICTION_CACHE_DB = None
+# 单条预测合批：收集 MICRO_BATCH_WAIT_MS 毫秒内（至多 MICRO_BATCH_SIZE 条）并发到达的请求一起预测
+MICRO_BATCH_WAIT_MS = 2.0
+MICRO_BATCH_SIZE = 64
+# 候选池通过概率的磁盘缓存目录（按模型版本与候选池内容保存），重启后无需重新预测
+POOL_SCORES_DIR = os.path.join(os.path.dirname(__file__), 'trained_models', 'pool_scores')
 DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Chinese_resume_data.csv')
+STORE_DIR = default_store_dir(DATA_PATH)
+MAX_BULK_RESUMES = 1000
+# 流式批量预测每块的简历数
+STREAM_CHUNK_ROWS = 5000
+# 后台批量打分任务目录（已完成块的结果作为检查点）与同时运行的任务数上限（本机所有服务进程共用）
+JOBS_DIR = os.path.join(os.path.dirname(__file__), 'trained_models', 'jobs')
+MAX_SCORING_JOBS = 1
+# 一次查询返回的任务结果条数上限
+MAX_JOB_RESULTS = 10000
 
 predictor = None
+model_registry = ModelRegistry(REGISTRY_DIR)
+model_watcher = None
+prediction_cache = None
+prediction_batcher = MicroBatcher(lambda: predictor, MICRO_BATCH_SIZE, MICRO_BATCH_WAIT_MS)
+pool_scores = PoolScores(POOL_SCORES_DIR)
+scoring_jobs = ScoringJobs(JOBS_DIR, MAX_SCORING_JOBS)
 resume_df = None
+candidate_index = None
+resume_index = None
+statistics = None
+# 简历数据的写锁：新增简历与切换模型（重新计算候选池通过概率）互斥，
+# 新的数据结构在锁内构建好后一起替换，处理中的请求继续读取原来的对象
+data_lock = threading.Lock()
 
 
-def init_app():
-    """初始化应用"""
-    global predictor, resume_df
-    
-    if os.path.exists(MODEL_PATH):
-        predictor = ResumePredictor(MODEL_PATH)
-        print(f"✓ 模型加载成功: {MODEL_PATH}")
-    else:
-        print(f"✗ 模型文件不存在: {MODEL_PATH}")
-        print("  请先运行 python train_model.py 训练模型")
+def set_predictor(new_predictor):
+    """切换预测器：新模型完整加载、候选池通过概率重新计算后才替换引用，处理中的请求继续使用原预测器"""
+    global predictor, candidate_index
+    with data_lock:
+        new_candidate_index = candidate_index
+        if new_candidate_index is not None:
+            # 在副本上重新计算后整体替换，处理中的匹配请求继续使用原索引与原通过概率
+            new_candidate_index = new_candidate_index.copy()
+            score_pool(new_candidate_index, resume_df, new_predictor)
+        predictor, candidate_index = new_predictor, new_candidate_index
+
+
+def score_pool(index, df, model):
+    """用指定模型为候选池中的全体候选人计算通过概率，供匹配时综合排序"""
+    index.set_pass_probabilities(pool_scores.compute(model, df), model.cache_namespace)
+
+
+def numeric_column_error(new_df, dtypes):
+    """校验新增简历中的数值列（整数列不可缺失），返回具体到简历与字段的错误信息（合法时返回None）"""
+    for column, dtype in dtypes.items():
+        if not pd.api.types.is_numeric_dtype(dtype):
+            continue
+        raw = new_df[column]
+        values = pd.to_numeric(raw.where(~raw.map(lambda value: isinstance(value, bool))), errors='coerce')
+        checks = [(values.isna() & raw.notna(), '必须为数字')]
+        if pd.api.types.is_integer_dtype(dtype):
+            checks += [(raw.isna(), '不能为空'), (values.notna() & (values % 1 != 0), '必须为整数')]
+        for invalid, message in checks:
+            if invalid.any():
+                return f'第 {int(np.flatnonzero(invalid)[0]) + 1} 条简历的 {column} {message}'
+    return None
+
+
+def init_app(watch=True):
+    """初始化应用
+
+    watch 为 False 时不启动模型热加载与批量打分任务调度线程（预先 fork 的服务在每个工作进程中各自启动）。
+    """
+    global predictor, model_watcher, prediction_cache, resume_df, candidate_index, resume_index, statistics
+
+    prediction_cache = PredictionCache(db_path=PREDICTION_CACHE_DB)
+    load_predictor = functools.partial(ResumePredictor, cache=prediction_cache)
+    model_watcher = ModelWatcher(model_registry, load_predictor, set_predictor)
+    if model_watcher.check() is None:
+        model_path = local_model_path(MODEL_PATH)
+        if os.path.exists(model_path):
+            predictor = load_predictor(model_path)
+            print(f"✓ 模型加载成功: {model_path}（{predictor.load_seconds * 1000:.1f}ms）")
+        else:
+            print(f"✗ 模型文件不存在: {REGISTRY_DIR}")
+            print("  请先运行 python train_model.py 训练模型")
+    if watch:
+        model_watcher.start()
+        scoring_jobs.start()
     
-    if os.path.exists(DATA_PATH):
-        resume_df = pd.read_csv(DATA_PATH)
+    if os.path.exists(DATA_PATH) or os.path.exists(STORE_DIR):
+        resume_df = load_resume_data(DATA_PATH, STORE_DIR, shared=True)
         print(f"✓ 数据加载成功: {len(resume_df)} 条记录")
+        candidate_index = CandidateIndex(resume_df)
+        print(f"✓ 候选人索引构建完成: {len(candidate_index.skill_vocab)} 项技能")
+        if predictor is not None:
+            score_pool(candidate_index, resume_df, predictor)
+        resume_index = ResumeIndex(resume_df)
+        statistics = ResumeStatistics(resume_df)
     else:
         print(f"✗ 数据文件不存在: {DATA_PATH}")
 
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    """健康检查"""
+    """健康检查：模型与数据都已加载时就绪，否则返回503"""
+    ready = predictor is not None and resume_df is not None
     return jsonify({
-        'status': 'ok',
+        'status': 'ok' if ready else 'unavailable',
+        'ready': ready,
         'model_loaded': predictor is not None,
-        'data_loaded': resume_df is not None
-    })
+        'data_loaded': resume_df is not None,
+        'model': None if predictor is None else {
+            'version': predictor.version,
+            'compiled': predictor.engine is not None,
+            'threshold': predictor.threshold,
+            'load_ms': round(predictor.load_seconds * 1000, 1)
+        }
+    }), 200 if ready else 503
 
 
 @app.route('/api/predict/single', methods=['POST'])
@@ -59,7 +161,8 @@ def predict_single():
     
     try:
         resume_data = request.json
-        result = predictor.predict_single(resume_data)
+        # 与同时到达的其他单条请求合并为一批预测
+        result = prediction_batcher.predict(resume_data)
         return jsonify(result)
     except Exception as e:
         return jsonify({'error': str(e)}), 400
@@ -79,24 +182,157 @@ def predict_batch():
         return jsonify({'error': str(e)}), 400
 
 
+@app.route('/api/predict/stream', methods=['POST'])
+def predict_stream():
+    """流式批量预测
+
+    请求体为 NDJSON（每行一份简历）或与数据集列格式相同的 CSV（Content-Type: text/csv），
+    边读取边按 STREAM_CHUNK_ROWS 条分块预测，结果以 NDJSON 逐行返回，与输入逐条对应。
+    """
+    if predictor is None:
+        return jsonify({'error': '模型未加载'}), 500
+    
+    model = predictor
+    chunks = iter_stream_chunks(request.stream, stream_format(request.content_type), STREAM_CHUNK_ROWS)
+    
+    def generate():
+        try:
+            for chunk in chunks:
+                yield ''.join(json.dumps(result) + '\n' for result in model.predict_batch(chunk))
+        except Exception as e:
+            # 响应已开始发送，错误作为最后一行返回
+            yield json.dumps({'error': str(e)}) + '\n'
+    
+    return app.response_class(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@app.route('/api/predict/cache', methods=['GET'])
+def get_prediction_cache_stats():
+    """预测结果缓存统计（本进程的命中、未命中、淘汰计数）"""
+    if prediction_cache is None:
+        return jsonify({'error': '缓存未初始化'}), 500
+    
+    try:
+        return jsonify(prediction_cache.stats())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+
+@app.route('/api/predict/batching', methods=['GET'])
+def get_prediction_batching_stats():
+    """单条预测合批统计（本进程的批次数、请求数、平均批大小）"""
+    try:
+        return jsonify(prediction_batcher.stats())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_scoring_job():
+    """提交后台批量打分任务，立即返回任务编号
+
+    三种提交方式：multipart 上传文件（字段 file，.csv 按 CSV 解析，其余按 NDJSON）；
+    请求体直接为 NDJSON 或 CSV（Content-Type: text/csv）；
+    JSON {"filters": {...}, "ids": [...]} 从已加载的简历库中选取（筛选条件同简历列表，均省略时为全部简历）。
+    """
+    if predictor is None:
+        return jsonify({'error': '模型未加载'}), 500
+    
+    try:
+        upload = request.files.get('file')
+        if upload is not None:
+            input_format = CSV if (upload.filename or '').lower().endswith('.csv') else stream_format(upload.content_type)
+            job = scoring_jobs.submit_stream(upload.stream, input_format, predictor)
+        elif request.is_json:
+            if resume_index is None:
+                return jsonify({'error': '数据未加载'}), 500
+            selection = request.get_json() or {}
+            filters = selection.get('filters') or {}
+            unknown = set(filters) - set(ResumeIndex.FILTER_COLUMNS)
+            if unknown:
+                return jsonify({'error': f"未知的筛选条件: {', '.join(sorted(unknown))}"}), 400
+            rows = resume_index.filter_rows(filters)
+            if selection.get('ids') is not None:
+                id_rows = resume_index.lookup_rows([int(value) for value in selection['ids']])
+                id_rows = id_rows[id_rows >= 0]
+                rows = id_rows if rows is None else id_rows[np.isin(id_rows, rows)]
+            selected = resume_df if rows is None else resume_df.iloc[rows]
+            job = scoring_jobs.submit_frame(selected, predictor)
+        else:
+            job = scoring_jobs.submit_stream(request.stream, stream_format(request.content_type), predictor)
+        return jsonify(job), 202
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+
+@app.route('/api/jobs', methods=['GET'])
+def list_scoring_jobs():
+    """批量打分任务列表（从新到旧）"""
+    try:
+        return jsonify({'jobs': scoring_jobs.list()})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_scoring_job(job_id):
+    """批量打分任务状态与进度"""
+    try:
+        job = scoring_jobs.get(job_id)
+        if job is None:
+            return jsonify({'error': '任务不存在'}), 404
+        return jsonify(job)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+
+@app.route('/api/jobs/<job_id>/results', methods=['GET'])
+def get_scoring_job_results(job_id):
+    """批量打分任务已完成部分的结果（与输入逐条对应），如 ?offset=0&limit=1000；任务未结束时返回部分结果"""
+    try:
+        offset = int(request.args.get('offset', 0))
+        limit = int(request.args.get('limit', 1000))
+        if offset < 0 or not 0 < limit <= MAX_JOB_RESULTS:
+            return jsonify({'error': f'offset 不能为负数，limit 须在 1 到 {MAX_JOB_RESULTS} 之间'}), 400
+        job = scoring_jobs.get(job_id)
+        if job is None:
+            return jsonify({'error': '任务不存在'}), 404
+        return jsonify({
+            'status': job['status'],
+            'completed_rows': job['completed_rows'],
+            'offset': offset,
+            'results': scoring_jobs.results(job_id, offset, limit)
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_scoring_job(job_id):
+    """取消批量打分任务：排队中的任务立即取消，运行中的任务在完成当前块后停止，已完成块的结果保留"""
+    try:
+        job = scoring_jobs.cancel(job_id)
+        if job is None:
+            return jsonify({'error': '任务不存在'}), 404
+        return jsonify(job)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+
 @app.route('/api/match/candidates', methods=['POST'])
 def match_candidates():
     """岗位匹配推荐"""
-    if predictor is None or resume_df is None:
+    if predictor is None or candidate_index is None:
         return jsonify({'error': '模型或数据未加载'}), 500
     
     try:
         job_requirements = request.json
         top_n = job_requirements.get('top_n', 10)
-        
-        # 过滤候选人
-        candidates = resume_df.copy()
-        
-        # 按岗位过滤
-        if job_requirements.get('position'):
-            candidates = candidates[candidates['意向岗位'] == job_requirements['position']]
-        
-        results = predictor.match_candidates(job_requirements, candidates, top_n)
+        offset = job_requirements.get('offset', 0)
+
+        # 按岗位过滤并在预构建的索引上打分；ml_weight > 0 时与预先算好的通过概率加权综合排序；
+        # 同一查询的排序结果已缓存时直接切片
+        results = candidate_index.match(job_requirements, top_n, offset)
         return jsonify({'candidates': results})
     except Exception as e:
         return jsonify({'error': str(e)}), 400
@@ -105,26 +341,30 @@ def match_candidates():
 @app.route('/api/resume/list', methods=['GET'])
 def get_resume_list():
     """获取简历列表"""
-    if resume_df is None:
+    if resume_index is None:
         return jsonify({'error': '数据未加载'}), 500
     
     try:
         page = int(request.args.get('page', 1))
         page_size = int(request.args.get('page_size', 20))
-        position = request.args.get('position', '')
+        filters = {
+            field: request.args.get(field, '') for field in ResumeIndex.FILTER_COLUMNS
+        }
         
-        # 过滤
-        filtered_df = resume_df.copy()
-        if position:
-            filtered_df = filtered_df[filtered_df['意向岗位'] == position]
+        # 传入 cursor 时按键集分页，深翻页同样只取当页数据
+        cursor = request.args.get('cursor')
+        if cursor is not None:
+            resumes, total, next_cursor = resume_index.page_after(filters, int(cursor), page_size)
+            return jsonify({
+                'resumes': resumes,
+                'total': total,
+                'page_size': page_size,
+                'total_pages': (total + page_size - 1) // page_size,
+                'next_cursor': next_cursor
+            })
         
         # 分页
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        
-        # 转换为字典并处理NaN值
-        resumes = filtered_df.iloc[start_idx:end_idx].fillna('NULL').to_dict('records')
-        total = len(filtered_df)
+        resumes, total = resume_index.page(filters, page, page_size)
         
         return jsonify({
             'resumes': resumes,
@@ -140,43 +380,111 @@ def get_resume_list():
 @app.route('/api/resume/<int:resume_id>', methods=['GET'])
 def get_resume_detail(resume_id):
     """获取简历详情"""
-    if resume_df is None:
+    if resume_index is None:
         return jsonify({'error': '数据未加载'}), 500
     
     try:
-        resume = resume_df[resume_df['简历编号'] == resume_id].to_dict('records')
-        if resume:
-            return jsonify(resume[0])
+        rows = resume_index.lookup_rows([resume_id])
+        if rows[0] >= 0:
+            return app.response_class(resume_index.to_json(rows)[1:-1], mimetype='application/json')
         else:
             return jsonify({'error': '简历不存在'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
 
-@app.route('/api/statistics/skills', methods=['GET'])
-def get_skill_statistics():
-    """技能统计"""
-    if resume_df is None:
+@app.route('/api/resume', methods=['GET'])
+def get_resumes_by_ids():
+    """按简历编号批量获取简历，如 /api/resume?ids=1,2,3"""
+    if resume_index is None:
+        return jsonify({'error': '数据未加载'}), 500
+    
+    try:
+        ids_text = request.args.get('ids', '')
+        resume_ids = [int(value) for value in ids_text.split(',') if value.strip()]
+        if not resume_ids:
+            return jsonify({'error': '缺少参数 ids'}), 400
+        if len(resume_ids) > MAX_BULK_RESUMES:
+            return jsonify({'error': f'一次最多查询 {MAX_BULK_RESUMES} 份简历'}), 400
+        
+        # 按请求顺序返回，不存在的编号列入 missing
+        rows = resume_index.lookup_rows(resume_ids)
+        found = rows >= 0
+        missing = json.dumps([resume_id for resume_id, ok in zip(resume_ids, found) if not ok])
+        body = f'{{"missing":{missing},"resumes":{resume_index.to_json(rows[found])}}}'
+        return app.response_class(body, mimetype='application/json')
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+
+@app.route('/api/resume', methods=['POST'])
+def add_resumes():
+    """新增简历"""
+    global resume_df, resume_index, statistics, candidate_index
+    
+    if resume_index is None:
         return jsonify({'error': '数据未加载'}), 500
     
     try:
-        skill_columns = ['编程语言', '前端技术', '后端技术', '数据库', '云计算/运维', '数据与算法', '移动开发', '测试工具']
-        skill_stats = {}
+        resume_list = request.json.get('resumes', [])
+        if not resume_list or not all(isinstance(resume, dict) for resume in resume_list):
+            return jsonify({'error': 'resumes 应为非空的简历对象列表'}), 400
         
-        for col in skill_columns:
-            skills = []
-            for value in resume_df[col].dropna():
-                if value != 'NULL':
-                    skills.extend([s.strip() for s in str(value).split(',')])
+        with data_lock:
+            new_df = pd.DataFrame(resume_list).reindex(columns=resume_df.columns)
+            # 前端以 'NULL' 表示空值，与读取CSV时一致地转为缺失
+            new_df = new_df.mask(new_df == 'NULL')
+            
+            # 未给出编号的简历顺延分配
+            id_column = ResumeIndex.ID_COLUMN
+            missing_ids = new_df[id_column].isna()
+            next_id = int(resume_df[id_column].max()) + 1 if len(resume_df) else 0
+            new_df.loc[missing_ids, id_column] = np.arange(next_id, next_id + missing_ids.sum())
+            # 类型转换前逐列校验数值字段，返回具体到简历与字段的错误信息
+            error = numeric_column_error(new_df, resume_df.dtypes)
+            if error:
+                return jsonify({'error': error}), 400
+            if new_df[id_column].duplicated().any() or (resume_index.lookup_rows(new_df[id_column]) >= 0).any():
+                return jsonify({'error': '简历编号重复'}), 400
+            
+            # 在副本上追加，全部成功后才替换，出错时原数据保持不变
+            new_df = new_df.astype(resume_df.dtypes.to_dict())
+            combined_df = pd.concat([resume_df, new_df], ignore_index=True)
+            new_resume_index = resume_index.copy()
+            new_resume_index.append(new_df)
+            new_statistics = statistics.copy()
+            new_statistics.add(new_df)
+            # 候选人索引只为新增简历编码；模型未变时只为新增简历预测通过概率，否则整体重新计算
+            new_candidate_index = candidate_index.copy()
+            model = predictor
+            new_probabilities = None
+            if model is not None and candidate_index.pass_probability_version == model.cache_namespace:
+                new_probabilities = model.predict_pool(new_df)
+            new_candidate_index.add_rows(new_df, new_probabilities)
+            if model is not None and new_candidate_index.pass_probability_version != model.cache_namespace:
+                score_pool(new_candidate_index, combined_df, model)
             
-            from collections import Counter
-            skill_count = Counter(skills)
-            skill_stats[col] = [
-                {'skill': k, 'count': v}
-                for k, v in skill_count.most_common(10)
-            ]
+            resume_df, resume_index, statistics, candidate_index = (
+                combined_df, new_resume_index, new_statistics, new_candidate_index
+            )
         
-        return jsonify(skill_stats)
+        return jsonify({
+            'added': len(new_df),
+            'resume_ids': new_df[id_column].tolist(),
+            'total': len(combined_df)
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+
+@app.route('/api/statistics/skills', methods=['GET'])
+def get_skill_statistics():
+    """技能统计"""
+    if statistics is None:
+        return jsonify({'error': '数据未加载'}), 500
+    
+    try:
+        return jsonify(statistics.skill_stats())
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
@@ -184,29 +492,11 @@ def get_skill_statistics():
 @app.route('/api/statistics/positions', methods=['GET'])
 def get_position_statistics():
     """岗位统计"""
-    if resume_df is None:
+    if statistics is None:
         return jsonify({'error': '数据未加载'}), 500
     
     try:
-        position_stats = resume_df['意向岗位'].value_counts().to_dict()
-        
-        # 通过率统计
-        pass_rate = {}
-        for position in position_stats.keys():
-            pos_df = resume_df[resume_df['意向岗位'] == position]
-            pass_count = (pos_df['筛选结果'] == '通过').sum()
-            pass_rate[position] = pass_count / len(pos_df) if len(pos_df) > 0 else 0
-        
-        result = [
-            {
-                'position': pos,
-                'count': count,
-                'pass_rate': pass_rate.get(pos, 0)
-            }
-            for pos, count in position_stats.items()
-        ]
-        
-        return jsonify({'positions': result})
+        return jsonify({'positions': statistics.position_stats()})
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
@@ -214,34 +504,56 @@ def get_position_statistics():
 @app.route('/api/statistics/overview', methods=['GET'])
 def get_overview_statistics():
     """概览统计"""
-    if resume_df is None:
+    if statistics is None:
         return jsonify({'error': '数据未加载'}), 500
     
     try:
-        total_resumes = len(resume_df)
-        pass_count = (resume_df['筛选结果'] == '通过').sum()
-        pass_rate = pass_count / total_resumes
-        
-        education_stats = resume_df['学历层次'].value_counts().to_dict()
-        school_stats = resume_df['院校类别'].value_counts().to_dict()
-        
-        age_stats = {
-            '平均年龄': float(resume_df['年龄'].mean()),
-            '年龄分布': resume_df['年龄'].describe().to_dict()
-        }
-        
+        return jsonify(statistics.overview())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+
+@app.route('/api/statistics/cube', methods=['GET'])
+def get_cube_statistics():
+    """多维交叉统计，如 /api/statistics/cube?dims=position,education"""
+    if statistics is None:
+        return jsonify({'error': '数据未加载'}), 500
+    
+    try:
+        dims = [dim.strip() for dim in request.args.get('dims', '').split(',') if dim.strip()]
+        return jsonify(statistics.cube(dims))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+
+@app.route('/api/models', methods=['GET'])
+def list_model_versions():
+    """模型版本列表"""
+    try:
         return jsonify({
-            'total_resumes': total_resumes,
-            'pass_count': int(pass_count),
-            'pass_rate': float(pass_rate),
-            'education_stats': education_stats,
-            'school_stats': school_stats,
-            'age_stats': age_stats
+            'current': model_registry.current(),
+            'loaded': predictor.version if predictor is not None else None,
+            'versions': model_registry.versions()
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
 
+@app.route('/api/models/rollback', methods=['POST'])
+def rollback_model():
+    """回滚模型：请求体 {"version": ...} 指定版本，省略时回滚到上一个发布的版本"""
+    try:
+        version = model_registry.rollback((request.get_json(silent=True) or {}).get('version'))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # 本进程立即切换，其他进程由后台线程在下一次检查时切换
+    loaded = model_watcher.check() if model_watcher is not None else None
+    if loaded != version:
+        return jsonify({'error': f'模型版本 {version} 加载失败', 'current': version, 'loaded': loaded}), 500
+    return jsonify({'current': version, 'loaded': loaded})
+
+
 @app.route('/api/model/performance', methods=['GET'])
 def get_model_performance():
     """模型性能"""
@@ -254,6 +566,8 @@ def get_model_performance():
         return jsonify({
             'feature_importance': feature_importance,
             'model_type': 'Ensemble (RandomForest + XGBoost + LightGBM)',
+            'version': predictor.version,
+            'metrics': predictor.artifact.metrics if predictor.artifact is not None else None,
             'status': 'trained'
         })
     except Exception as e:
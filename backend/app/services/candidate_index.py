@@ -0,0 +1,841 @@
+"""
+候选人特征索引模块
+"""
+import copy
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import numpy as np
+from scipy import sparse
+
+
+class CandidateIndex:
+    """候选人特征索引
+
+    在应用启动时对候选人池做一次预处理：学历、院校编码为整数等级，
+    工作年限、项目数提前汇总，技能按词表编码为稀疏矩阵。
+    学历、院校、工作年限、项目档位的组合只有几百种，每个候选人只保存一个组合编号，
+    查询时先对组合表打分，再按编号查表得到每个候选人的分数。
+    匹配打分与 ResumePredictor._calculate_match_score 的结果完全一致，
+    但对整个候选池只需少量 NumPy 运算。
+    新增、删除候选人时由 add_rows / remove_rows 只处理变化的行，结果与重新构建的索引一致；
+    服务运行中先 copy() 出副本再增删，完成后整体替换，处理中的查询继续使用原索引。
+    """
+
+    EDUCATION_RANK = {'专科': 1, '本科': 2, '硕士': 3, '博士': 4}
+    SCHOOL_RANK = {'普通高校': 1, '211高校': 2, '985高校': 3}
+    EXPERIENCE_YEARS = {'5年以上': 6, '3―5年': 4, '1―3年': 2, '1年以下': 0.5}
+
+    SKILL_COLUMNS = [
+        '编程语言', '前端技术', '后端技术', '数据库',
+        '云计算/运维', '数据与算法', '移动开发', '测试工具'
+    ]
+    EXPERIENCE_COLUMNS = ['小型企业工作经验', '中型企业工作经验', '大型企业工作经验']
+    PROJECT_COLUMNS = ['小规模项目', '中规模项目', '大规模项目']
+
+    # 覆盖率超过该比例的技能额外保存为稠密位图，计数时无需散列写入
+    DENSE_SKILL_RATIO = 0.25
+
+    # 查询技能在候选池内的倒排列表总长不超过池大小的该比例时，走倒排检索而非全量扫描
+    POSTINGS_SCAN_RATIO = 0.5
+
+    # 缓存的规范化查询数；每个查询缓存按分数排好序的前若干名（至少 MIN_CACHE_DEPTH 名，不足时按2倍加深）
+    MATCH_CACHE_SIZE = 256
+    MIN_CACHE_DEPTH = 100
+
+    # 综合排序中模型通过概率（换算为0-100分）的默认权重，0 表示只按规则匹配度排序
+    DEFAULT_ML_WEIGHT = 0.0
+    # 综合排序按通过概率从高到低分批扫描的首批人数；扫描范围超过候选池的该比例后改为全量计算
+    BLEND_SCAN_START = 1024
+    BLEND_SCAN_RATIO = 1 / 16
+
+    # 匹配结果字段 -> 简历列
+    OUTPUT_COLUMNS = {
+        'resume_id': '简历编号',
+        'name': '姓名',
+        'age': '年龄',
+        'position': '意向岗位',
+        'education': '学历层次',
+        'email': '邮箱',
+        'phone': '电话'
+    }
+
+    def __init__(self, resume_df, cache_size=None):
+        """构建索引；候选池变化时重新构建，匹配结果缓存随旧索引一起失效"""
+        self.size = len(resume_df)
+        self.cache_size = self.MATCH_CACHE_SIZE if cache_size is None else cache_size
+        self._match_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # 候选池或通过概率每变化一次加 1，排序期间发生变化时不缓存排序结果
+        self._generation = 0
+        self.cache_hits = self.cache_misses = 0
+        # 全体候选人的模型通过概率（由 set_pass_probabilities 设置）及其模型版本
+        self.pass_probability = None
+        self.pass_probability_version = None
+        self.pass_order = None
+
+        # 岗位字典编码及每个岗位的候选人行号
+        self.position_codes, positions = pd.factorize(resume_df['意向岗位'])
+        self.position_lookup = {position: code for code, position in enumerate(positions)}
+        order, bounds = self._group(self.position_codes, len(positions))
+        self.position_rows = [order[bounds[i]:bounds[i + 1]] for i in range(len(positions))]
+
+        self._build_profiles(resume_df)
+        self.skill_vocab, self.skill_matrix = self._build_skill_matrix(resume_df)
+        self.dense_skills = {
+            skill: self._dense_column(self.skill_matrix, col)
+            for skill, col in self.skill_vocab.items() if self._is_dense(self.skill_matrix, col)
+        }
+
+        self._build_partitions()
+
+        # 输出字段
+        self.columns = {
+            key: resume_df[col].to_numpy() for key, col in self.OUTPUT_COLUMNS.items()
+        }
+
+    def _profile_columns(self, resume_df):
+        """每个候选人的学历等级、院校等级、总工作年限和项目经验档位"""
+        # 学历、院校等级（缺失或未知时与打分函数一致，分别按本科、普通高校计）
+        education = resume_df['学历层次'].map(self.EDUCATION_RANK).fillna(2).to_numpy(np.int64)
+        school = resume_df['院校类别'].map(self.SCHOOL_RANK).fillna(1).to_numpy(np.int64)
+
+        # 总工作年限
+        experience = np.zeros(len(resume_df))
+        for col in self.EXPERIENCE_COLUMNS:
+            experience = experience + (
+                resume_df[col].astype(str).map(self.EXPERIENCE_YEARS).fillna(0).to_numpy(np.float64)
+            )
+
+        # 项目经验档位与查询无关，直接预先计算
+        project_count = sum(
+            resume_df[col].to_numpy(np.float64) for col in self.PROJECT_COLUMNS
+        )
+        project_levels = np.select(
+            [project_count >= 5, project_count >= 3, project_count >= 1], [3, 2, 1], 0
+        )
+        return education, school, experience, project_levels
+
+    def _build_profiles(self, resume_df):
+        """把学历、院校、工作年限、项目得分编码为组合编号"""
+        education, school, experience, project_levels = self._profile_columns(resume_df)
+        experience_codes, experience_values = pd.factorize(experience)
+        n_experience = max(len(experience_values), 1)
+
+        keys = ((education * 4 + school) * n_experience + experience_codes) * 4 + project_levels
+        profile_keys, profile_codes = np.unique(keys, return_inverse=True)
+        self.profile_codes = profile_codes.astype(np.intp)
+
+        # 组合表：每个组合编号对应的学历、院校、工作年限和项目得分
+        rest, levels = np.divmod(profile_keys, 4)
+        rest, experience_codes = np.divmod(rest, n_experience)
+        self.profile_education, self.profile_school = np.divmod(rest, 4)
+        self.profile_experience = np.asarray(experience_values, dtype=np.float64)[experience_codes]
+        self.profile_project_score = np.array([0, 4, 7, 10])[levels]
+
+    def _build_partitions(self):
+        """构建按岗位、学历划分的候选人分区及按岗位分组的倒排列表"""
+        n_positions = len(self.position_rows)
+        education = self.profile_education[self.profile_codes]
+
+        # 学历分区：全体候选人及每个岗位内部，各自按行号升序
+        self.education_rows = {e: np.flatnonzero(education == e) for e in self.EDUCATION_RANK.values()}
+        keys = np.where(self.position_codes >= 0, self.position_codes * 5 + education, -1)
+        order, bounds = self._group(keys, n_positions * 5)
+        self.position_education_rows = {
+            (p, e): order[bounds[p * 5 + e]:bounds[p * 5 + e + 1]]
+            for p in range(n_positions) for e in self.EDUCATION_RANK.values()
+        }
+
+        # 每项技能的倒排列表按岗位分组，组内行号升序
+        self.position_postings = {}
+        for skill in self.skill_vocab:
+            postings = self.skill_postings(skill)
+            order, bounds = self._group(self.position_codes[postings], n_positions)
+            self.position_postings[skill] = (postings[order], bounds)
+
+    def _build_skill_matrix(self, resume_df):
+        """构建 候选人 x 技能 的稀疏0/1矩阵（CSC，按列即为各技能的候选人列表）"""
+        values = pd.concat(
+            [resume_df[col].reset_index(drop=True) for col in self.SKILL_COLUMNS],
+            keys=range(len(self.SKILL_COLUMNS))
+        )
+        values = values[values.notna() & (values != 'NULL')]
+        tokens = values.astype(str).str.split(',').explode().str.strip()
+        rows = tokens.index.get_level_values(1).to_numpy(np.int64)
+        codes, vocab = pd.factorize(tokens)
+        vocab_size = max(len(vocab), 1)
+
+        # 同一候选人的重复技能只计一次
+        rows, codes = np.divmod(np.unique(rows * vocab_size + codes), vocab_size)
+
+        matrix = sparse.csc_matrix(
+            (np.ones(len(rows), dtype=np.int8), (rows, codes)),
+            shape=(len(resume_df), len(vocab))
+        )
+        return {skill: i for i, skill in enumerate(vocab)}, matrix
+
+    def _is_dense(self, matrix, col):
+        return matrix.indptr[col + 1] - matrix.indptr[col] >= self.DENSE_SKILL_RATIO * self.size
+
+    @staticmethod
+    def _dense_column(matrix, col):
+        """稀疏矩阵的一列展开为 0/1 位图"""
+        dense = np.zeros(matrix.shape[0], dtype=np.uint8)
+        dense[matrix.indices[matrix.indptr[col]:matrix.indptr[col + 1]]] = 1
+        return dense
+
+    @staticmethod
+    def _group(codes, n_groups):
+        """按编号分组：返回按编号稳定排序的下标及各组的起止位置（编号为 -1 的不属于任何组）"""
+        order = np.argsort(codes, kind='stable')
+        return order, np.searchsorted(codes[order], np.arange(n_groups + 1))
+
+    @staticmethod
+    def _merge_groups(rows, bounds, new_rows, new_bounds):
+        """把新增行号按组接在原有各组之后（新增行号均大于原有行号，组内仍为升序），组数以 new_bounds 为准
+
+        与 _group 的结果一样，不属于任何组的行号排在最前面。
+        """
+        n_groups = len(new_bounds) - 1
+        bounds = np.concatenate([bounds, np.full(n_groups + 1 - len(bounds), bounds[-1])])
+        pieces = [rows[:bounds[0]], new_rows[:new_bounds[0]]]
+        for g in range(n_groups):
+            pieces += [rows[bounds[g]:bounds[g + 1]], new_rows[new_bounds[g]:new_bounds[g + 1]]]
+        return np.concatenate(pieces), bounds + new_bounds
+
+    @staticmethod
+    def _merge_descending(probabilities, rows, new_rows):
+        """把按通过概率降序排列的新增行号并入原有的降序行号（同概率时原有行号较小，排在前面）"""
+        positions = np.searchsorted(-probabilities[rows], -probabilities[new_rows], side='right')
+        return np.insert(rows, positions, new_rows)
+
+    def copy(self):
+        """副本：与原索引共享各数组（增删候选人时整体替换而不原地修改），匹配结果缓存单独创建"""
+        index = copy.copy(self)
+        index._match_cache = OrderedDict()
+        index._cache_lock = threading.Lock()
+        index._generation = 0
+        index.cache_hits = index.cache_misses = 0
+        return index
+
+    def add_rows(self, new_df, pass_probability=None):
+        """追加候选人（行号接在末尾），只对新增的行做编码
+
+        已设置通过概率时 pass_probability 为新增候选人的通过概率，省略时清除通过概率（需重新 set_pass_probabilities）。
+        """
+        offset, n_new = self.size, len(new_df)
+        self.size = offset + n_new
+
+        # 岗位：新出现的岗位编号顺延
+        local_codes, local_positions = pd.factorize(new_df['意向岗位'])
+        position_lookup = dict(self.position_lookup)
+        mapping = np.array([position_lookup.setdefault(p, len(position_lookup)) for p in local_positions],
+                           dtype=self.position_codes.dtype)
+        new_codes = np.full(n_new, -1, dtype=self.position_codes.dtype)
+        new_codes[local_codes >= 0] = mapping[local_codes[local_codes >= 0]]
+        n_positions = len(position_lookup)
+        order, bounds = self._group(new_codes, n_positions)
+        old_rows = self.position_rows + [np.zeros(0, dtype=np.int64)] * (n_positions - len(self.position_rows))
+        self.position_rows = [
+            np.concatenate([old_rows[p], order[bounds[p]:bounds[p + 1]] + offset]) for p in range(n_positions)
+        ]
+        self.position_lookup = position_lookup
+        self.position_codes = np.concatenate([self.position_codes, new_codes])
+
+        # 组合编号：未出现过的组合追加到组合表末尾
+        education, school, experience, project_levels = self._profile_columns(new_df)
+        project_score = np.array([0, 4, 7, 10])[project_levels]
+        combos, inverse = np.unique(
+            np.column_stack([education, school, experience, project_score]).astype(np.float64),
+            axis=0, return_inverse=True
+        )
+        profiles = {
+            key: code for code, key in enumerate(zip(
+                self.profile_education.tolist(), self.profile_school.tolist(),
+                self.profile_experience.tolist(), self.profile_project_score.tolist()
+            ))
+        }
+        n_profiles = len(profiles)
+        combo_codes = np.array(
+            [profiles.setdefault((int(e), int(s), x, int(p)), len(profiles)) for e, s, x, p in combos.tolist()],
+            dtype=np.intp
+        )
+        added = combos[combo_codes >= n_profiles]
+        self.profile_education = np.concatenate([self.profile_education, added[:, 0].astype(np.int64)])
+        self.profile_school = np.concatenate([self.profile_school, added[:, 1].astype(np.int64)])
+        self.profile_experience = np.concatenate([self.profile_experience, added[:, 2]])
+        self.profile_project_score = np.concatenate([self.profile_project_score, added[:, 3].astype(np.int64)])
+        self.profile_codes = np.concatenate([self.profile_codes, combo_codes[inverse.ravel()]])
+
+        # 技能矩阵：各列的新增行号接在原有行号之后
+        local_vocab, local_matrix = self._build_skill_matrix(new_df)
+        skill_vocab = dict(self.skill_vocab)
+        skill_cols = np.array([skill_vocab.setdefault(skill, len(skill_vocab)) for skill in local_vocab],
+                              dtype=np.int64)
+        matrix = self.skill_matrix
+        old_counts = np.zeros(len(skill_vocab), dtype=np.int64)
+        old_counts[:matrix.shape[1]] = np.diff(matrix.indptr)
+        new_counts = np.zeros(len(skill_vocab), dtype=np.int64)
+        new_counts[skill_cols] = np.diff(local_matrix.indptr)
+        indptr = np.concatenate([[0], np.cumsum(old_counts + new_counts)])
+        indices = np.empty(indptr[-1], dtype=matrix.indices.dtype)
+        old_cols = np.repeat(np.arange(matrix.shape[1]), np.diff(matrix.indptr))
+        indices[indptr[old_cols] + np.arange(matrix.nnz) - matrix.indptr[old_cols]] = matrix.indices
+        local_cols = np.repeat(np.arange(len(skill_cols)), np.diff(local_matrix.indptr))
+        cols = skill_cols[local_cols]
+        indices[indptr[cols] + old_counts[cols] + np.arange(local_matrix.nnz) - local_matrix.indptr[local_cols]] = (
+            local_matrix.indices + offset
+        )
+        self.skill_matrix = sparse.csc_matrix(
+            (np.ones(len(indices), dtype=np.int8), indices, indptr), shape=(self.size, len(skill_vocab))
+        )
+
+        dense_skills = {}
+        for skill, col in skill_vocab.items():
+            if not self._is_dense(self.skill_matrix, col):
+                continue
+            dense = self.dense_skills.get(skill)
+            if dense is None:
+                dense_skills[skill] = self._dense_column(self.skill_matrix, col)
+            else:
+                local_col = local_vocab.get(skill)
+                added_dense = (np.zeros(n_new, dtype=np.uint8) if local_col is None
+                               else self._dense_column(local_matrix, local_col))
+                dense_skills[skill] = np.concatenate([dense, added_dense])
+        self.dense_skills = dense_skills
+
+        # 分区与按岗位分组的倒排列表
+        new_education = self.profile_education[self.profile_codes[offset:]]
+        self.education_rows = {
+            e: np.concatenate([rows, np.flatnonzero(new_education == e) + offset])
+            for e, rows in self.education_rows.items()
+        }
+        keys = np.where(new_codes >= 0, new_codes * 5 + new_education, -1)
+        order, bounds = self._group(keys, n_positions * 5)
+        empty = np.zeros(0, dtype=np.int64)
+        self.position_education_rows = {
+            (p, e): np.concatenate([
+                self.position_education_rows.get((p, e), empty), order[bounds[p * 5 + e]:bounds[p * 5 + e + 1]] + offset
+            ])
+            for p in range(n_positions) for e in self.EDUCATION_RANK.values()
+        }
+        no_postings = (empty, np.zeros(1, dtype=np.int64))
+        position_postings = {}
+        for skill in skill_vocab:
+            local_col = local_vocab.get(skill)
+            if local_col is None:
+                postings = empty
+            else:
+                postings = local_matrix.indices[local_matrix.indptr[local_col]:local_matrix.indptr[local_col + 1]]
+            order, bounds = self._group(new_codes[postings], n_positions)
+            position_postings[skill] = self._merge_groups(
+                *self.position_postings.get(skill, no_postings), postings[order] + offset, bounds
+            )
+        self.position_postings = position_postings
+        self.skill_vocab = skill_vocab
+
+        self.columns = {
+            key: np.concatenate([values, new_df[self.OUTPUT_COLUMNS[key]].to_numpy()])
+            for key, values in self.columns.items()
+        }
+
+        # 通过概率：新增候选人按概率降序并入已排好的顺序
+        if self.pass_probability is None or pass_probability is None:
+            with self._cache_lock:
+                self.pass_probability = self.pass_order = self.pass_probability_version = None
+                self._invalidate()
+            return
+        pass_probability = np.asarray(pass_probability, dtype=np.float64)
+        if pass_probability.shape != (n_new,):
+            raise ValueError(f'通过概率的长度 {len(pass_probability)} 与新增候选人数 {n_new} 不一致')
+        probabilities = np.concatenate([self.pass_probability, pass_probability])
+        order, by_position, position_bounds = self.pass_order
+        new_order = np.argsort(-pass_probability, kind='stable') + offset
+        group_order, bounds = self._group(new_codes[new_order - offset], n_positions)
+        new_by_position = new_order[group_order]
+        position_bounds = np.concatenate(
+            [position_bounds, np.full(n_positions + 1 - len(position_bounds), position_bounds[-1])]
+        )
+        # 岗位缺失的候选人排在最前面
+        merged = [self._merge_descending(probabilities, by_position[:position_bounds[0]], new_by_position[:bounds[0]])]
+        for p in range(n_positions):
+            merged.append(self._merge_descending(
+                probabilities, by_position[position_bounds[p]:position_bounds[p + 1]],
+                new_by_position[bounds[p]:bounds[p + 1]]
+            ))
+        pass_order = (self._merge_descending(probabilities, order, new_order), np.concatenate(merged),
+                      position_bounds + bounds)
+        with self._cache_lock:
+            self.pass_probability = probabilities
+            self.pass_order = pass_order
+            self._invalidate()
+
+    def remove_rows(self, rows):
+        """删除候选人（行号），其余候选人的行号随之前移"""
+        keep = np.ones(self.size, dtype=bool)
+        keep[np.asarray(rows, dtype=np.int64)] = False
+        remap = np.cumsum(keep) - 1
+
+        def kept(values):
+            """保留的行号（映射为新行号，顺序不变）"""
+            return remap[values[keep[values]]]
+
+        def kept_groups(values, bounds):
+            """分组存放的行号去掉删除的行，返回新行号及各组的起止位置"""
+            prefix = np.concatenate([[0], np.cumsum(keep[values])])
+            return kept(values), prefix[bounds]
+
+        self.size = int(keep.sum())
+        self.position_codes = self.position_codes[keep]
+        self.position_rows = [kept(position_rows) for position_rows in self.position_rows]
+        self.profile_codes = self.profile_codes[keep]
+
+        matrix = self.skill_matrix
+        kept_entries = keep[matrix.indices]
+        indptr = np.concatenate([[0], np.cumsum(kept_entries)])[matrix.indptr]
+        self.skill_matrix = sparse.csc_matrix(
+            (np.ones(indptr[-1], dtype=np.int8), remap[matrix.indices[kept_entries]].astype(matrix.indices.dtype),
+             indptr),
+            shape=(self.size, matrix.shape[1])
+        )
+        self.dense_skills = {
+            skill: self.dense_skills[skill][keep] if skill in self.dense_skills
+            else self._dense_column(self.skill_matrix, col)
+            for skill, col in self.skill_vocab.items() if self._is_dense(self.skill_matrix, col)
+        }
+
+        self.education_rows = {e: kept(values) for e, values in self.education_rows.items()}
+        self.position_education_rows = {key: kept(values) for key, values in self.position_education_rows.items()}
+        self.position_postings = {
+            skill: kept_groups(postings, bounds) for skill, (postings, bounds) in self.position_postings.items()
+        }
+        self.columns = {key: values[keep] for key, values in self.columns.items()}
+
+        with self._cache_lock:
+            if self.pass_probability is not None:
+                order, by_position, bounds = self.pass_order
+                self.pass_probability = self.pass_probability[keep]
+                self.pass_order = (kept(order),) + kept_groups(by_position, bounds)
+            self._invalidate()
+
+    def candidate_rows(self, position=None):
+        """候选池行号：指定岗位时只返回该岗位的候选人，否则返回 None 表示全部"""
+        if not position:
+            return None
+        code = self.position_lookup.get(position)
+        if code is None:
+            return np.zeros(0, dtype=np.int64)
+        return self.position_rows[code]
+
+    def skill_postings(self, skill):
+        """某项技能的候选人行号（升序）"""
+        col = self.skill_vocab.get(skill)
+        if col is None:
+            return np.zeros(0, dtype=self.skill_matrix.indices.dtype)
+        return self.skill_matrix.indices[self.skill_matrix.indptr[col]:self.skill_matrix.indptr[col + 1]]
+
+    def pool_postings(self, skill, position=None):
+        """某项技能在候选池（指定岗位或全部）内的候选人行号（升序）"""
+        if not position:
+            return self.skill_postings(skill)
+        code = self.position_lookup.get(position)
+        if code is None or skill not in self.position_postings:
+            return np.zeros(0, dtype=np.int64)
+        postings, bounds = self.position_postings[skill]
+        return postings[bounds[code]:bounds[code + 1]]
+
+    def skill_match_counts(self, skills, rows=None):
+        """候选人命中的（去重后）技能数（rows 为 None 时为全部候选人）"""
+        size = self.size if rows is None else len(rows)
+        counts = np.zeros(size, dtype=np.uint8)
+        for skill in set(skills):
+            dense = self.dense_skills.get(skill)
+            if dense is not None:
+                counts += dense if rows is None else dense.take(rows)
+                continue
+
+            postings = self.skill_postings(skill)
+            if rows is not None and len(rows) < len(postings):
+                # 候选人少于倒排列表时，反过来在倒排列表中二分查找每位候选人
+                positions = np.searchsorted(postings, rows)
+                inside = positions < len(postings)
+                inside[inside] = postings[positions[inside]] == rows[inside]
+                counts += inside
+                continue
+            if rows is not None:
+                # 候选池行号有序，二分定位落在池内的候选人
+                positions = np.searchsorted(rows, postings)
+                inside = positions < len(rows)
+                inside[inside] = rows[positions[inside]] == postings[inside]
+                postings = positions[inside]
+            counts[postings] += 1
+        return counts
+
+    def score_table(self, requirements):
+        """对所有组合打分，返回形如 [命中技能数, 组合编号] 的分数表"""
+        # 候选池已按岗位过滤，岗位得分对池内所有人相同
+        position = requirements.get('position')
+        position_score = 20 if position and position in self.position_lookup else 0
+
+        req_edu = self.EDUCATION_RANK.get(requirements.get('education', '本科'), 2)
+        edu = self.profile_education
+        edu_score = np.where(edu >= req_edu, 15, np.where(edu == req_edu - 1, 10, 0))
+
+        req_school = self.SCHOOL_RANK.get(requirements.get('school', '普通高校'), 1)
+        school = self.profile_school
+        school_score = np.where(school >= req_school, 10, np.where(school == req_school - 1, 5, 0))
+
+        req_exp = requirements.get('experience_years', 0)
+        exp = self.profile_experience
+        exp_score = np.where(exp >= req_exp, 15, np.where(exp >= req_exp * 0.7, 10, 0))
+
+        # 累加顺序与逐条打分一致，保证浮点结果逐位相同
+        table = (position_score + edu_score + school_score).astype(np.float64)[np.newaxis, :]
+        required_skills = set(requirements.get('skills', []))
+        if required_skills:
+            matched = np.arange(len(required_skills) + 1)
+            skill_score = np.minimum(30, (matched / len(required_skills)) * 30)
+            table = table + skill_score[:, np.newaxis]
+        table = table + exp_score
+        table = table + self.profile_project_score
+
+        # 归一化到0-100（满分100）
+        return table / 100 * 100
+
+    def score_buckets(self, requirements, rows=None):
+        """返回展平的分数表及每个候选人在表中的下标（rows 为 None 时为全部候选人）"""
+        table = self.score_table(requirements)
+        codes = self.profile_codes if rows is None else self.profile_codes.take(rows)
+        required_skills = requirements.get('skills', [])
+        if required_skills:
+            buckets = self.skill_match_counts(required_skills, rows).astype(np.intp)
+            buckets *= table.shape[1]
+            buckets += codes
+        else:
+            buckets = codes
+        return table.ravel(), buckets
+
+    def score(self, requirements, rows=None):
+        """计算候选人的匹配度分数"""
+        table, buckets = self.score_buckets(requirements, rows)
+        return table.take(buckets)
+
+    def set_pass_probabilities(self, probabilities, version=None):
+        """设置全体候选人的模型通过概率（按行号对齐），已缓存的匹配结果随之失效
+
+        同时预先计算全体及每个岗位内按通过概率降序（同概率时行号升序）排列的行号，供综合排序提前终止扫描。
+        """
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        if probabilities.shape != (self.size,):
+            raise ValueError(f'通过概率的长度 {len(probabilities)} 与候选池人数 {self.size} 不一致')
+        order = np.argsort(-probabilities, kind='stable')
+        codes = self.position_codes[order]
+        by_position = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[by_position], np.arange(len(self.position_rows) + 1))
+        pass_order = (order, order[by_position], bounds)
+        with self._cache_lock:
+            self.pass_probability = probabilities
+            self.pass_order = pass_order
+            self.pass_probability_version = version
+            self._invalidate()
+
+    def _invalidate(self):
+        """候选池或通过概率已变化：清空匹配结果缓存（调用方持有 _cache_lock）"""
+        self._generation += 1
+        self._match_cache.clear()
+
+    def _pass_state(self):
+        """同一时刻的 (版本计数, 通过概率, 按通过概率排列的行号)，一次查询只使用同一份"""
+        with self._cache_lock:
+            return self._generation, self.pass_probability, self.pass_order
+
+    @classmethod
+    def canonical_query(cls, requirements):
+        """规范化匹配条件：按打分函数的规则填充默认值，技能去重排序
+
+        学历、院校未给出或无法识别时与打分时一样分别按本科、普通高校计，岗位为空表示不限岗位，
+        ml_weight 为模型通过概率在综合排序中的权重（0-1）。
+        返回 (缓存键, 规范化后的匹配条件)。
+        """
+        position = requirements.get('position') or None
+        education = requirements.get('education')
+        education = education if education in cls.EDUCATION_RANK else '本科'
+        school = requirements.get('school')
+        school = school if school in cls.SCHOOL_RANK else '普通高校'
+
+        experience_years = requirements.get('experience_years', 0)
+        if experience_years is None:
+            experience_years = 0
+        if isinstance(experience_years, bool) or not isinstance(experience_years, (int, float, np.integer, np.floating)):
+            raise ValueError('experience_years 必须为数字')
+
+        skills = requirements.get('skills') or []
+        if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+            raise ValueError('skills 应为技能名称列表')
+        skills = sorted(set(skills))
+
+        ml_weight = requirements.get('ml_weight')
+        ml_weight = cls.DEFAULT_ML_WEIGHT if ml_weight is None else ml_weight
+        if (isinstance(ml_weight, bool) or not isinstance(ml_weight, (int, float, np.integer, np.floating))
+                or not 0 <= ml_weight <= 1):
+            raise ValueError('ml_weight 必须为 0 到 1 之间的数字')
+
+        query = {
+            'position': position,
+            'education': education,
+            'school': school,
+            'experience_years': float(experience_years),
+            'skills': skills,
+            'ml_weight': float(ml_weight)
+        }
+        key = (position, education, school, float(experience_years), tuple(skills), float(ml_weight))
+        return key, query
+
+    def match(self, requirements, top_n=10, offset=0):
+        """岗位匹配推荐：返回按匹配度排序的第 offset 名起的 top_n 位候选人
+
+        同一规范化查询的排序结果会被缓存，不同 top_n、不同页都只是对缓存结果切片。
+        ml_weight > 0 时 match_score 为综合得分，另返回规则匹配度 rule_score。
+        """
+        top_n, offset = max(int(top_n), 0), max(int(offset), 0)
+        key, query = self.canonical_query(requirements)
+        rows, scores, rule_scores, pass_probability = self.ranked(key, query, offset + top_n)
+        page = slice(offset, offset + top_n)
+        return self.records(rows[page], scores[page], rule_scores[page] if query['ml_weight'] > 0 else None,
+                            pass_probability)
+
+    def ranked(self, key, query, depth):
+        """规范化查询的前 depth 名（行号、排序分数、规则匹配度）及排序时使用的通过概率，优先使用缓存
+
+        排序期间候选池或通过概率发生变化（版本计数不同）时，结果照常返回但不写入缓存。
+        """
+        with self._cache_lock:
+            entry = self._match_cache.get(key) if self.cache_size > 0 else None
+            # 缓存条目不足 depth 名时，只有排到了候选池末尾才可直接使用
+            if entry is not None and (len(entry[0]) >= depth or entry[3]):
+                self._match_cache.move_to_end(key)
+                self.cache_hits += 1
+                return entry[:3] + entry[4:]
+            if self.cache_size > 0:
+                self.cache_misses += 1
+            pass_state = self._generation, self.pass_probability, self.pass_order
+
+        cache_depth = depth if self.cache_size <= 0 else max(
+            self.MIN_CACHE_DEPTH, len(entry[0]) * 2 if entry is not None else 0
+        )
+        while cache_depth < depth:
+            cache_depth *= 2
+        rows, scores, rule_scores = self.rank(query, cache_depth, pass_state)
+        pass_probability = pass_state[1]
+        if self.cache_size > 0:
+            with self._cache_lock:
+                if self._generation == pass_state[0]:
+                    self._match_cache[key] = (rows, scores, rule_scores, len(rows) < cache_depth, pass_probability)
+                    self._match_cache.move_to_end(key)
+                    while len(self._match_cache) > self.cache_size:
+                        self._match_cache.popitem(last=False)
+        return rows, scores, rule_scores, pass_probability
+
+    def rank(self, requirements, top_n, pass_state=None):
+        """匹配度最高的 top_n 位候选人的行号、排序分数与规则匹配度（分数降序，同分时行号升序），不使用缓存
+
+        pass_state 为 _pass_state() 取得的通过概率，省略时取当前值。
+        """
+        position = requirements.get('position')
+        rows = self.candidate_rows(position)
+        if rows is not None and len(rows) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0)
+
+        ml_weight = requirements.get('ml_weight', 0)
+        if ml_weight > 0:
+            return self.rank_blended(requirements, rows, top_n, ml_weight, pass_state)
+
+        required_skills = requirements.get('skills', [])
+        postings = [
+            self.pool_postings(skill, position) for skill in set(required_skills) if skill in self.skill_vocab
+        ]
+        pool_size = self.size if rows is None else len(rows)
+
+        if required_skills and sum(len(p) for p in postings) <= self.POSTINGS_SCAN_RATIO * pool_size:
+            selected, scores = self.retrieve(requirements, postings, top_n)
+        else:
+            table, buckets = self.score_buckets(requirements, rows)
+            selected = self.top_buckets(table, buckets, top_n)
+            scores = table[buckets[selected]]
+            if rows is not None:
+                selected = rows[selected]
+
+        order = np.argsort(-scores, kind='stable')
+        return selected[order], scores[order], scores[order]
+
+    def rank_blended(self, requirements, rows, top_n, ml_weight, pass_state=None):
+        """综合排序：(1 - ml_weight) x 规则匹配度 + ml_weight x 通过概率 x 100
+
+        先按通过概率从高到低逐批扫描少量候选人：第 top_n 名的综合得分已严格高于
+        “规则满分 + 下一位的通过概率”这一上界时，其余候选人不可能进入前 top_n，直接返回；
+        否则以该得分为下界对整个候选池计算，只对不低于下界的候选人排序。结果与全量计算一致。
+        """
+        _, pass_probability, pass_order = pass_state or self._pass_state()
+        if pass_probability is None:
+            raise ValueError('候选人通过概率尚未计算，无法按模型综合排序')
+        top_n = max(int(top_n), 0)
+
+        if rows is None:
+            order = pass_order[0]
+        else:
+            code = self.position_lookup[requirements['position']]
+            order = pass_order[1][pass_order[2][code]:pass_order[2][code + 1]]
+        rule_bound = (1 - ml_weight) * self.score_table(requirements).max()
+
+        threshold = -np.inf
+        scan = max(self.BLEND_SCAN_START, top_n)
+        while 0 < top_n and scan < len(order) * self.BLEND_SCAN_RATIO:
+            selected, scores, rule_scores = self._blend(
+                requirements, np.sort(order[:scan]), pass_probability, top_n, ml_weight
+            )
+            if len(selected) == top_n:
+                if rule_bound + ml_weight * 100 * pass_probability[order[scan]] < scores[-1]:
+                    return selected, scores, rule_scores
+                threshold = scores[-1]
+            scan *= 4
+        return self._blend(requirements, rows, pass_probability, top_n, ml_weight, threshold)
+
+    def _blend(self, requirements, rows, pass_probability, top_n, ml_weight, threshold=-np.inf):
+        """对给定候选人（行号升序，None 为全部）计算综合得分，取不低于 threshold 的前 top_n 名"""
+        table, buckets = self.score_buckets(requirements, rows)
+        scores = ((1 - ml_weight) * table).take(buckets)
+        scores += ml_weight * 100 * (pass_probability if rows is None else pass_probability.take(rows))
+        keep = np.flatnonzero(scores >= threshold)
+        selected, scores = self._top(keep, scores[keep], top_n)
+        rule_scores = table.take(buckets.take(selected))
+        return (selected if rows is None else rows.take(selected)), scores, rule_scores
+
+    def retrieve(self, requirements, postings, top_n):
+        """基于倒排列表的 top_n 检索，结果与全量扫描一致
+
+        按命中技能数分层：先对所有技能列表求交集，若交集中已有 top_n 人达到最高分，
+        或分数严格高于少命中一项技能的分数上界则直接返回；否则合并各列表统计命中数；
+        仍不足时再按学历分区扫描未命中任何技能的候选人，分区上界低于当前第 top_n 名时剪枝。
+        返回行号升序的候选人及其分数。
+        """
+        top_n = max(int(top_n), 0)
+        table = self.score_table(requirements)
+        n_profiles = table.shape[1]
+        flat = table.ravel()
+        # 每一层（命中 k 项技能）的分数上界
+        upper_bounds = table.max(axis=1)
+
+        empty = np.zeros(0, dtype=np.int64)
+        if top_n == 0:
+            return empty, np.zeros(0)
+
+        # 第一层：命中全部技能的候选人（从最短的列表开始求交集）
+        if postings:
+            postings = sorted(postings, key=len)
+            hits = postings[0]
+            for other in postings[1:]:
+                hits = hits[self._contains(other, hits)]
+            full = len(postings)
+            scores = flat[full * n_profiles + self.profile_codes[hits]]
+            # 已有 top_n 人达到可能的最高分时，行号更大的候选人即使同分也只能排在后面
+            best = np.flatnonzero(scores == upper_bounds.max())[:top_n]
+            if len(best) == top_n:
+                return hits[best], scores[best]
+            rows, scores = self._top(hits, scores, top_n)
+            if len(rows) == top_n and scores.min() > upper_bounds[full - 1]:
+                return self._sorted(rows, scores)
+
+            # 命中至少一项技能的候选人
+            hits, matched = np.unique(np.concatenate(postings), return_counts=True)
+            scores = flat[matched * n_profiles + self.profile_codes[hits]]
+            rows, scores = self._top(hits, scores, top_n)
+        else:
+            hits, rows, scores = empty, empty, np.zeros(0)
+
+        # 未命中任何技能的候选人：按学历分区的分数上界从高到低扫描
+        position = requirements.get('position')
+        code = self.position_lookup.get(position) if position else None
+        edu_bounds = {
+            e: table[0][self.profile_education == e].max(initial=-np.inf)
+            for e in self.EDUCATION_RANK.values()
+        }
+        for e in sorted(edu_bounds, key=edu_bounds.get, reverse=True):
+            if len(rows) == top_n and edu_bounds[e] < scores.min():
+                break
+            partition = self.education_rows[e] if code is None else self.position_education_rows[(code, e)]
+            if len(hits):
+                partition = partition[~self._contains(hits, partition)]
+            buckets = self.profile_codes[partition]
+            selected = partition[self.top_buckets(flat, buckets, top_n)]
+            rows, scores = self._top(
+                np.concatenate([rows, selected]),
+                np.concatenate([scores, flat[self.profile_codes[selected]]]),
+                top_n
+            )
+
+        return self._sorted(rows, scores)
+
+    def _contains(self, sorted_rows, rows):
+        """rows 中每个行号是否出现在升序数组 sorted_rows 中"""
+        if len(sorted_rows) == 0:
+            return np.zeros(len(rows), dtype=bool)
+        if len(rows) < 1024:
+            positions = np.minimum(np.searchsorted(sorted_rows, rows), len(sorted_rows) - 1)
+            return sorted_rows[positions] == rows
+        # 列表较长时用全量位图判断，避免大量二分查找
+        mask = np.zeros(self.size, dtype=bool)
+        mask[sorted_rows] = True
+        return mask[rows]
+
+    @staticmethod
+    def _top(rows, scores, top_n):
+        """按分数降序、行号升序取前 top_n 个"""
+        if len(rows) > top_n:
+            # 先用第 top_n 大的分数截断，同分者按行号取前几个，避免对全部候选排序
+            threshold = np.partition(scores, len(scores) - top_n)[len(scores) - top_n]
+            above = np.flatnonzero(scores > threshold)
+            ties = np.flatnonzero(scores == threshold)
+            ties = ties[np.argsort(rows[ties], kind='stable')][:top_n - len(above)]
+            keep = np.concatenate([above, ties])
+            rows, scores = rows[keep], scores[keep]
+        order = np.lexsort((rows, -scores))
+        return rows[order], scores[order]
+
+    @staticmethod
+    def _sorted(rows, scores):
+        """按行号升序返回"""
+        order = np.argsort(rows, kind='stable')
+        return rows[order], scores[order]
+
+    @staticmethod
+    def top_buckets(table, buckets, top_n):
+        """选出分数最高的 top_n 个候选人下标（升序返回），同分时下标小者优先"""
+        top_n = max(int(top_n), 0)
+        if top_n >= len(buckets):
+            return np.arange(len(buckets))
+        if top_n == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        # 统计每个分数桶的人数，按分数从高到低累加，找到第 top_n 名所在的分数
+        counts = np.bincount(buckets, minlength=len(table))
+        order = np.argsort(-table, kind='stable')
+        threshold = table[order[np.searchsorted(np.cumsum(counts[order]), top_n)]]
+
+        labels = np.where(table > threshold, 2, np.where(table == threshold, 1, 0)).astype(np.int8).take(buckets)
+        hits = np.flatnonzero(labels)
+        hit_labels = labels[hits]
+        above = hits[hit_labels == 2]
+        ties = hits[hit_labels == 1][:top_n - len(above)]
+        return np.sort(np.concatenate([above, ties]))
+
+    def records(self, rows, scores, rule_scores=None, pass_probability=None):
+        """组装匹配结果；给出通过概率（与排序时使用的同一份）时附带每位候选人的 pass_probability"""
+        columns = {key: values.take(rows).tolist() for key, values in self.columns.items()}
+        columns['match_score'] = scores.tolist()
+        if rule_scores is not None:
+            columns['rule_score'] = rule_scores.tolist()
+        if pass_probability is not None:
+            columns['pass_probability'] = pass_probability.take(rows).tolist()
+        return [dict(zip(columns, values)) for values in zip(*columns.values())]
@@ -0,0 +1,230 @@
+"""
+超参数搜索模块
+"""
+import hashlib
+import itertools
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.metrics import f1_score
+from sklearn.model_selection import StratifiedKFold
+from xgboost import XGBClassifier
+
+
+def available_cpus():
+    """当前进程可用的CPU核数"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+# 工作进程中的训练数据，由进程池初始化函数设置，避免每个试验重复传输
+_worker_data = {}
+
+
+def _init_worker(X, y, folds):
+    _worker_data.update(X=X, y=y, folds=folds)
+
+
+def _run_trial(params, rounds, early_stopping_rounds, n_threads, random_state):
+    """以 rounds 轮为预算做一次交叉验证，按验证集 logloss 早停，返回各折平均指标"""
+    X, y, folds = _worker_data['X'], _worker_data['y'], _worker_data['folds']
+    start = time.time()
+    f1_scores, loglosses, best_iterations = [], [], []
+    for train_idx, valid_idx in folds:
+        model = XGBClassifier(
+            n_estimators=rounds, early_stopping_rounds=early_stopping_rounds,
+            eval_metric='logloss', random_state=random_state, n_jobs=n_threads, **params
+        )
+        model.fit(X[train_idx], y[train_idx], eval_set=[(X[valid_idx], y[valid_idx])], verbose=False)
+        # 早停后 predict 使用最佳轮数
+        f1_scores.append(f1_score(y[valid_idx], model.predict(X[valid_idx])))
+        loglosses.append(model.evals_result()['validation_0']['logloss'][model.best_iteration])
+        best_iterations.append(model.best_iteration + 1)
+    return {
+        'f1': float(np.mean(f1_scores)),
+        'logloss': float(np.mean(loglosses)),
+        'best_iterations': best_iterations,
+        'seconds': time.time() - start
+    }
+
+
+class HalvingSearch:
+    """XGBoost 逐次减半 / Hyperband 超参数搜索
+
+    以提升轮数为预算：每一档（rung）用当前预算对候选参数做交叉验证并按验证集 logloss 早停，
+    按平均 F1 保留前 1/eta 晋级，预算乘以 eta，直到最大轮数。
+    mode='halving' 时所有候选参数进入同一组；mode='hyperband' 时按 Hyperband 划分多组
+    （从参数网格中抽样，起始预算各不相同）。
+
+    试验在进程池中并行，进程数 x 每个试验的 XGBoost 线程数不超过可用核数。
+    每个完成的试验追加写入 JSONL 日志，重新运行时跳过日志中已有的试验，可中断后续跑。
+    cv 可以是折数，也可以是 (训练下标, 验证下标) 列表。
+    """
+
+    def __init__(self, param_grid, max_rounds=300, min_rounds=30, eta=3, cv=5,
+                 early_stopping_rounds=20, mode='halving', n_workers=None, n_threads=1,
+                 journal_path=None, random_state=42):
+        if mode not in ('halving', 'hyperband'):
+            raise ValueError(f'未知的搜索模式: {mode}')
+        self.param_grid = param_grid
+        self.max_rounds = max_rounds
+        self.min_rounds = min_rounds
+        self.eta = eta
+        self.cv = cv
+        self.early_stopping_rounds = early_stopping_rounds
+        self.mode = mode
+        self.n_threads = n_threads
+        self.n_workers = n_workers or max(1, available_cpus() // n_threads)
+        self.journal_path = journal_path
+        self.random_state = random_state
+
+        self.trials = []
+        self.best_params_ = None
+        self.best_score_ = None
+        self.best_rounds_ = None
+
+    def candidates(self):
+        """参数网格中的全部组合"""
+        keys = sorted(self.param_grid)
+        return [dict(zip(keys, values)) for values in itertools.product(*(self.param_grid[k] for k in keys))]
+
+    def brackets(self):
+        """各组的 (候选参数列表, 起始预算)"""
+        candidates = self.candidates()
+        s_max = max(0, int(math.floor(math.log(self.max_rounds / self.min_rounds, self.eta) + 1e-9)))
+        if self.mode == 'halving':
+            return [(candidates, self.max_rounds / self.eta ** s_max)]
+
+        rng = np.random.default_rng(self.random_state)
+        brackets = []
+        for s in range(s_max, -1, -1):
+            n = min(len(candidates), int(math.ceil((s_max + 1) / (s + 1) * self.eta ** s)))
+            chosen = rng.choice(len(candidates), n, replace=False)
+            brackets.append(([candidates[i] for i in sorted(chosen)], self.max_rounds / self.eta ** s))
+        return brackets
+
+    def _fingerprint(self, X, y, folds):
+        """训练数据、交叉验证折与搜索设置的指纹，日志只在指纹一致时复用"""
+        digest = hashlib.sha1()
+        digest.update(np.ascontiguousarray(X).tobytes())
+        digest.update(np.ascontiguousarray(y).tobytes())
+        for train_idx, valid_idx in folds:
+            digest.update(np.ascontiguousarray(train_idx).tobytes())
+            digest.update(np.ascontiguousarray(valid_idx).tobytes())
+        digest.update(json.dumps([self.early_stopping_rounds, self.random_state]).encode())
+        return digest.hexdigest()
+
+    def _load_journal(self, fingerprint):
+        """读取日志中与当前数据一致的已完成试验"""
+        done = {}
+        if self.journal_path and os.path.exists(self.journal_path):
+            with open(self.journal_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # 中断时可能留下不完整的最后一行
+                        continue
+                    if record.get('fingerprint') == fingerprint:
+                        done[self._trial_key(record['params'], record['rounds'])] = record
+        return done
+
+    @staticmethod
+    def _trial_key(params, rounds):
+        return json.dumps(params, sort_keys=True), int(rounds)
+
+    def _append_journal(self, record):
+        if self.journal_path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.journal_path)), exist_ok=True)
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def fit(self, X, y):
+        """执行搜索，返回 self"""
+        X = np.asarray(X, dtype=np.float32)
+        y = np.asarray(y)
+        if isinstance(self.cv, int):
+            folds = list(StratifiedKFold(n_splits=self.cv).split(X, y))
+        else:
+            folds = [(np.asarray(train_idx), np.asarray(valid_idx)) for train_idx, valid_idx in self.cv]
+        fingerprint = self._fingerprint(X, y, folds)
+        done = self._load_journal(fingerprint)
+        if done:
+            print(f"从搜索日志恢复 {len(done)} 个已完成的试验")
+
+        final_rung = []
+        executor = None
+        if self.n_workers > 1:
+            executor = ProcessPoolExecutor(self.n_workers, initializer=_init_worker, initargs=(X, y, folds))
+        else:
+            _init_worker(X, y, folds)
+
+        try:
+            for bracket, (candidates, first_rounds) in enumerate(self.brackets()):
+                rounds = first_rounds
+                while True:
+                    budget = int(round(min(rounds, self.max_rounds)))
+                    results = self._run_rung(executor, bracket, candidates, budget, done, fingerprint)
+                    print(f"  组 {bracket} 预算 {budget} 轮: {len(candidates)} 个候选, "
+                          f"最佳F1 {max(r['f1'] for r in results):.4f}")
+                    if budget >= self.max_rounds or len(candidates) == 1:
+                        final_rung.extend(results)
+                        break
+                    # 按平均F1（相同时按logloss）保留前 1/eta
+                    keep = max(1, len(candidates) // self.eta)
+                    ranked = sorted(results, key=lambda r: (-r['f1'], r['logloss']))[:keep]
+                    candidates = [r['params'] for r in ranked]
+                    rounds *= self.eta
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        best = sorted(final_rung, key=lambda r: (-r['f1'], r['logloss']))[0]
+        self.best_params_ = best['params']
+        self.best_score_ = best['f1']
+        # 最终模型的轮数取各折早停轮数的平均
+        self.best_rounds_ = int(round(np.mean(best['best_iterations'])))
+        return self
+
+    def _run_rung(self, executor, bracket, candidates, budget, done, fingerprint):
+        """运行一档中尚未完成的试验"""
+        results = [None] * len(candidates)
+        pending = []
+        for i, params in enumerate(candidates):
+            record = done.get(self._trial_key(params, budget))
+            if record is not None:
+                results[i] = record
+            else:
+                pending.append(i)
+
+        args = [(candidates[i], budget, self.early_stopping_rounds, self.n_threads, self.random_state)
+                for i in pending]
+        outputs = executor.map(_run_trial, *zip(*args)) if executor is not None and args else (
+            _run_trial(*arg) for arg in args
+        )
+        for i, output in zip(pending, outputs):
+            record = dict(output, params=candidates[i], rounds=budget, bracket=bracket, fingerprint=fingerprint)
+            self._append_journal(record)
+            done[self._trial_key(candidates[i], budget)] = record
+            results[i] = record
+
+        self.trials.extend(results)
+        return results
+
+    def make_estimator(self):
+        """按最佳参数创建（未训练的）最终模型"""
+        return XGBClassifier(
+            n_estimators=self.best_rounds_, eval_metric='logloss',
+            random_state=self.random_state, n_jobs=self.n_threads * self.n_workers, **self.best_params_
+        )
+
+    def best_estimator(self, X, y):
+        """用最佳参数在全部训练数据上训练最终模型"""
+        model = self.make_estimator()
+        model.fit(X, y)
+        return model
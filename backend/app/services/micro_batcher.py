@@ -0,0 +1,115 @@
+"""
+预测请求合批模块 - 把并发到达的单条预测请求合并为一次批量预测
+"""
+import asyncio
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """单条预测请求的动态合批
+
+    请求线程（或协程）先校验简历，再把简历放入队列并等待结果；后台线程取到第一条请求后，
+    在 max_wait_ms 时间窗内继续收集，直到凑满 max_batch_size 条，随后只做一次特征工程与一次
+    predict_proba，再把结果逐条交还给等待的请求。上一批只有一条请求（没有并发）时不等待时间窗，
+    只取队列中已有的请求，避免低负载时增加延迟。get_predictor 在每批预测时调用，模型热切换后下一批即使用新模型。
+    """
+
+    MAX_BATCH_SIZE = 64
+    MAX_WAIT_MS = 2.0
+
+    def __init__(self, get_predictor, max_batch_size=None, max_wait_ms=None):
+        self.get_predictor = get_predictor
+        self.max_batch_size = max_batch_size or self.MAX_BATCH_SIZE
+        self.max_wait_ms = self.MAX_WAIT_MS if max_wait_ms is None else max_wait_ms
+        self.batches = self.requests = 0
+        self._lock = threading.Lock()
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._last_batch_size = 0
+
+    def submit(self, resume_data):
+        """提交一条简历，返回 concurrent.futures.Future；简历不合法时直接抛出 ValueError"""
+        predictor = self._predictor()
+        error = predictor.validate_resume(resume_data)
+        if error:
+            raise ValueError(error)
+
+        future = Future()
+        self._ensure_worker().put((resume_data, future))
+        return future
+
+    def predict(self, resume_data, timeout=None):
+        """预测单条简历（多线程服务中阻塞等待所在批次完成），与 ResumePredictor.predict_single 结果一致"""
+        return self.submit(resume_data).result(timeout)
+
+    async def predict_async(self, resume_data):
+        """预测单条简历（asyncio 服务中等待时不阻塞事件循环）"""
+        return await asyncio.wrap_future(self.submit(resume_data))
+
+    def stats(self):
+        """合批统计"""
+        with self._lock:
+            batches, requests = self.batches, self.requests
+        return {
+            'batches': batches,
+            'requests': requests,
+            'mean_batch_size': requests / batches if batches else 0.0,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait_ms
+        }
+
+    def _predictor(self):
+        predictor = self.get_predictor()
+        if predictor is None:
+            raise RuntimeError('模型未加载')
+        return predictor
+
+    def _ensure_worker(self):
+        """按需启动后台线程；fork 出的子进程中线程不存在，重新启动"""
+        with self._lock:
+            if self._pid != os.getpid():
+                self._queue = queue.SimpleQueue()
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._queue,), name='micro-batcher', daemon=True
+                )
+                self._thread.start()
+                self._pid = os.getpid()
+            return self._queue
+
+    def _collect(self, pending):
+        """阻塞取到第一条请求，再在时间窗内收集至多 max_batch_size 条"""
+        batch = [pending.get()]
+        wait_ms = self.max_wait_ms if self._last_batch_size > 1 else 0
+        deadline = time.perf_counter() + wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(pending.get(timeout=remaining) if remaining > 0 else pending.get_nowait())
+            except queue.Empty:
+                break
+        self._last_batch_size = len(batch)
+        return batch
+
+    def _run(self, pending):
+        while True:
+            batch = self._collect(pending)
+            # 已被取消（如等待超时的协程）的请求不再预测
+            batch = [(resume, future) for resume, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                results = self._predictor().predict_records([resume for resume, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+            with self._lock:
+                self.batches += 1
+                self.requests += len(batch)
@@ -0,0 +1,160 @@
+"""
+模型产物模块 - 版本化的模型目录：JSON清单 + 可内存映射的推理数组 + 按需加载的子模型文件
+"""
+import copy
+import json
+import os
+import shutil
+import time
+
+from app.services.tree_engine import TreeEnsemble
+
+
+class ModelArtifact:
+    """模型产物目录
+
+    目录结构：
+        manifest.json               格式版本、特征名、类别编码、判定阈值、测试集指标、子模型清单
+        engine/<数组名>.npy         编译后的树模型推理数组，以内存映射方式加载
+        estimators/<子模型名>.joblib 各子模型（不压缩），只在需要原模型时加载
+        estimators/ensemble.joblib  去掉子模型后的集成模型外壳（标签编码、权重等）
+
+    预测服务启动时只读取清单并映射推理数组，不导入 sklearn/xgboost/lightgbm/joblib。
+    """
+
+    FORMAT_VERSION = 1
+    MANIFEST = 'manifest.json'
+    ENGINE_DIR = 'engine'
+    ESTIMATORS_DIR = 'estimators'
+    ENSEMBLE_FILE = 'ensemble.joblib'
+    DEFAULT_THRESHOLD = 0.5
+
+    def __init__(self, path, manifest):
+        self.path = path
+        self.manifest = manifest
+        self._engine = None
+        self._model = None
+
+    @classmethod
+    def exists(cls, path):
+        return os.path.isfile(os.path.join(path, cls.MANIFEST))
+
+    @classmethod
+    def load(cls, path):
+        """只读取清单，推理数组与子模型都在首次使用时加载"""
+        with open(os.path.join(path, cls.MANIFEST), encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('format_version') != cls.FORMAT_VERSION:
+            raise ValueError(f"不支持的模型产物格式版本: {manifest.get('format_version')}")
+        return cls(path, manifest)
+
+    @classmethod
+    def write(cls, path, model, feature_names, data_processor, metrics=None, threshold=None, version=None):
+        """保存模型产物：先写入临时目录，完整写好后再替换旧目录；version 默认按当前时间生成"""
+        import joblib
+
+        tmp_path = f'{path}.tmp-{os.getpid()}'
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(os.path.join(tmp_path, cls.ESTIMATORS_DIR))
+
+        manifest = {
+            'format_version': cls.FORMAT_VERSION,
+            'version': version or time.strftime('%Y%m%d-%H%M%S'),
+            'created_at': time.time(),
+            'model_class': type(model).__name__,
+            'feature_names': list(feature_names),
+            'encodings': data_processor.encodings(),
+            'threshold': cls.DEFAULT_THRESHOLD if threshold is None else float(threshold),
+            'metrics': {key: float(value) for key, value in (metrics or {}).items()},
+            'estimators': [],
+            'engine': None
+        }
+
+        # 子模型分别保存，外壳中不再重复保存子模型
+        if hasattr(model, 'estimators_'):
+            names = [name for name, est in model.estimators if est != 'drop']
+            members = list(zip(names, model.estimators_))
+            shell = copy.copy(model)
+            del shell.estimators_, shell.named_estimators_
+            joblib.dump(shell, os.path.join(tmp_path, cls.ESTIMATORS_DIR, cls.ENSEMBLE_FILE))
+        else:
+            members = [('model', model)]
+        for name, estimator in members:
+            file = f'{cls.ESTIMATORS_DIR}/{name}.joblib'
+            joblib.dump(estimator, os.path.join(tmp_path, file))
+            manifest['estimators'].append({'name': name, 'class': type(estimator).__name__, 'file': file})
+
+        try:
+            engine = TreeEnsemble.from_model(model, feature_names)
+            manifest['engine'] = engine.save_arrays(os.path.join(tmp_path, cls.ENGINE_DIR))
+        except ValueError as e:
+            print(f"跳过树模型编译: {e}")
+
+        cls._write_manifest(tmp_path, manifest)
+        cls._replace_dir(tmp_path, path)
+        return cls(path, manifest)
+
+    @classmethod
+    def _write_manifest(cls, path, manifest):
+        with open(os.path.join(path, cls.MANIFEST), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def _replace_dir(src, dst):
+        """用 src 目录替换 dst 目录"""
+        old_path = f'{dst}.old-{os.getpid()}'
+        if os.path.exists(dst):
+            os.rename(dst, old_path)
+        os.rename(src, dst)
+        shutil.rmtree(old_path, ignore_errors=True)
+
+    @property
+    def version(self):
+        return self.manifest['version']
+
+    @property
+    def feature_names(self):
+        return self.manifest['feature_names']
+
+    @property
+    def encodings(self):
+        return self.manifest['encodings']
+
+    @property
+    def threshold(self):
+        return self.manifest['threshold']
+
+    @property
+    def metrics(self):
+        return self.manifest['metrics']
+
+    @property
+    def engine(self):
+        """编译后的树模型推理引擎（内存映射），模型不支持编译时为 None"""
+        if self._engine is None and self.manifest['engine'] is not None:
+            self._engine = TreeEnsemble.load_arrays(
+                os.path.join(self.path, self.ENGINE_DIR), self.manifest['engine']
+            )
+        return self._engine
+
+    @property
+    def model(self):
+        """原始模型：按需导入 joblib 加载各子模型（numpy 数组以内存映射方式读取）"""
+        if self._model is None:
+            import joblib
+
+            members = [
+                (entry['name'], joblib.load(os.path.join(self.path, entry['file']), mmap_mode='r'))
+                for entry in self.manifest['estimators']
+            ]
+            shell_path = os.path.join(self.path, self.ESTIMATORS_DIR, self.ENSEMBLE_FILE)
+            if os.path.exists(shell_path):
+                from sklearn.utils import Bunch
+
+                model = joblib.load(shell_path)
+                model.estimators_ = [estimator for _, estimator in members]
+                model.named_estimators_ = Bunch(**dict(members))
+            else:
+                model = members[0][1]
+            self._model = model
+        return self._model
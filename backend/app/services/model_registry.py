@@ -0,0 +1,224 @@
+"""
+模型注册表模块 - 本地磁盘上的模型版本管理、发布与回滚，以及预测服务的模型热加载
+"""
+import json
+import os
+import shutil
+import threading
+import time
+
+from app.services.model_artifact import ModelArtifact
+
+
+def local_model_path(model_dir):
+    """注册表为空时使用的模型：单独的模型产物目录 model_dir，不存在时为旧版单文件模型 model_dir.pkl"""
+    return model_dir if os.path.isdir(model_dir) else model_dir + '.pkl'
+
+
+def default_model_path(registry, model_dir):
+    """与服务启动时相同的查找顺序：注册表当前发布的版本 → 模型产物目录 → 旧版单文件模型"""
+    version = registry.current()
+    return registry.path(version) if version else local_model_path(model_dir)
+
+
+class ModelRegistry:
+    """模型版本注册表
+
+    目录结构：
+        <版本号>/        每个版本一个模型产物目录（见 ModelArtifact），写入后不再修改
+        registry.json   当前发布的版本与发布历史，整体写入临时文件后替换
+
+    发布只改写 registry.json，各预测进程通过 ModelWatcher 发现新版本后各自加载并切换。
+    """
+
+    REGISTRY_FILE = 'registry.json'
+    # 保留的版本数（当前版本与发布历史中最近的版本不会被清理）
+    KEEP_VERSIONS = 10
+    MAX_HISTORY = 100
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, *parts):
+        return os.path.join(self.root, *parts)
+
+    def path(self, version):
+        """版本对应的模型产物目录"""
+        return self._path(version)
+
+    def _read(self):
+        try:
+            with open(self._path(self.REGISTRY_FILE), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'current': None, 'history': []}
+
+    def _write(self, state):
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(self.REGISTRY_FILE)
+        tmp_path = f'{path}.tmp-{os.getpid()}'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def _new_version(self):
+        """按时间生成版本号，同一秒内多次发布时追加序号"""
+        base = time.strftime('%Y%m%d-%H%M%S')
+        version, n = base, 1
+        while os.path.exists(self._path(version)):
+            n += 1
+            version = f'{base}-{n}'
+        return version
+
+    def publish(self, model, feature_names, data_processor, metrics=None, promote=True):
+        """保存为新版本（可选同时发布），返回版本号"""
+        version = self._new_version()
+        ModelArtifact.write(self._path(version), model, feature_names, data_processor,
+                            metrics=metrics, version=version)
+        if promote:
+            self.promote(version)
+        self.prune()
+        return version
+
+    def promote(self, version):
+        """发布指定版本；再次发布当前版本同样记入历史，各进程会立即重新尝试加载之前加载失败的该版本"""
+        if not ModelArtifact.exists(self._path(version)):
+            raise ValueError(f'模型版本不存在: {version}')
+        state = self._read()
+        state['current'] = version
+        state['history'] = state['history'][-self.MAX_HISTORY + 1:] + [
+            {'version': version, 'promoted_at': time.time()}
+        ]
+        self._write(state)
+        return version
+
+    def rollback(self, version=None):
+        """回滚到指定版本；未指定时回滚到上一个发布的版本"""
+        if version is None:
+            state = self._read()
+            previous = [
+                entry['version'] for entry in reversed(state['history'])
+                if entry['version'] != state['current'] and ModelArtifact.exists(self._path(entry['version']))
+            ]
+            if not previous:
+                raise ValueError('没有可回滚的版本')
+            version = previous[0]
+        return self.promote(version)
+
+    def current(self):
+        """当前发布的版本号（没有时为 None）"""
+        return self._read()['current']
+
+    def current_promotion(self):
+        """当前版本最近一次发布的记录 {'version', 'promoted_at'}（没有发布的版本时为 None）"""
+        state = self._read()
+        if state['current'] is None:
+            return None
+        for entry in reversed(state['history']):
+            if entry['version'] == state['current']:
+                return entry
+        return {'version': state['current'], 'promoted_at': None}
+
+    def versions(self):
+        """全部版本（从新到旧），含训练指标与是否为当前版本"""
+        if not os.path.isdir(self.root):
+            return []
+        current = self.current()
+        result = []
+        for name in os.listdir(self.root):
+            if not ModelArtifact.exists(self._path(name)):
+                continue
+            artifact = ModelArtifact.load(self._path(name))
+            result.append({
+                'version': artifact.version,
+                'created_at': artifact.manifest['created_at'],
+                'model_class': artifact.manifest['model_class'],
+                'metrics': artifact.metrics,
+                'current': name == current
+            })
+        result.sort(key=lambda entry: entry['created_at'], reverse=True)
+        return result
+
+    def prune(self, keep=None):
+        """只保留最近的 keep 个版本，当前版本与最近发布过的版本不删除"""
+        keep = keep or self.KEEP_VERSIONS
+        state = self._read()
+        protected = {state['current']} | {entry['version'] for entry in state['history'][-keep:]}
+        versions = [entry['version'] for entry in self.versions()]
+        for version in versions[keep:]:
+            if version not in protected:
+                # 已加载该版本的进程仍持有内存映射，Linux 下删除文件不影响其继续使用
+                shutil.rmtree(self._path(version), ignore_errors=True)
+
+
+class ModelWatcher:
+    """模型热加载
+
+    后台线程定期检查注册表当前发布的版本，与已加载的版本不同时在后台线程中完整加载新模型，
+    加载成功后才调用 on_load(predictor) 切换引用；加载失败时保留原模型，按退避间隔重试，
+    再次发布或回滚到该版本时立即重试。
+    """
+
+    POLL_SECONDS = 2.0
+    # 加载失败后的重试间隔，每次失败翻倍，不超过 MAX_RETRY_SECONDS
+    RETRY_SECONDS = 30.0
+    MAX_RETRY_SECONDS = 600.0
+
+    def __init__(self, registry, load, on_load, poll_seconds=None):
+        self.registry = registry
+        self.load = load
+        self.on_load = on_load
+        self.poll_seconds = poll_seconds or self.POLL_SECONDS
+        self.loaded_version = None
+        self.failed_version = None
+        self._failed_promotion = None
+        self._failures = 0
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check(self):
+        """加载新发布的版本，返回当前已加载的版本号"""
+        with self._lock:
+            promotion = self.registry.current_promotion()
+            version = promotion['version'] if promotion else None
+            if version is None or version == self.loaded_version:
+                return self.loaded_version
+            if promotion == self._failed_promotion:
+                if time.time() < self._retry_at:
+                    return self.loaded_version
+            else:
+                self._failures = 0
+            try:
+                predictor = self.load(self.registry.path(version))
+            except Exception as e:
+                self.failed_version, self._failed_promotion = version, promotion
+                delay = min(self.RETRY_SECONDS * 2 ** self._failures, self.MAX_RETRY_SECONDS)
+                self._failures += 1
+                self._retry_at = time.time() + delay
+                print(f"✗ 模型版本 {version} 加载失败，继续使用 {self.loaded_version}，{delay:.0f}s 后重试: {e}")
+                return self.loaded_version
+            self.on_load(predictor)
+            self.loaded_version = version
+            self.failed_version = self._failed_promotion = None
+            self._failures = 0
+            print(f"✓ 已切换到模型版本 {version}（加载 {predictor.load_seconds * 1000:.1f}ms）")
+            return version
+
+    def start(self):
+        """启动后台检查线程（fork 出的子进程中线程不存在，可再次调用以重新启动）"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='model-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"! 检查模型版本失败: {e}")
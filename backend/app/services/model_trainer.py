@@ -12,26 +12,54 @@ from sklearn.metrics import (
 )
 from xgboost import XGBClassifier
 from lightgbm import LGBMClassifier
-from imblearn.over_sampling import SMOTE
 import joblib
 import os
+import time
+
+from app.services.hyperparameter_search import HalvingSearch
+from app.services.training_cache import TrainingCache
+from app.services.training_scheduler import TrainingScheduler, classification_metrics
+from app.utils.data_processor import ResumeDataProcessor
+from app.utils.oversampling import make_oversampler, positive_class_weight
+from app.services.model_artifact import ModelArtifact
 
 
 class ResumeModelTrainer:
     """简历筛选模型训练器"""
     
-    def __init__(self, data_processor):
+    def __init__(self, data_processor, cache_dir=None):
         self.data_processor = data_processor
+        # 指定 cache_dir 时缓存特征化数据、交叉验证折和已训练的模型
+        self.cache = TrainingCache(cache_dir) if cache_dir else None
         self.models = {}
         self.best_model = None
         self.feature_importance = None
+        self.training_stats = {}
+        self.ensemble_metrics = None
         self.feature_names = None
+        self.pos_weight = None
         
-    def prepare_data(self, df, test_size=0.2, use_smote=True):
-        """准备训练数据"""
+    def prepare_data(self, df, test_size=0.2, use_smote=True, balance=None):
+        """准备训练数据
+
+        balance 为不平衡处理方式（见 app.utils.oversampling.BALANCE_METHODS），
+        未指定时按 use_smote 使用精确 SMOTE 或不处理；'weight' 不重采样，训练时为模型设置类别权重。
+        """
+        balance = balance or ('smote' if use_smote else 'none')
         print("=" * 60)
         print("数据预处理开始...")
         
+        if self.cache is not None:
+            cache_key = self.cache.split_key(df, test_size=test_size, balance=balance)
+            cached = self.cache.load_split(cache_key)
+            if cached is not None:
+                split, extra = cached
+                self.feature_names = extra['feature_names']
+                self.pos_weight = extra['pos_weight']
+                print(f"✓ 使用缓存的训练数据: {cache_key[:12]}")
+                print(f"训练集: {len(split['X_train'])} 条, 测试集: {len(split['X_test'])} 条, 特征数量: {len(self.feature_names)}")
+                return split['X_train'], split['X_test'], split['y_train'], split['y_test']
+        
         # 特征工程
         X, y = self.data_processor.process_training_data(df)
         self.feature_names = X.columns.tolist()
@@ -47,14 +75,49 @@ class ResumeModelTrainer:
         )
         
         # 处理数据不平衡
-        if use_smote:
-            print("\n应用SMOTE处理数据不平衡...")
-            smote = SMOTE(random_state=42)
-            X_train, y_train = smote.fit_resample(X_train, y_train)
-            print(f"SMOTE后训练集标签分布:\n{pd.Series(y_train).value_counts()}")
+        oversampler = make_oversampler(balance)
+        self.pos_weight = positive_class_weight(y_train) if balance == 'weight' else None
+        if oversampler is not None:
+            print(f"\n应用{balance}处理数据不平衡...")
+            start = time.time()
+            X_train, y_train = oversampler.fit_resample(X_train, y_train)
+            print(f"重采样用时 {time.time() - start:.2f}s，训练集标签分布:\n{pd.Series(y_train).value_counts()}")
+        elif self.pos_weight is not None:
+            print(f"\n使用类别权重处理数据不平衡，正样本权重: {self.pos_weight:.3f}")
+        
+        if self.cache is not None:
+            self.cache.save_split(
+                cache_key,
+                {'X_train': X_train, 'X_test': X_test, 'y_train': y_train, 'y_test': y_test},
+                extra={'feature_names': self.feature_names, 'pos_weight': self.pos_weight}
+            )
         
         return X_train, X_test, y_train, y_test
     
+    def _weighted(self, model):
+        """类别权重模式下为模型设置正样本权重（GradientBoosting 等不支持的模型保持不变）"""
+        if self.pos_weight is None:
+            return model
+        params = model.get_params(deep=False)
+        if 'scale_pos_weight' in params:
+            model.set_params(scale_pos_weight=self.pos_weight)
+        elif 'class_weight' in params:
+            model.set_params(class_weight={0: 1.0, 1: self.pos_weight})
+        return model
+    
+    def _fit(self, model, X, y):
+        """训练模型，启用缓存时复用参数与数据相同的已训练模型"""
+        if self.cache is not None:
+            return self.cache.fit(model, X, y)
+        model.fit(X, y)
+        return model
+    
+    def _cv(self, y, n_splits=5):
+        """交叉验证折，启用缓存时从磁盘读取"""
+        if self.cache is not None:
+            return self.cache.folds(y, n_splits)
+        return n_splits
+    
     def train_baseline_models(self, X_train, y_train, X_test, y_test):
         """训练基线模型"""
         print("\n" + "=" * 60)
@@ -68,40 +131,63 @@ class ResumeModelTrainer:
             'LightGBM': LGBMClassifier(n_estimators=100, random_state=42, verbose=-1)
         }
         
+        models = {name: self._weighted(model) for name, model in models.items()}
         results = {}
+        self.training_stats = {}
         
-        for name, model in models.items():
-            print(f"\n训练 {name}...")
-            model.fit(X_train, y_train)
-            
-            # 预测
-            y_pred = model.predict(X_test)
-            y_proba = model.predict_proba(X_test)[:, 1]
-            
-            # 评估
-            metrics = {
-                'accuracy': accuracy_score(y_test, y_pred),
-                'precision': precision_score(y_test, y_pred),
-                'recall': recall_score(y_test, y_pred),
-                'f1': f1_score(y_test, y_pred),
-                'roc_auc': roc_auc_score(y_test, y_proba)
-            }
-            
+        def report(name, model, metrics, stats=None):
             results[name] = metrics
             self.models[name] = model
             
+            if stats is None:
+                print(f"\n{name}（缓存）")
+            else:
+                self.training_stats[name] = stats
+                memory = f", 进程峰值内存 {stats['memory_mb']:.0f}MB" if stats['memory_mb'] is not None else ""
+                print(f"\n{name}（{stats['threads']} 线程, 用时 {stats['seconds']:.2f}s{memory}）")
             print(f"  准确率: {metrics['accuracy']:.4f}")
             print(f"  精确率: {metrics['precision']:.4f}")
             print(f"  召回率: {metrics['recall']:.4f}")
             print(f"  F1分数: {metrics['f1']:.4f}")
             print(f"  ROC-AUC: {metrics['roc_auc']:.4f}")
         
+        # 已缓存的模型直接评估，其余模型并发训练，每完成一个立即输出
+        pending = {}
+        for name, model in models.items():
+            cached = self.cache.get(model, X_train, y_train) if self.cache is not None else None
+            if cached is not None:
+                report(name, cached, classification_metrics(cached, X_test, y_test))
+            else:
+                pending[name] = model
+        
+        if pending:
+            scheduler = TrainingScheduler()
+            print(f"\n并发训练 {len(pending)} 个模型（{scheduler.n_cpus} 核）...")
+            
+            def on_result(result):
+                name = result['name']
+                if self.cache is not None:
+                    self.cache.put(models[name], X_train, y_train, result['model'])
+                report(name, result['model'], result['metrics'], {
+                    'seconds': result['seconds'], 'memory_mb': result['memory_mb'], 'threads': result['threads']
+                })
+            
+            start = time.time()
+            scheduler.run(pending, X_train, y_train, X_test, y_test, on_result=on_result)
+            print(f"\n基线模型训练总用时: {time.time() - start:.2f}s")
+        
+        # 按原顺序返回
+        results = {name: results[name] for name in models}
         return results
     
-    def optimize_best_model(self, X_train, y_train, X_test, y_test):
-        """优化最佳模型"""
+    def optimize_best_model(self, X_train, y_train, X_test, y_test, search='grid', journal_path=None):
+        """优化最佳模型
+
+        search='grid' 为穷举网格搜索；'halving' / 'hyperband' 以提升轮数为预算逐次减半并早停，
+        试验记录写入 journal_path，中断后可续跑。
+        """
         print("\n" + "=" * 60)
-        print("超参数调优 - XGBoost...")
+        print(f"超参数调优 - XGBoost ({search})...")
         
         param_grid = {
             'n_estimators': [100, 200, 300],
@@ -111,19 +197,36 @@ class ResumeModelTrainer:
             'colsample_bytree': [0.8, 1.0]
         }
         
-        xgb = XGBClassifier(random_state=42, eval_metric='logloss')
-        
-        grid_search = GridSearchCV(
-            xgb, param_grid, cv=5, scoring='f1', n_jobs=-1, verbose=1
-        )
-        
-        grid_search.fit(X_train, y_train)
+        start = time.time()
+        if search == 'grid':
+            # 并行由 GridSearchCV 的进程负责，XGBoost 单线程避免线程过量
+            xgb = self._weighted(XGBClassifier(random_state=42, eval_metric='logloss', n_jobs=1))
+            
+            grid_search = GridSearchCV(
+                xgb, param_grid, cv=self._cv(y_train), scoring='f1', n_jobs=-1, verbose=1
+            )
+            
+            grid_search = self._fit(grid_search, X_train, y_train)
+            best_params, best_score = grid_search.best_params_, grid_search.best_score_
+            best_model = grid_search.best_estimator_
+        else:
+            rounds = param_grid.pop('n_estimators')
+            if self.pos_weight is not None:
+                param_grid['scale_pos_weight'] = [self.pos_weight]
+            halving = HalvingSearch(
+                param_grid, max_rounds=max(rounds), min_rounds=min(rounds) // 3,
+                cv=self._cv(y_train), mode=search, journal_path=journal_path
+            )
+            halving.fit(X_train, y_train)
+            best_params = dict(halving.best_params_, n_estimators=halving.best_rounds_)
+            best_score = halving.best_score_
+            best_model = self._fit(halving.make_estimator(), X_train, y_train)
         
-        print(f"\n最佳参数: {grid_search.best_params_}")
-        print(f"最佳CV分数: {grid_search.best_score_:.4f}")
+        print(f"\n最佳参数: {best_params}")
+        print(f"最佳CV分数: {best_score:.4f}")
+        print(f"搜索用时: {time.time() - start:.1f}s")
         
         # 评估优化后的模型
-        best_model = grid_search.best_estimator_
         y_pred = best_model.predict(X_test)
         y_proba = best_model.predict_proba(X_test)[:, 1]
         
@@ -147,19 +250,19 @@ class ResumeModelTrainer:
             ('lgbm', LGBMClassifier(n_estimators=200, max_depth=5, learning_rate=0.1, random_state=42, verbose=-1))
         ]
         
+        estimators = [(name, self._weighted(model)) for name, model in estimators]
         ensemble = VotingClassifier(estimators=estimators, voting='soft', n_jobs=-1)
-        ensemble.fit(X_train, y_train)
+        ensemble = self._fit(ensemble, X_train, y_train)
         
-        # 评估
-        y_pred = ensemble.predict(X_test)
-        y_proba = ensemble.predict_proba(X_test)[:, 1]
+        # 评估（指标随模型一起写入模型产物清单）
+        self.ensemble_metrics = classification_metrics(ensemble, X_test, y_test)
         
         print("\n集成模型测试集表现:")
-        print(f"  准确率: {accuracy_score(y_test, y_pred):.4f}")
-        print(f"  精确率: {precision_score(y_test, y_pred):.4f}")
-        print(f"  召回率: {recall_score(y_test, y_pred):.4f}")
-        print(f"  F1分数: {f1_score(y_test, y_pred):.4f}")
-        print(f"  ROC-AUC: {roc_auc_score(y_test, y_proba):.4f}")
+        print(f"  准确率: {self.ensemble_metrics['accuracy']:.4f}")
+        print(f"  精确率: {self.ensemble_metrics['precision']:.4f}")
+        print(f"  召回率: {self.ensemble_metrics['recall']:.4f}")
+        print(f"  F1分数: {self.ensemble_metrics['f1']:.4f}")
+        print(f"  ROC-AUC: {self.ensemble_metrics['roc_auc']:.4f}")
         
         return ensemble
     
@@ -179,18 +282,32 @@ class ResumeModelTrainer:
         
         return feature_imp.head(top_n)
     
-    def save_model(self, model, model_path):
-        """保存模型"""
+    def save_model(self, model, model_path, metrics=None):
+        """保存为模型产物目录（清单 + 推理数组 + 子模型文件），见 ModelArtifact"""
         os.makedirs(os.path.dirname(model_path), exist_ok=True)
-        joblib.dump({
-            'model': model,
-            'feature_names': self.feature_names,
-            'data_processor': self.data_processor
-        }, model_path)
-        print(f"\n模型已保存到: {model_path}")
+        artifact = ModelArtifact.write(
+            model_path, model, self.feature_names, self.data_processor,
+            metrics=metrics if metrics is not None else self.ensemble_metrics
+        )
+        print(f"\n模型已保存到: {model_path}（版本 {artifact.version}）")
+    
+    def publish_model(self, model, registry, metrics=None, promote=True):
+        """保存为模型注册表中的新版本（默认同时发布，预测服务会自动热加载），返回版本号"""
+        version = registry.publish(
+            model, self.feature_names, self.data_processor,
+            metrics=metrics if metrics is not None else self.ensemble_metrics, promote=promote
+        )
+        print(f"\n模型已保存为版本 {version}{'（已发布）' if promote else ''}: {registry.path(version)}")
+        return version
     
     def load_model(self, model_path):
-        """加载模型"""
+        """加载模型（模型产物目录或旧版 .pkl 文件）"""
+        if os.path.isdir(model_path):
+            artifact = ModelArtifact.load(model_path)
+            self.best_model = artifact.model
+            self.feature_names = artifact.feature_names
+            self.data_processor = ResumeDataProcessor.from_encodings(artifact.encodings)
+            return self.best_model
         data = joblib.load(model_path)
         self.best_model = data['model']
         self.feature_names = data['feature_names']
@@ -0,0 +1,64 @@
+"""
+候选池通过概率模块 - 对整个候选池一次批量预测，按模型版本与候选池内容缓存到磁盘
+"""
+import hashlib
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def pool_fingerprint(df):
+    """候选池内容指纹（与行索引无关）"""
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    digest = hashlib.blake2b(hashes.tobytes(), digest_size=16)
+    digest.update(','.join(map(str, df.columns)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class PoolScores:
+    """候选池通过概率
+
+    模型版本或候选池变化时重新计算；cache_dir 中按 <模型版本>-<候选池指纹>.npy 保存，
+    重启后同一模型、同一候选池直接以内存映射方式读取，无需重新预测。
+    """
+
+    # 缓存目录中保留的文件数
+    KEEP_FILES = 4
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+
+    def _path(self, predictor, df):
+        return os.path.join(self.cache_dir, f'{predictor.cache_namespace}-{pool_fingerprint(df)}.npy')
+
+    def compute(self, predictor, df):
+        """全体候选人的通过概率"""
+        path = self._path(predictor, df) if self.cache_dir else None
+        if path is not None and os.path.exists(path):
+            return np.load(path, mmap_mode='r')
+
+        start = time.perf_counter()
+        probabilities = predictor.predict_pool(df)
+        print(f"✓ 候选池通过概率计算完成: {len(df)} 人, 用时 {time.perf_counter() - start:.2f}s")
+        if path is not None:
+            self._save(path, probabilities)
+        return probabilities
+
+    def _save(self, path, probabilities):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f'{path}.tmp-{os.getpid()}'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, probabilities)
+        os.replace(tmp_path, path)
+
+        files = sorted(
+            (os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith('.npy')),
+            key=os.path.getmtime, reverse=True
+        )
+        for old_path in files[self.KEEP_FILES:]:
+            try:
+                os.remove(old_path)
+            except FileNotFoundError:  # 其他进程已删除
+                pass
@@ -0,0 +1,203 @@
+"""
+预测结果缓存模块 - 按简历中参与特征工程的字段缓存预测结果，支持多进程共享的 SQLite 存储
+"""
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+def canonical_key(resume, fields, namespace):
+    """简历的规范化键：只取参与特征工程的字段（姓名、电话、邮箱等不影响预测的字段不参与），
+    数值统一为 float、None 与 NaN 视为相同，再与模型版本一起哈希"""
+    values = [namespace]
+    for field in fields:
+        value = resume.get(field)
+        # 大部分字段为字符串，先跳过
+        if value.__class__ is not str and value is not None:
+            if isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool):
+                value = float(value)
+                if math.isnan(value):
+                    value = None
+        values.append(value)
+    # repr 会转义字符串中的分隔符，并区分字符串 '1.0' 与数值 1.0
+    payload = '\x1f'.join(map(repr, values))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class _SQLiteStore:
+    """多个进程共享的预测结果存储（WAL 模式，读写互不阻塞）
+
+    每个线程、每个进程各自持有连接：fork 出的子进程不能沿用父进程的连接。
+    """
+
+    # SQLite 单条语句的参数个数有上限，批量查询分段进行
+    QUERY_CHUNK = 500
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS predictions ('
+                'key TEXT PRIMARY KEY, namespace TEXT, result TEXT, expires_at REAL)'
+            )
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get_many(self, keys, now):
+        """返回未过期的 键 -> (过期时间, 结果)"""
+        found = {}
+        for start in range(0, len(keys), self.QUERY_CHUNK):
+            chunk = keys[start:start + self.QUERY_CHUNK]
+            rows = self._conn().execute(
+                f"SELECT key, result, expires_at FROM predictions "
+                f"WHERE key IN ({','.join('?' * len(chunk))}) AND expires_at > ?",
+                [*chunk, now]
+            )
+            found.update((key, (expires_at, json.loads(result))) for key, result, expires_at in rows)
+        return found
+
+    def put_many(self, items, namespace, expires_at):
+        conn = self._conn()
+        conn.execute('BEGIN')
+        conn.executemany(
+            'INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?)',
+            [(key, namespace, json.dumps(result, ensure_ascii=False), expires_at) for key, result in items.items()]
+        )
+        conn.execute('COMMIT')
+
+    def purge(self, namespace, now):
+        """删除过期的结果与其他模型版本的结果"""
+        self._conn().execute('DELETE FROM predictions WHERE namespace != ? OR expires_at <= ?', (namespace, now))
+
+    def count(self):
+        return self._conn().execute('SELECT COUNT(*) FROM predictions').fetchone()[0]
+
+
+class PredictionCache:
+    """预测结果缓存
+
+    本进程内为容量有限的 LRU，条目超过 ttl_seconds 后失效；指定 db_path 时另有 SQLite 共享存储，
+    本进程未命中时再查共享存储，多个工作进程可复用彼此的结果。
+    键中包含模型版本（namespace），切换版本后旧版本的结果不会再被命中，bind 时一并清理。
+    """
+
+    MAX_ENTRIES = 10000
+    TTL_SECONDS = 3600
+    # 共享存储每写入这么多条清理一次过期结果
+    PURGE_EVERY = 1000
+
+    def __init__(self, max_entries=None, ttl_seconds=None, db_path=None):
+        self.max_entries = max_entries or self.MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds or self.TTL_SECONDS
+        self.db_path = db_path
+        self.namespace = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._store = _SQLiteStore(db_path) if db_path else None
+        self._writes = 0
+        self.hits = self.shared_hits = self.misses = self.evictions = self.expirations = 0
+
+    def bind(self, namespace):
+        """切换到模型版本 namespace：版本变化时清空本进程缓存并清理共享存储中其他版本的结果"""
+        with self._lock:
+            if namespace == self.namespace:
+                return
+            self.namespace = namespace
+            self._entries.clear()
+        if self._store is not None:
+            self._store.purge(namespace, time.time())
+
+    def get_many(self, keys):
+        """查询一批键，返回命中的 键 -> 结果（结果为副本，可直接修改）"""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        now = time.time()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                expires_at, result = entry
+                if expires_at <= now:
+                    del self._entries[key]
+                    self.expirations += 1
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = result
+            self.hits += len(found)
+
+        missing = [key for key in keys if key not in found]
+        if missing and self._store is not None:
+            # 沿用共享存储中的过期时间，不因复制到本进程而延长有效期
+            shared = self._store.get_many(missing, now)
+            self._put_local(shared)
+            found.update((key, result) for key, (_, result) in shared.items())
+            with self._lock:
+                self.shared_hits += len(shared)
+        with self._lock:
+            self.misses += len(keys) - len(found)
+        return {key: dict(result) for key, result in found.items()}
+
+    def put_many(self, items, namespace):
+        """写入模型版本 namespace 的一批 键 -> 结果；切换版本后旧预测器写入的结果直接丢弃"""
+        if not items or namespace != self.namespace:
+            return
+        items = {key: dict(result) for key, result in items.items()}
+        expires_at = time.time() + self.ttl_seconds
+        self._put_local({key: (expires_at, result) for key, result in items.items()})
+        if self._store is not None:
+            self._store.put_many(items, self.namespace, expires_at)
+            with self._lock:
+                self._writes += len(items)
+                purge = self._writes >= self.PURGE_EVERY
+                if purge:
+                    self._writes = 0
+            if purge:
+                self._store.purge(self.namespace, time.time())
+
+    def _put_local(self, entries):
+        """写入本进程缓存，entries 为 键 -> (过期时间, 结果)"""
+        with self._lock:
+            for key, entry in entries.items():
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """命中、未命中、淘汰等计数（本进程）"""
+        lookups = self.hits + self.shared_hits + self.misses
+        return {
+            'namespace': self.namespace,
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'hits': self.hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'hit_rate': (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+            'shared_store': self.db_path,
+            'shared_entries': self._store.count() if self._store is not None else None
+        }
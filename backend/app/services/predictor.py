@@ -3,62 +3,243 @@
 """
 import pandas as pd
 import numpy as np
-import joblib
+import os
+import time
+
+from app.services.model_artifact import ModelArtifact
+from app.services.prediction_cache import canonical_key
+from app.services.tree_engine import TreeEnsemble, compiled_model_path
+from app.utils.data_processor import ResumeDataProcessor
 
 
 class ResumePredictor:
     """简历预测器"""
     
-    def __init__(self, model_path):
-        """加载模型"""
-        data = joblib.load(model_path)
-        self.model = data['model']
-        self.feature_names = data['feature_names']
-        self.data_processor = data['data_processor']
+    # 特征工程需要读取的字段
+    REQUIRED_FIELDS = [
+        '年龄', '意向岗位', '学历层次', '院校类别', '专业类别', '英语水平',
+        '编程语言', '编程语言熟练度',
+        '前端技术', '前端技术熟练度', '后端技术', '后端技术熟练度',
+        '数据库', '数据库熟练度', '云计算/运维', '云计算/运维熟练度',
+        '数据与算法', '数据与算法熟练度', '移动开发', '移动开发熟练度',
+        '测试工具', '测试工具熟练度',
+        '小型企业工作经验', '中型企业工作经验', '大型企业工作经验',
+        '小规模项目', '中规模项目', '大规模项目'
+    ]
     
-    def predict_single(self, resume_data):
-        """预测单条简历"""
-        # 转换为DataFrame
-        df = pd.DataFrame([resume_data])
+    # 允许为空的数值字段
+    NUMERIC_FIELDS = ['小规模项目', '中规模项目', '大规模项目']
+    
+    # 整个候选池打分时每块的行数
+    POOL_CHUNK_ROWS = 50000
+    
+    def __init__(self, model_path, cache=None):
+        """加载模型
         
-        # 特征工程
-        features, _ = self.data_processor.process_training_data(df)
+        model_path 为模型产物目录时只读取清单并映射推理数组；
+        为旧版 .pkl 文件时优先使用旁边编译好的推理文件，否则加载原模型。
+        两种方式都不必导入 sklearn/xgboost/lightgbm。
+        cache 为 PredictionCache 时按简历内容缓存预测结果，多个版本的预测器可共用同一个缓存。
+        """
+        start = time.perf_counter()
+        self.model_path = model_path
+        self.artifact = None
+        self.engine = None
+        self._model = None
+        self.threshold = ModelArtifact.DEFAULT_THRESHOLD
         
-        # 确保特征顺序一致
-        features = features.reindex(columns=self.feature_names, fill_value=0)
+        if os.path.isdir(model_path):
+            self._load_artifact()
+        else:
+            self._load_legacy()
+        self.load_seconds = time.perf_counter() - start
         
-        # 预测
-        prediction = self.model.predict(features)[0]
-        probability = self.model.predict_proba(features)[0]
+        # 预测结果缓存的命名空间：模型版本，旧版单文件模型取文件大小与修改时间
+        if self.artifact is not None:
+            self.cache_namespace = self.artifact.version
+        else:
+            stat = os.stat(model_path)
+            self.cache_namespace = f'legacy-{stat.st_size}-{stat.st_mtime}'
+        self.cache = cache
+        if cache is not None:
+            cache.bind(self.cache_namespace)
+    
+    def _load_artifact(self):
+        """加载模型产物目录"""
+        self.artifact = ModelArtifact.load(self.model_path)
+        self.engine = self.artifact.engine
+        self.feature_names = self.artifact.feature_names
+        self.threshold = self.artifact.threshold
+        self.data_processor = ResumeDataProcessor.from_encodings(self.artifact.encodings)
+        if self.engine is None:
+            # 模型不支持编译：启动时就加载原模型，避免首个请求变慢
+            self._model = self.artifact.model
+    
+    def _load_legacy(self):
+        """加载旧版单文件模型"""
+        compiled_path = compiled_model_path(self.model_path)
+        if os.path.exists(compiled_path):
+            engine = TreeEnsemble.load(compiled_path)
+            if engine.is_fresh(self.model_path):
+                self.engine = engine
+            else:
+                print(f"! 树模型推理文件已过期，改为加载原模型（可运行 python compile_model.py 重新生成）: {compiled_path}")
         
-        result = {
-            'prediction': '通过' if prediction == 1 else '不通过',
-            'confidence': float(probability[1]),
-            'probability_pass': float(probability[1]),
-            'probability_fail': float(probability[0])
-        }
+        if self.engine is not None:
+            self.feature_names = self.engine.feature_names
+            self.data_processor = ResumeDataProcessor()
+        else:
+            data = self._load_pickle()
+            self._model = data['model']
+            self.feature_names = data['feature_names']
+            self.data_processor = data['data_processor']
+    
+    def _load_pickle(self):
+        import joblib
+        return joblib.load(self.model_path)
+    
+    @property
+    def version(self):
+        """模型版本（旧版单文件模型为 None）"""
+        return self.artifact.version if self.artifact is not None else None
+    
+    @property
+    def model(self):
+        """原始模型（使用编译后的推理文件时按需加载）"""
+        if self._model is None:
+            if self.artifact is not None:
+                self._model = self.artifact.model
+            else:
+                self._model = self._load_pickle()['model']
+        return self._model
+    
+    def validate_resume(self, resume_data):
+        """校验单条简历，返回错误信息（合法时返回None）"""
+        if not isinstance(resume_data, dict):
+            return '简历数据格式错误，应为JSON对象'
+        
+        missing = [field for field in self.REQUIRED_FIELDS if field not in resume_data]
+        if missing:
+            return f"缺少字段: {', '.join(missing)}"
+        
+        age = resume_data['年龄']
+        if isinstance(age, bool) or not isinstance(age, (int, float, np.integer, np.floating)) or pd.isna(age):
+            return '年龄必须为数字'
+        
+        for field in self.NUMERIC_FIELDS:
+            value = resume_data[field]
+            if value is None or (isinstance(value, float) and np.isnan(value)):
+                continue
+            if isinstance(value, bool) or not isinstance(value, (int, float, np.integer, np.floating)):
+                return f'{field}必须为数字'
+        
+        for field in self.REQUIRED_FIELDS:
+            if isinstance(resume_data[field], (list, dict, set, tuple)):
+                return f'{field}格式错误'
+        
+        return None
+    
+    def predict_single(self, resume_data):
+        """预测单条简历"""
+        error = self.validate_resume(resume_data)
+        if error:
+            raise ValueError(error)
         
-        return result
+        return self.predict_records([resume_data])[0]
     
     def predict_batch(self, resume_list):
-        """批量预测"""
-        results = []
-        
-        for resume in resume_list:
-            try:
-                result = self.predict_single(resume)
-                result['resume_id'] = resume.get('简历编号', 'N/A')
-                result['name'] = resume.get('姓名', 'N/A')
-                results.append(result)
-            except Exception as e:
-                results.append({
-                    'resume_id': resume.get('简历编号', 'N/A'),
-                    'name': resume.get('姓名', 'N/A'),
-                    'error': str(e)
-                })
+        """批量预测
+        
+        先逐条校验，不合法的记录单独返回错误；其余记录合并为一个DataFrame，
+        只做一次特征工程和一次 predict_proba。
+        """
+        results = [None] * len(resume_list)
+        valid_indices = []
+        
+        for i, resume in enumerate(resume_list):
+            error = self.validate_resume(resume)
+            if error:
+                results[i] = {
+                    'resume_id': resume.get('简历编号', 'N/A') if isinstance(resume, dict) else 'N/A',
+                    'name': resume.get('姓名', 'N/A') if isinstance(resume, dict) else 'N/A',
+                    'error': error
+                }
+            else:
+                valid_indices.append(i)
+        
+        if valid_indices:
+            records = [resume_list[i] for i in valid_indices]
+            for i, result in zip(valid_indices, self.predict_records(records)):
+                result['resume_id'] = resume_list[i].get('简历编号', 'N/A')
+                result['name'] = resume_list[i].get('姓名', 'N/A')
+                results[i] = result
         
         return results
     
+    def predict_records(self, records):
+        """预测已校验的简历：命中缓存的直接返回，其余（同一内容只算一次）合并为一个DataFrame预测"""
+        if self.cache is None:
+            return self._predict_frame(pd.DataFrame(records))
+        
+        namespace = self.cache_namespace
+        keys = [canonical_key(record, self.REQUIRED_FIELDS, namespace) for record in records]
+        results = self.cache.get_many(keys)
+        missing = {}
+        for key, record in zip(keys, records):
+            if key not in results and key not in missing:
+                missing[key] = record
+        if missing:
+            computed = dict(zip(missing, self._predict_frame(pd.DataFrame(list(missing.values())))))
+            self.cache.put_many(computed, namespace)
+            results.update(computed)
+        # 同一内容在批次中出现多次时各返回一份副本
+        return [dict(results[key]) for key in keys]
+    
+    def featurize(self, df):
+        """特征工程，返回按模型特征顺序排列的特征表"""
+        features, _ = self.data_processor.process_training_data(df)
+        
+        # 确保特征顺序一致
+        return features.reindex(columns=self.feature_names, fill_value=0)
+    
+    def predict_features(self, features):
+        """对特征表一次性调用 predict_proba，返回 (n, 2) 概率"""
+        if self.engine is not None:
+            return self.engine.predict_proba(features.to_numpy(dtype=np.float64))
+        return self.model.predict_proba(features)
+    
+    def _predict_proba(self, df):
+        """对整个DataFrame做特征工程并一次性调用 predict_proba，返回 (n, 2) 概率"""
+        return self.predict_features(self.featurize(df))
+    
+    def _predict_frame(self, df):
+        """对整个DataFrame做特征工程并一次性预测"""
+        probabilities = self._predict_proba(df)
+        # 按清单中的阈值判定（默认0.5，与 soft voting 的 predict 一致）
+        predictions = probabilities[:, 1] > self.threshold
+        
+        return [
+            {
+                'prediction': '通过' if prediction else '不通过',
+                'confidence': float(probability[1]),
+                'probability_pass': float(probability[1]),
+                'probability_fail': float(probability[0])
+            }
+            for prediction, probability in zip(predictions, probabilities)
+        ]
+    
+    def predict_pool(self, df, chunk_rows=None):
+        """候选池中每位候选人的通过概率（一维数组），按 chunk_rows 分块控制特征工程的内存占用
+        
+        候选池数据来自已校验的存储，不逐条校验，也不经过预测结果缓存。
+        """
+        chunk_rows = chunk_rows or self.POOL_CHUNK_ROWS
+        probabilities = np.empty(len(df), dtype=np.float64)
+        for start in range(0, len(df), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            probabilities[start:start + len(chunk)] = self._predict_proba(chunk)[:, 1]
+        return probabilities
+    
     def match_candidates(self, job_requirements, candidates_df, top_n=10):
         """岗位匹配推荐"""
         # 计算匹配度
@@ -112,12 +293,12 @@ class ResumePredictor:
         elif cand_school == req_school - 1:
             score += 5
         
-        # 技能匹配
+        # 技能匹配（重复的技能只计一次）
         max_score += 30
-        required_skills = requirements.get('skills', [])
+        required_skills = set(requirements.get('skills', []))
         if required_skills:
             candidate_skills = self._extract_all_skills(candidate)
-            matched_skills = len(set(required_skills) & set(candidate_skills))
+            matched_skills = len(required_skills & set(candidate_skills))
             score += min(30, (matched_skills / len(required_skills)) * 30)
         
         # 经验匹配
@@ -182,8 +363,11 @@ class ResumePredictor:
         """获取特征重要性"""
         importance = None
         
+        # 编译后的推理文件中保存了导出时计算好的特征重要性
+        if self.engine is not None and self.engine.feature_importances is not None:
+            importance = self.engine.feature_importances
         # 尝试直接获取特征重要性
-        if hasattr(self.model, 'feature_importances_'):
+        elif hasattr(self.model, 'feature_importances_'):
             importance = self.model.feature_importances_
         # 处理线性模型（使用系数绝对值）
         elif hasattr(self.model, 'coef_'):
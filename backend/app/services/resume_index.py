@@ -0,0 +1,231 @@
+"""
+简历列表索引模块
+"""
+import copy
+import json
+import threading
+from collections import OrderedDict
+from json.encoder import encode_basestring_ascii
+
+import numpy as np
+import pandas as pd
+
+
+class ResumeIndex:
+    """简历列表索引
+
+    启动时对筛选字段做字典编码，为每个取值保存行号数组和压缩位图：
+    单字段筛选直接取预先排好的行号数组，多字段筛选对位图按位与后再展开为行号，
+    展开结果按筛选条件缓存。列表按原始行顺序排列，分页只对当页的行取值，
+    不再复制整个 DataFrame。
+    简历编号建有哈希主键索引，详情与批量查询按行号直接取值并拼接为JSON。
+    """
+
+    # 查询参数 -> 简历列
+    FILTER_COLUMNS = {
+        'position': '意向岗位',
+        'education': '学历层次',
+        'school': '院校类别',
+        'english': '英语水平',
+        'result': '筛选结果'
+    }
+
+    ID_COLUMN = '简历编号'
+
+    # 多字段筛选结果的缓存条数
+    FILTER_CACHE_SIZE = 64
+
+    def __init__(self, resume_df):
+        """构建索引"""
+        self.size = len(resume_df)
+        self.column_names = list(resume_df.columns)
+        # 各列的底层数组（不复制）
+        self.columns = [resume_df[col].to_numpy() for col in self.column_names]
+        self._nullable = [col.dtype.kind in 'fO' for col in self.columns]
+        # 按键名排序输出，与 jsonify 一致
+        self._json_order = sorted(range(len(self.column_names)), key=lambda i: self.column_names[i])
+        self._json_template = '{' + ','.join(
+            encode_basestring_ascii(self.column_names[i]).replace('%', '%%') + ':%s' for i in self._json_order
+        ) + '}'
+
+        self._cache_lock = threading.Lock()
+        self.field_values = {}
+        self.field_codes = {}
+        for field, col in self.FILTER_COLUMNS.items():
+            codes, values = pd.factorize(resume_df[col])
+            self.field_values[field] = list(values)
+            self.field_codes[field] = codes
+        self._build_field_index()
+        self._build_id_index()
+
+    def _build_field_index(self):
+        """由字典编码生成每个取值的行号数组和位图"""
+        self.field_rows = {}
+        self.field_bitmaps = {}
+        for field, values in self.field_values.items():
+            codes = self.field_codes[field]
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(values) + 1))
+            self.field_rows[field] = {
+                value: order[bounds[i]:bounds[i + 1]] for i, value in enumerate(values)
+            }
+            self.field_bitmaps[field] = {
+                value: np.packbits(codes == i) for i, value in enumerate(values)
+            }
+        self._cache = OrderedDict()
+
+    def _build_id_index(self):
+        """简历编号 -> 行号的主键索引（编号重复时取第一行，与原先的过滤结果一致）"""
+        ids = pd.Series(self.columns[self.column_names.index(self.ID_COLUMN)])
+        first = ~ids.duplicated()
+        self._id_rows = np.flatnonzero(first.to_numpy())
+        self.id_index = pd.Index(ids[first].to_numpy())
+        # 哈希表在首次查询时才构建，多线程同时首次查询会出错，建索引时先构建好
+        self.id_index.get_indexer(self.id_index[:1])
+
+    def copy(self):
+        """副本：与原索引共享各数组（追加时整体替换而不原地修改），取值表与筛选结果缓存单独复制"""
+        index = copy.copy(self)
+        index.field_values = {field: list(values) for field, values in self.field_values.items()}
+        index.field_codes = dict(self.field_codes)
+        index._cache = OrderedDict()
+        index._cache_lock = threading.Lock()
+        return index
+
+    def append(self, new_df):
+        """追加简历并同步各索引，new_df 的列须与原数据一致；服务运行中应在 copy() 出的副本上追加后整体替换"""
+        new_df = new_df[self.column_names]
+        self.columns = [
+            np.concatenate([column, new_df[col].to_numpy().astype(column.dtype, copy=False)])
+            for column, col in zip(self.columns, self.column_names)
+        ]
+        for field, col in self.FILTER_COLUMNS.items():
+            values = self.field_values[field]
+            lookup = {value: code for code, value in enumerate(values)}
+            new_codes = []
+            for value in new_df[col]:
+                if pd.isna(value):
+                    new_codes.append(-1)
+                    continue
+                if value not in lookup:
+                    lookup[value] = len(values)
+                    values.append(value)
+                new_codes.append(lookup[value])
+            self.field_codes[field] = np.concatenate([self.field_codes[field], np.array(new_codes, dtype=np.intp)])
+        self.size += len(new_df)
+        self._build_field_index()
+        self._build_id_index()
+
+    def lookup_rows(self, resume_ids):
+        """按简历编号批量查找行号，不存在的编号返回 -1"""
+        positions = self.id_index.get_indexer(resume_ids)
+        found = positions >= 0
+        rows = np.full(len(positions), -1, dtype=np.intp)
+        rows[found] = self._id_rows.take(positions[found])
+        return rows
+
+    def filter_rows(self, filters):
+        """按筛选条件返回升序行号数组；无筛选条件时返回 None 表示全部行"""
+        filters = {field: value for field, value in filters.items() if value}
+        if not filters:
+            return None
+
+        for field, value in filters.items():
+            if value not in self.field_rows[field]:
+                return np.zeros(0, dtype=np.intp)
+
+        if len(filters) == 1:
+            field, value = next(iter(filters.items()))
+            return self.field_rows[field][value]
+
+        key = tuple(sorted(filters.items()))
+        with self._cache_lock:
+            rows = self._cache.get(key)
+            if rows is not None:
+                self._cache.move_to_end(key)
+                return rows
+
+        bitmaps = [self.field_bitmaps[field][value] for field, value in filters.items()]
+        bitmap = bitmaps[0] & bitmaps[1]
+        for other in bitmaps[2:]:
+            bitmap &= other
+        rows = np.flatnonzero(np.unpackbits(bitmap, count=self.size))
+
+        with self._cache_lock:
+            self._cache[key] = rows
+            if len(self._cache) > self.FILTER_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return rows
+
+    def count(self, filters):
+        """满足筛选条件的简历数"""
+        rows = self.filter_rows(filters)
+        return self.size if rows is None else len(rows)
+
+    def page(self, filters, page, page_size):
+        """按页码取一页，返回 (记录列表, 总数)"""
+        rows = self.filter_rows(filters)
+        start_idx = (page - 1) * page_size
+        end_idx = start_idx + page_size
+        if rows is None:
+            total = self.size
+            # range 切片与 iloc 切片语义相同，且不会生成全量行号
+            window = range(self.size)[start_idx:end_idx]
+            page_rows = np.arange(window.start, window.stop)
+        else:
+            total = len(rows)
+            page_rows = rows[start_idx:end_idx]
+        return self.records(page_rows), total
+
+    def page_after(self, filters, cursor, page_size):
+        """键集分页：取行号不小于 cursor 的一页，返回 (记录列表, 总数, 下一页游标)"""
+        rows = self.filter_rows(filters)
+        cursor = max(cursor, 0)
+        if rows is None:
+            total = self.size
+            stop = min(cursor + page_size, self.size)
+            page_rows = np.arange(cursor, max(stop, cursor))
+            has_more = stop < self.size
+        else:
+            total = len(rows)
+            start = np.searchsorted(rows, cursor)
+            page_rows = rows[start:start + page_size]
+            has_more = start + page_size < total
+
+        # 游标为下一页第一条可能的行号，深翻页时只需一次二分查找
+        next_cursor = int(page_rows[-1]) + 1 if has_more and len(page_rows) else None
+        return self.records(page_rows), total, next_cursor
+
+    def records(self, rows):
+        """取出指定行，缺失值填 'NULL'，与 fillna('NULL').to_dict('records') 一致"""
+        values = []
+        for column, nullable in zip(self.columns, self._nullable):
+            taken = column.take(rows)
+            if nullable:
+                taken = np.where(pd.isna(taken), 'NULL', taken.astype(object))
+            values.append(taken.tolist())
+        return [dict(zip(self.column_names, row)) for row in zip(*values)]
+
+    def to_json(self, rows):
+        """把指定行直接编码为JSON对象数组文本，缺失值填 'NULL'"""
+        encoded = [self._encode_column(self.columns[i].take(rows)) for i in self._json_order]
+        template = self._json_template
+        return '[' + ','.join(template % row for row in zip(*encoded)) + ']'
+
+    @staticmethod
+    def _encode_column(values):
+        """把一列取值编码为JSON文本列表"""
+        if values.dtype.kind == 'b':
+            return ['true' if value else 'false' for value in values.tolist()]
+        if values.dtype.kind in 'iu':
+            return list(map(str, values.tolist()))
+
+        encoded = []
+        for value in values.tolist():
+            if isinstance(value, str):
+                encoded.append(encode_basestring_ascii(value))
+            elif value is None or (isinstance(value, float) and value != value):
+                encoded.append('"NULL"')
+            else:
+                encoded.append(json.dumps(value, default=str))
+        return encoded
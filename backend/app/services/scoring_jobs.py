@@ -0,0 +1,333 @@
+"""
+批量打分任务模块 - 在后台工作进程中分块打分，已完成的块写入本地磁盘作为检查点，支持进度查询、部分结果与取消
+"""
+import fcntl
+import json
+import multiprocessing
+import os
+import shutil
+import threading
+import time
+import uuid
+
+from app.services.predictor import ResumePredictor
+from app.utils.resume_stream import CSV, NDJSON, iter_stream_chunks
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class ScoringJobs:
+    """批量打分任务
+
+    目录结构（root/<任务编号>/）：
+        job.json              任务信息与进度，整体写入临时文件后替换
+        input.ndjson / .csv   待打分的简历
+        job.lock              运行任务的工作进程持有的文件锁，进程崩溃后锁自动释放
+        cancel                取消标记
+        chunks/NNNNNN.ndjson  已完成块的结果（检查点），写入临时文件后替换
+
+    每个服务进程的后台线程定期扫描任务目录，为排队中的任务以及状态为运行中、却没有进程持有锁
+    （工作进程崩溃）的任务启动工作进程；工作进程跳过已有结果的块，从中断处继续，异常退出超过
+    MAX_ATTEMPTS 次的任务标记为失败。同一台机器上的所有服务进程共用 root/slots 下的 max_running 个槽位，
+    工作进程以 NICE 降低调度优先级，批量打分不会挤占在线请求的 CPU。
+    """
+
+    JOB_FILE = 'job.json'
+    LOCK_FILE = 'job.lock'
+    CANCEL_FILE = 'cancel'
+    CHUNKS_DIR = 'chunks'
+    SLOTS_DIR = 'slots'
+
+    CHUNK_ROWS = 5000
+    MAX_RUNNING = 1
+    MAX_ATTEMPTS = 3
+    NICE = 10
+    POLL_SECONDS = 1.0
+    # 保留的已结束任务数
+    KEEP_FINISHED = 50
+
+    def __init__(self, root, max_running=None, chunk_rows=None, poll_seconds=None):
+        self.root = root
+        self.max_running = max_running or self.MAX_RUNNING
+        self.chunk_rows = chunk_rows or self.CHUNK_ROWS
+        self.poll_seconds = poll_seconds or self.POLL_SECONDS
+        self._running = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        # 工作进程不继承服务进程的线程与锁
+        self._context = multiprocessing.get_context('spawn')
+
+    def _path(self, job_id, *parts):
+        return os.path.join(self.root, job_id, *parts)
+
+    def _chunk_path(self, job_id, index):
+        return self._path(job_id, self.CHUNKS_DIR, f'{index:06d}.ndjson')
+
+    # ---- 提交与查询 ----
+
+    def submit_stream(self, stream, input_format, predictor):
+        """提交上传的 NDJSON 或 CSV（边读取边写入磁盘），返回任务信息"""
+        if input_format not in (NDJSON, CSV):
+            raise ValueError(f'不支持的输入格式: {input_format}')
+        job_id, job_dir = self._new_job_dir()
+        with open(os.path.join(job_dir, f'input.{input_format}'), 'wb') as f:
+            shutil.copyfileobj(stream, f)
+        return self._create(job_id, job_dir, input_format, 'upload', predictor)
+
+    def submit_frame(self, df, predictor, source='dataset'):
+        """提交简历库中选出的简历（写为与数据集列格式相同的 CSV），返回任务信息"""
+        job_id, job_dir = self._new_job_dir()
+        df.to_csv(os.path.join(job_dir, f'input.{CSV}'), index=False)
+        return self._create(job_id, job_dir, CSV, source, predictor, total_rows=len(df))
+
+    def _new_job_dir(self):
+        job_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        job_dir = self._path(job_id)
+        os.makedirs(os.path.join(job_dir, self.CHUNKS_DIR))
+        return job_id, job_dir
+
+    def _create(self, job_id, job_dir, input_format, source, predictor, total_rows=None):
+        job = {
+            'id': job_id,
+            'status': QUEUED,
+            'source': source,
+            'format': input_format,
+            # 续跑时使用提交时的模型版本，保证同一任务的结果一致
+            'model_path': os.path.abspath(predictor.model_path),
+            'model_version': predictor.version,
+            'chunk_rows': self.chunk_rows,
+            'total_rows': total_rows,
+            'completed_chunks': 0,
+            'completed_rows': 0,
+            'passed': 0,
+            'errors': 0,
+            'attempts': 0,
+            'created_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+            'error': None
+        }
+        # job.json 最后写入，扫描任务时不会看到写了一半的任务
+        self._write(job_id, job)
+        self.prune()
+        self._wake.set()
+        return job
+
+    def get(self, job_id):
+        """任务信息，不存在时返回 None"""
+        if not job_id or os.sep in job_id or job_id.startswith('.'):
+            return None
+        try:
+            with open(self._path(job_id, self.JOB_FILE), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def list(self):
+        """全部任务（从新到旧）"""
+        if not os.path.isdir(self.root):
+            return []
+        jobs = [self.get(name) for name in os.listdir(self.root) if name != self.SLOTS_DIR]
+        return sorted((job for job in jobs if job is not None), key=lambda job: job['created_at'], reverse=True)
+
+    def results(self, job_id, offset=0, limit=1000):
+        """已完成部分中从第 offset 条起的至多 limit 条结果"""
+        job = self.get(job_id)
+        if job is None:
+            return None
+        results = []
+        index = offset // job['chunk_rows']
+        skip = offset - index * job['chunk_rows']
+        while len(results) < limit and index < job['completed_chunks']:
+            with open(self._chunk_path(job_id, index), encoding='utf-8') as f:
+                lines = f.read().splitlines()[skip:skip + limit - len(results)]
+            results.extend(json.loads(line) for line in lines)
+            index, skip = index + 1, 0
+        return results
+
+    def cancel(self, job_id):
+        """取消任务：排队中的任务直接标记为已取消，运行中的任务在完成当前块后停止"""
+        if self.get(job_id) is None:
+            return None
+        open(self._path(job_id, self.CANCEL_FILE), 'w').close()
+        with self._try_lock(job_id) as locked:
+            job = self.get(job_id)
+            if locked and job['status'] not in FINISHED:
+                job.update(status=CANCELLED, finished_at=time.time())
+                self._write(job_id, job)
+        return job
+
+    def prune(self, keep=None):
+        """只保留最近的 keep 个已结束任务"""
+        keep = keep or self.KEEP_FINISHED
+        finished = [job for job in self.list() if job['status'] in FINISHED]
+        for job in finished[keep:]:
+            shutil.rmtree(self._path(job['id']), ignore_errors=True)
+
+    def _write(self, job_id, job):
+        path = self._path(job_id, self.JOB_FILE)
+        tmp_path = f'{path}.tmp-{os.getpid()}'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(job, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _try_lock(self, job_id):
+        return _FileLock(self._path(job_id, self.LOCK_FILE))
+
+    # ---- 调度 ----
+
+    def start(self):
+        """启动后台调度线程（fork 出的子进程中线程不存在，可再次调用以重新启动）"""
+        if self._thread is None or not self._thread.is_alive():
+            self._running = {}
+            self._thread = threading.Thread(target=self._run, name='scoring-jobs', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.dispatch()
+            except Exception as e:
+                print(f"! 调度批量打分任务失败: {e}")
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+
+    def dispatch(self):
+        """回收已退出的工作进程，并在空闲槽位上启动待运行的任务"""
+        for job_id, (process, slot) in list(self._running.items()):
+            if not process.is_alive():
+                process.join()
+                slot.release()
+                del self._running[job_id]
+
+        pending = [job for job in self.list() if job['status'] in (QUEUED, RUNNING)]
+        for job in sorted(pending, key=lambda job: job['created_at']):
+            if job['id'] in self._running:
+                continue
+            with self._try_lock(job['id']) as locked:
+                if not locked:
+                    # 其他服务进程的工作进程正在运行
+                    continue
+            slot = self._acquire_slot()
+            if slot is None:
+                break
+            process = self._context.Process(
+                target=run_job, args=(self.root, job['id'], self.NICE, self.MAX_ATTEMPTS),
+                name=f"scoring-job-{job['id']}", daemon=True
+            )
+            process.start()
+            self._running[job['id']] = (process, slot)
+
+    def _acquire_slot(self):
+        os.makedirs(os.path.join(self.root, self.SLOTS_DIR), exist_ok=True)
+        for i in range(self.max_running):
+            slot = _FileLock(os.path.join(self.root, self.SLOTS_DIR, f'{i}.lock'))
+            if slot.acquire():
+                return slot
+        return None
+
+    # ---- 工作进程 ----
+
+    def execute(self, job_id, max_attempts):
+        """在当前进程中运行任务（由工作进程调用）；其他进程正在运行时直接返回"""
+        with self._try_lock(job_id) as locked:
+            job = self.get(job_id)
+            if not locked or job is None or job['status'] in FINISHED:
+                return
+            if os.path.exists(self._path(job_id, self.CANCEL_FILE)):
+                job.update(status=CANCELLED, finished_at=time.time())
+            elif job['attempts'] >= max_attempts:
+                job.update(status=FAILED, finished_at=time.time(),
+                           error=f'工作进程异常退出 {job["attempts"]} 次')
+            else:
+                job['attempts'] += 1
+                job.update(status=RUNNING, started_at=job['started_at'] or time.time())
+                self._write(job_id, job)
+                try:
+                    self._score(job_id, job)
+                except Exception as e:
+                    job.update(status=FAILED, finished_at=time.time(), error=str(e))
+            self._write(job_id, job)
+
+    def _score(self, job_id, job):
+        """逐块打分，跳过已有检查点的块"""
+        predictor = ResumePredictor(job['model_path'])
+        self._restore_progress(job_id, job)
+
+        with open(self._path(job_id, f"input.{job['format']}"), 'rb') as f:
+            for index, chunk in enumerate(iter_stream_chunks(f, job['format'], job['chunk_rows'])):
+                if index < job['completed_chunks']:
+                    continue
+                if os.path.exists(self._path(job_id, self.CANCEL_FILE)):
+                    job.update(status=CANCELLED, finished_at=time.time())
+                    return
+                results = predictor.predict_batch(chunk)
+                path = self._chunk_path(job_id, index)
+                with open(f'{path}.tmp', 'w', encoding='utf-8') as out:
+                    out.writelines(json.dumps(result, ensure_ascii=False) + '\n' for result in results)
+                os.replace(f'{path}.tmp', path)
+                self._add_progress(job, results)
+                self._write(job_id, job)
+
+        job.update(status=DONE, total_rows=job['completed_rows'], finished_at=time.time())
+
+    def _restore_progress(self, job_id, job):
+        """由已有的块结果重新统计进度（job.json 可能落后于最后写入的块）"""
+        job.update(completed_chunks=0, completed_rows=0, passed=0, errors=0)
+        while os.path.exists(self._chunk_path(job_id, job['completed_chunks'])):
+            with open(self._chunk_path(job_id, job['completed_chunks']), encoding='utf-8') as f:
+                self._add_progress(job, [json.loads(line) for line in f])
+
+    @staticmethod
+    def _add_progress(job, results):
+        job['completed_chunks'] += 1
+        job['completed_rows'] += len(results)
+        job['passed'] += sum(result.get('prediction') == '通过' for result in results)
+        job['errors'] += sum('error' in result for result in results)
+
+
+def run_job(root, job_id, nice, max_attempts):
+    """工作进程入口"""
+    if nice:
+        os.nice(nice)
+    ScoringJobs(root).execute(job_id, max_attempts)
+
+
+class _FileLock:
+    """非阻塞的独占文件锁（flock），进程退出时自动释放"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def acquire(self):
+        self._file = open(self.path, 'a')
+        try:
+            fcntl.flock(self._file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._file.close()
+            self._file = None
+            return False
+        return True
+
+    def release(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc_info):
+        self.release()
@@ -0,0 +1,368 @@
+"""
+统计聚合模块
+"""
+import copy
+import heapq
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+from app.utils.data_processor import ResumeDataProcessor
+
+
+def _extend(buffer, used, values):
+    """向预留容量的数组追加数据，容量不足时按倍数扩容，返回 (数组, 已用长度)"""
+    needed = used + len(values)
+    if needed > len(buffer):
+        grown = np.empty(max(needed, 2 * len(buffer)), dtype=buffer.dtype)
+        grown[:used] = buffer[:used]
+        buffer = grown
+    buffer[used:needed] = values
+    return buffer, needed
+
+
+class ValueCounter:
+    """单列取值计数
+
+    保存每次出现的（取值编号, 行号），计数按取值编号累加，并记录取值的首次出现顺序，
+    使输出与 value_counts / Counter.most_common 在并列计数时的顺序一致。
+    追加行只处理新增部分；删除行时过滤出现记录并整体平移行号。
+    """
+
+    def __init__(self, multi=False):
+        """multi=True 时按逗号拆分取值（技能列）"""
+        self.multi = multi
+        self.keys = []
+        self.lookup = {}
+        self.counts = np.zeros(0, dtype=np.int64)
+        # 每次出现的取值编号与行号，按行顺序存放在预留容量的数组中
+        self._codes = np.zeros(0, dtype=np.int64)
+        self._rows = np.zeros(0, dtype=np.int64)
+        self.length = 0
+        # 计数大于0的取值编号，按首次出现顺序排列
+        self.order = np.zeros(0, dtype=np.int64)
+
+    def _occurrences(self, series):
+        """拆出新数据中每次出现的局部取值编号、行号及局部取值表"""
+        if not self.multi:
+            codes, uniques = pd.factorize(series)
+            rows = np.flatnonzero(codes >= 0)
+            return codes[rows], rows, list(uniques)
+
+        # 技能列：与原实现一致，跳过缺失和 'NULL'，按逗号拆分并去除首尾空白
+        values = series.to_numpy()
+        valid = np.flatnonzero(series.notna().to_numpy() & (values != 'NULL'))
+        value_codes, uniques = pd.factorize(values[valid])
+
+        tokens = []
+        token_lookup = {}
+        unique_tokens = []
+        for value in uniques:
+            codes = []
+            for token in str(value).split(','):
+                token = token.strip()
+                if token not in token_lookup:
+                    token_lookup[token] = len(tokens)
+                    tokens.append(token)
+                codes.append(token_lookup[token])
+            unique_tokens.append(codes)
+
+        lengths = np.array([len(codes) for codes in unique_tokens], dtype=np.int64)
+        flat = np.array([code for codes in unique_tokens for code in codes], dtype=np.int64)
+        starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]) if len(lengths) else lengths
+
+        # 每行展开为其取值对应的技能编号序列，保持行内顺序
+        row_lengths = lengths[value_codes]
+        total = int(row_lengths.sum())
+        row_starts = np.repeat(starts[value_codes], row_lengths)
+        within = np.arange(total) - np.repeat(np.cumsum(row_lengths) - row_lengths, row_lengths)
+        return flat[row_starts + within], np.repeat(valid, row_lengths), tokens
+
+    def copy(self):
+        """副本：取值表单独复制，逐行数组与原计数器共享（追加只写入原计数器已用长度之后）"""
+        counter = copy.copy(self)
+        counter.keys = list(self.keys)
+        counter.lookup = dict(self.lookup)
+        return counter
+
+    def add(self, series, offset):
+        """追加新行，offset 为新行在全部数据中的起始行号"""
+        local_codes, rows, local_keys = self._occurrences(series)
+        mapping = np.empty(len(local_keys), dtype=np.int64)
+        for i, key in enumerate(local_keys):
+            if key not in self.lookup:
+                self.lookup[key] = len(self.keys)
+                self.keys.append(key)
+            mapping[i] = self.lookup[key]
+        codes = mapping[local_codes]
+
+        previous = np.zeros(len(self.keys), dtype=np.int64)
+        previous[:len(self.counts)] = self.counts
+        self.counts = previous + np.bincount(codes, minlength=len(self.keys))
+
+        # 此前未出现（计数为0）的取值按本次首次出现顺序排在末尾
+        appeared = pd.unique(codes)
+        self.order = np.concatenate([self.order, appeared[previous[appeared] == 0]])
+
+        self._codes, _ = _extend(self._codes, self.length, codes)
+        self._rows, self.length = _extend(self._rows, self.length, rows + offset)
+
+    @property
+    def codes(self):
+        return self._codes[:self.length]
+
+    @property
+    def rows(self):
+        return self._rows[:self.length]
+
+    def remove(self, removed_rows):
+        """删除行（升序去重的行号），其余行号随之前移"""
+        if not len(removed_rows):
+            return
+        rows = self.rows
+        position = np.searchsorted(removed_rows, rows)
+        dropped = (position < len(removed_rows)) & (removed_rows[np.minimum(position, len(removed_rows) - 1)] == rows)
+
+        self.counts = self.counts - np.bincount(self.codes[dropped], minlength=len(self.keys))
+        self._codes = self.codes[~dropped]
+        self._rows = rows[~dropped] - position[~dropped]
+        self.length = len(self._codes)
+        self.order = pd.unique(self.codes)
+
+    def count(self, key):
+        """单个取值的计数"""
+        code = self.lookup.get(key)
+        return int(self.counts[code]) if code is not None else 0
+
+    def items(self):
+        """按首次出现顺序的 (取值, 计数)"""
+        return [(self.keys[code], int(self.counts[code])) for code in self.order]
+
+    def value_counts(self):
+        """与 Series.value_counts().to_dict() 一致"""
+        order = self.order
+        counts = pd.Series(self.counts[order], index=[self.keys[code] for code in order])
+        return counts.sort_values(ascending=False).to_dict()
+
+    def most_common(self, n):
+        """与 Counter.most_common(n) 一致"""
+        return heapq.nlargest(n, self.items(), key=itemgetter(1))
+
+
+class ResumeStatistics:
+    """看板统计引擎
+
+    加载数据时一次性计算技能、岗位、学历、院校、筛选结果的计数，
+    之后随新增或删除的简历增量更新；接口结果在数据变化后首次读取时生成并缓存，
+    与原先逐次从 DataFrame 重新计算的结果完全一致。
+    """
+
+    SKILL_COLUMNS = ['编程语言', '前端技术', '后端技术', '数据库', '云计算/运维', '数据与算法', '移动开发', '测试工具']
+    PASS_VALUE = '通过'
+
+    # 交叉统计维度 -> 简历列；experience 为三类企业工作年限之和的分档
+    CUBE_DIMENSIONS = {
+        'position': '意向岗位',
+        'education': '学历层次',
+        'school': '院校类别',
+        'major': '专业类别',
+        'english': '英语水平',
+        'experience': None
+    }
+    EXPERIENCE_COLUMNS = ['小型企业工作经验', '中型企业工作经验', '大型企业工作经验']
+    # 总工作年限分档：(上限, 名称)，年限不超过上限即归入该档
+    EXPERIENCE_BUCKETS = [(0, '无'), (1, '1年以下'), (3, '1-3年'), (5, '3-5年'), (np.inf, '5年以上')]
+
+    # 维度组合数超过该值时改用排序分组，避免按组合数分配计数数组
+    CUBE_DENSE_CELLS = 1 << 20
+
+    def __init__(self, resume_df):
+        """计算初始统计"""
+        self.size = 0
+        self.skills = {col: ValueCounter(multi=True) for col in self.SKILL_COLUMNS}
+        self.positions = ValueCounter()
+        self.position_passes = ValueCounter()
+        self.results = ValueCounter()
+        self.education = ValueCounter()
+        self.schools = ValueCounter()
+        # 交叉统计各维度的逐行编码（缺失记为 'NULL'），及逐行是否通过
+        self.dimensions = {dim: ValueCounter() for dim in self.CUBE_DIMENSIONS}
+        self._passed = np.zeros(0, dtype=bool)
+        self._ages = np.zeros(0, dtype=resume_df['年龄'].dtype)
+        self._processor = ResumeDataProcessor()
+        self._cache = {}
+        self.add(resume_df)
+
+    def _counters(self, resume_df):
+        """各计数器及其对应的数据列"""
+        pairs = [(self.skills[col], resume_df[col]) for col in self.SKILL_COLUMNS]
+        pairs += [
+            (self.positions, resume_df['意向岗位']),
+            # 只统计通过的简历的岗位，用于计算各岗位通过率
+            (self.position_passes, resume_df['意向岗位'].where(resume_df['筛选结果'] == self.PASS_VALUE)),
+            (self.results, resume_df['筛选结果']),
+            (self.education, resume_df['学历层次']),
+            (self.schools, resume_df['院校类别'])
+        ]
+        pairs += [(self.dimensions[dim], self._dimension_labels(resume_df, dim)) for dim in self.CUBE_DIMENSIONS]
+        return pairs
+
+    def _dimension_labels(self, resume_df, dim):
+        """交叉统计维度的逐行取值"""
+        col = self.CUBE_DIMENSIONS[dim]
+        if col is not None:
+            return resume_df[col].fillna('NULL')
+
+        years = sum(
+            self._processor._map_unique(resume_df[col], self._processor.extract_years)
+            for col in self.EXPERIENCE_COLUMNS
+        )
+        limits = np.array([limit for limit, _ in self.EXPERIENCE_BUCKETS])
+        labels = np.array([label for _, label in self.EXPERIENCE_BUCKETS], dtype=object)
+        return pd.Series(labels[np.searchsorted(limits, np.asarray(years, dtype=float))], index=resume_df.index)
+
+    def _all_counters(self):
+        return list(self.skills.values()) + [
+            self.positions, self.position_passes, self.results, self.education, self.schools
+        ] + list(self.dimensions.values())
+
+    def copy(self):
+        """副本：服务运行中在副本上增删简历后整体替换，处理中的请求继续读取原统计
+
+        逐行数组与原对象共享，追加只写入原对象已用长度之后；此后只应在最新的副本上继续增删。
+        """
+        statistics = copy.copy(self)
+        statistics.skills = {col: counter.copy() for col, counter in self.skills.items()}
+        statistics.positions = self.positions.copy()
+        statistics.position_passes = self.position_passes.copy()
+        statistics.results = self.results.copy()
+        statistics.education = self.education.copy()
+        statistics.schools = self.schools.copy()
+        statistics.dimensions = {dim: counter.copy() for dim, counter in self.dimensions.items()}
+        statistics._cache = {}
+        return statistics
+
+    def add(self, new_df):
+        """追加简历"""
+        for counter, series in self._counters(new_df):
+            counter.add(series, self.size)
+        self._passed, _ = _extend(self._passed, self.size, (new_df['筛选结果'] == self.PASS_VALUE).to_numpy())
+        self._ages, self.size = _extend(self._ages, self.size, new_df['年龄'].to_numpy())
+        self._cache = {}
+
+    def remove(self, rows):
+        """按行号删除简历"""
+        removed_rows = np.unique(np.asarray(rows, dtype=np.int64))
+        for counter in self._all_counters():
+            counter.remove(removed_rows)
+        self._passed = np.delete(self.passed, removed_rows)
+        self._ages = np.delete(self.ages, removed_rows)
+        self.size = len(self._ages)
+        self._cache = {}
+
+    @property
+    def ages(self):
+        return self._ages[:self.size]
+
+    @property
+    def passed(self):
+        return self._passed[:self.size]
+
+    def _cached(self, name, build):
+        """数据变化后首次读取时生成结果"""
+        if name not in self._cache:
+            self._cache[name] = build()
+        return self._cache[name]
+
+    def skill_stats(self):
+        """各技能类别出现次数前10的技能"""
+        return self._cached('skills', lambda: {
+            col: [{'skill': k, 'count': v} for k, v in self.skills[col].most_common(10)]
+            for col in self.SKILL_COLUMNS
+        })
+
+    def position_stats(self):
+        """各岗位简历数与通过率"""
+        def build():
+            return [
+                {
+                    'position': pos,
+                    'count': count,
+                    'pass_rate': self.position_passes.count(pos) / count
+                }
+                for pos, count in self.positions.value_counts().items()
+            ]
+        return self._cached('positions', build)
+
+    def overview(self):
+        """概览统计"""
+        def build():
+            ages = pd.Series(self.ages)
+            pass_count = self.results.count(self.PASS_VALUE)
+            return {
+                'total_resumes': self.size,
+                'pass_count': pass_count,
+                'pass_rate': pass_count / self.size,
+                'education_stats': self.education.value_counts(),
+                'school_stats': self.schools.value_counts(),
+                'age_stats': {
+                    '平均年龄': float(ages.mean()),
+                    '年龄分布': ages.describe().to_dict()
+                }
+            }
+        return self._cached('overview', build)
+
+    def cube(self, dims):
+        """按任意维度组合统计简历数与通过数，结果按维度取值升序排列（与 groupby 默认顺序一致）"""
+        dims = tuple(dims)
+        unknown = [dim for dim in dims if dim not in self.CUBE_DIMENSIONS]
+        if unknown:
+            raise ValueError(f"未知维度: {', '.join(unknown)}，可选: {', '.join(self.CUBE_DIMENSIONS)}")
+        if not dims or len(set(dims)) != len(dims):
+            raise ValueError('dims 不能为空且不能重复')
+        return self._cached(('cube', dims), lambda: self._build_cube(dims))
+
+    def _build_cube(self, dims):
+        """一次分组计算所有单元格"""
+        counters = [self.dimensions[dim] for dim in dims]
+        shape = tuple(len(counter.keys) for counter in counters)
+        passed = self.passed
+
+        if int(np.prod(shape, dtype=np.float64)) <= self.CUBE_DENSE_CELLS:
+            combined = np.ravel_multi_index([counter.codes for counter in counters], shape) if self.size else np.zeros(0, np.intp)
+            cells = int(np.prod(shape))
+            counts = np.bincount(combined, minlength=cells)
+            pass_counts = np.bincount(combined, weights=passed, minlength=cells).astype(np.int64)
+            occupied = np.flatnonzero(counts)
+            cell_codes = np.unravel_index(occupied, shape)
+            counts, pass_counts = counts[occupied], pass_counts[occupied]
+        else:
+            stacked = np.stack([counter.codes for counter in counters], axis=1)
+            unique_codes, inverse = np.unique(stacked, axis=0, return_inverse=True)
+            inverse = inverse.ravel()
+            counts = np.bincount(inverse, minlength=len(unique_codes))
+            pass_counts = np.bincount(inverse, weights=passed, minlength=len(unique_codes)).astype(np.int64)
+            cell_codes = unique_codes.T
+
+        # 按各维度取值的字典序排列单元格
+        labels = []
+        ranks = []
+        for counter, codes in zip(counters, cell_codes):
+            keys = np.array(counter.keys, dtype=object)
+            rank = np.empty(len(keys), dtype=np.int64)
+            rank[np.argsort(keys, kind='stable')] = np.arange(len(keys))
+            labels.append(keys[codes].tolist())
+            ranks.append(rank[codes])
+        order = np.lexsort(ranks[::-1])
+
+        counts = counts.tolist()
+        pass_counts = pass_counts.tolist()
+        cells = []
+        for i in order.tolist():
+            cell = {dim: values[i] for dim, values in zip(dims, labels)}
+            cell['count'] = counts[i]
+            cell['pass_count'] = pass_counts[i]
+            cell['pass_rate'] = pass_counts[i] / counts[i]
+            cells.append(cell)
+        return {'dims': list(dims), 'total': self.size, 'cells': cells}
@@ -0,0 +1,323 @@
+"""
+分块训练模块 - 数据量超过内存时，分块特征化写入磁盘分片，再以外部存储方式训练梯度提升模型
+"""
+import json
+import os
+import time
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.ensemble import VotingClassifier
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+from sklearn.preprocessing import LabelEncoder
+from sklearn.utils import Bunch
+from xgboost import XGBClassifier
+
+from app.services.hyperparameter_search import available_cpus
+from app.utils.oversampling import make_oversampler
+from app.utils.resume_store import iter_resume_chunks
+
+
+class FeatureShards:
+    """磁盘上的特征分片
+
+    目录结构：
+        meta.json                 特征名、各分片行数与标签计数、数据来源
+        train-NNNNN.X.npy / .y.npy  训练集分片（float64 特征矩阵 / int8 标签）
+        test-NNNNN.X.npy / .y.npy   测试集分片
+        xgb-cache*                XGBoost 外部存储的页缓存
+
+    分片以内存映射方式读取，训练时每次只有一个分片常驻内存。
+    """
+
+    FORMAT_VERSION = 1
+    PARTS = ('train', 'test')
+
+    def __init__(self, shard_dir):
+        self.shard_dir = shard_dir
+        with open(os.path.join(shard_dir, 'meta.json'), encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.feature_names = self.meta['feature_names']
+
+    @classmethod
+    def exists(cls, shard_dir, source):
+        """分片是否已由同一数据来源和设置生成"""
+        meta_path = os.path.join(shard_dir, 'meta.json')
+        if not os.path.exists(meta_path):
+            return False
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        return meta.get('version') == cls.FORMAT_VERSION and meta.get('source') == source
+
+    @classmethod
+    def build(cls, chunks, data_processor, feature_names, shard_dir, source,
+              test_size=0.2, balance='weight', random_state=42):
+        """特征化各数据块并写入分片
+
+        测试集按行以 test_size 的概率随机划分（每块使用独立且固定的随机种子）；
+        balance 为 'smote' / 'approx_smote' 时在每块的训练行内过采样，代替整体 SMOTE。
+        """
+        os.makedirs(shard_dir, exist_ok=True)
+        shards = {part: [] for part in cls.PARTS}
+        for i, chunk in enumerate(chunks):
+            features, y = data_processor.process_training_data(chunk)
+            # 各块出现的岗位不同，统一到完整的特征列
+            X = features.reindex(columns=feature_names, fill_value=0).to_numpy(dtype=np.float64)
+            y = y.to_numpy(dtype=np.int8)
+
+            rng = np.random.default_rng([random_state, i])
+            is_test = rng.random(len(y)) < test_size
+            parts = {'train': (X[~is_test], y[~is_test]), 'test': (X[is_test], y[is_test])}
+            if balance in ('smote', 'approx_smote'):
+                parts['train'] = cls._resample(*parts['train'], balance, random_state + i)
+
+            for part, (part_X, part_y) in parts.items():
+                if not len(part_y):
+                    continue
+                name = f'{part}-{len(shards[part]):05d}'
+                np.save(os.path.join(shard_dir, name + '.X.npy'), part_X)
+                np.save(os.path.join(shard_dir, name + '.y.npy'), part_y)
+                shards[part].append({
+                    'name': name, 'rows': len(part_y), 'positives': int(part_y.sum())
+                })
+
+        meta = {
+            'version': cls.FORMAT_VERSION,
+            'source': source,
+            'feature_names': list(feature_names),
+            'shards': shards
+        }
+        # meta.json 最后写入，存在即表示分片完整
+        tmp_path = os.path.join(shard_dir, 'meta.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, os.path.join(shard_dir, 'meta.json'))
+        return cls(shard_dir)
+
+    @staticmethod
+    def _resample(X, y, balance, random_state):
+        """块内过采样，少数类样本不足以取近邻时保持原样"""
+        minority = min(int(y.sum()), int(len(y) - y.sum()))
+        if minority < 2:
+            return X, y
+        oversampler = make_oversampler(balance, random_state)
+        if balance == 'smote':
+            oversampler.set_params(k_neighbors=min(5, minority - 1))
+        return oversampler.fit_resample(X, y)
+
+    def shards(self, part):
+        return self.meta['shards'][part]
+
+    def rows(self, part):
+        return sum(shard['rows'] for shard in self.shards(part))
+
+    def positives(self, part):
+        return sum(shard['positives'] for shard in self.shards(part))
+
+    def path(self, shard, array):
+        return os.path.join(self.shard_dir, f"{shard['name']}.{array}.npy")
+
+    def load(self, shard):
+        """以内存映射方式读取一个分片的 (X, y)"""
+        return np.load(self.path(shard, 'X'), mmap_mode='r'), np.load(self.path(shard, 'y'))
+
+    def labels(self, part):
+        return np.concatenate([self.load(shard)[1] for shard in self.shards(part)])
+
+
+class _ShardIterator(xgb.DataIter):
+    """按分片向 XGBoost 提供数据，构造外部存储 DMatrix"""
+
+    def __init__(self, shards, part):
+        self._shards = shards
+        self._part = part
+        self._index = 0
+        super().__init__(cache_prefix=os.path.join(shards.shard_dir, 'xgb-cache'))
+
+    def next(self, input_data):
+        if self._index == len(self._shards.shards(self._part)):
+            return 0
+        X, y = self._shards.load(self._shards.shards(self._part)[self._index])
+        input_data(data=X, label=y, feature_names=self._shards.feature_names)
+        self._index += 1
+        return 1
+
+    def reset(self):
+        self._index = 0
+
+
+class _ShardSequence(lgb.Sequence):
+    """LightGBM 按批读取的分片
+
+    每批读取时才映射文件、读完即释放，已读过的分片不会继续占用常驻内存。
+    """
+
+    def __init__(self, path, batch_size):
+        self.path = path
+        self.batch_size = batch_size
+        self.rows = len(np.load(path, mmap_mode='r'))
+
+    def __getitem__(self, idx):
+        return np.array(np.load(self.path, mmap_mode='r')[idx], dtype=np.float64)
+
+    def __len__(self):
+        return self.rows
+
+
+class LightGBMBoosterClassifier:
+    """包装原生 LightGBM Booster，提供与 LGBMClassifier 相同的预测接口"""
+
+    def __init__(self, booster):
+        self.booster_ = booster
+        self.classes_ = np.array([0, 1])
+        self.n_features_in_ = booster.num_feature()
+        self.feature_importances_ = booster.feature_importance()
+
+    def predict_proba(self, X):
+        proba = self.booster_.predict(np.asarray(X, dtype=np.float64))
+        return np.column_stack([1 - proba, proba])
+
+    def predict(self, X):
+        return (self.predict_proba(X)[:, 1] > 0.5).astype(int)
+
+
+class StreamingModelTrainer:
+    """分块训练器
+
+    分块读取简历数据并特征化写入分片，峰值内存由 memory_mb 决定的块大小控制，
+    不生成整体 SMOTE 副本；随后 XGBoost 以外部存储 DMatrix、LightGBM 以 Sequence 分批构造数据集训练，
+    两者软投票集成（与 create_ensemble_model 中对应成员参数相同，随机森林无法分块训练故不包含）。
+    """
+
+    # 每行原始数据与特征化中间结果的内存估计（字节），用于由内存预算换算块大小
+    CHUNK_ROW_BYTES = 8192
+    MIN_CHUNK_ROWS = 1000
+    POSITION_COLUMN = '意向岗位'
+    ROUNDS = 200
+    BALANCE_METHODS = ('weight', 'smote', 'approx_smote')
+    XGB_PARAMS = {'objective': 'binary:logistic', 'tree_method': 'hist', 'max_depth': 5,
+                  'eta': 0.1, 'eval_metric': 'logloss', 'seed': 42}
+    LGBM_PARAMS = {'objective': 'binary', 'max_depth': 5, 'learning_rate': 0.1,
+                   'seed': 42, 'verbose': -1}
+
+    def __init__(self, data_processor, shard_dir, memory_mb=512, balance='weight', test_size=0.2):
+        if balance not in self.BALANCE_METHODS:
+            raise ValueError(f'未知的不平衡处理方式: {balance}')
+        self.data_processor = data_processor
+        self.shard_dir = shard_dir
+        self.memory_mb = memory_mb
+        self.balance = balance
+        self.test_size = test_size
+        self.chunk_rows = max(self.MIN_CHUNK_ROWS, memory_mb * 1024 * 1024 // self.CHUNK_ROW_BYTES)
+        self.shards = None
+        self.feature_names = None
+
+    def prepare_shards(self, csv_path):
+        """分块特征化并写入分片；数据来源与设置未变时复用已有分片"""
+        stat = os.stat(csv_path)
+        source = {
+            'path': os.path.abspath(csv_path), 'size': stat.st_size, 'mtime': stat.st_mtime,
+            'chunk_rows': self.chunk_rows, 'balance': self.balance, 'test_size': self.test_size
+        }
+        if FeatureShards.exists(self.shard_dir, source):
+            self.shards = FeatureShards(self.shard_dir)
+            print(f"✓ 使用已有特征分片: {self.shard_dir}")
+        else:
+            print(f"分块特征化（每块 {self.chunk_rows} 行）...")
+            start = time.time()
+            # 先扫描岗位列，确定完整的岗位 one-hot 特征列
+            positions = set()
+            for chunk in iter_resume_chunks(csv_path, self.chunk_rows, columns=[self.POSITION_COLUMN]):
+                positions.update(chunk[self.POSITION_COLUMN].dropna().unique())
+            sample = next(iter_resume_chunks(csv_path, self.MIN_CHUNK_ROWS))
+            features, _ = self.data_processor.process_training_data(sample.head(1))
+            base_columns = [c for c in features.columns if not c.startswith('岗位_')]
+            feature_names = base_columns + [f'岗位_{p}' for p in sorted(positions)]
+
+            self.shards = FeatureShards.build(
+                iter_resume_chunks(csv_path, self.chunk_rows), self.data_processor, feature_names,
+                self.shard_dir, source, test_size=self.test_size, balance=self.balance
+            )
+            print(f"✓ 特征分片已写入: {self.shard_dir}，用时 {time.time() - start:.1f}s")
+
+        self.feature_names = self.shards.feature_names
+        train_rows, test_rows = self.shards.rows('train'), self.shards.rows('test')
+        print(f"训练集: {train_rows} 条（{len(self.shards.shards('train'))} 个分片）, 测试集: {test_rows} 条")
+        print(f"训练集通过率: {self.shards.positives('train') / train_rows:.2%}")
+        return self.shards
+
+    def _class_weight(self):
+        """balance='weight' 时正样本的权重（负样本数 / 正样本数）"""
+        if self.balance != 'weight':
+            return 1.0
+        positives = self.shards.positives('train')
+        return (self.shards.rows('train') - positives) / max(positives, 1)
+
+    def train(self):
+        """训练 XGBoost 与 LightGBM 并组装为软投票集成模型"""
+        threads = available_cpus()
+        weight = self._class_weight()
+        print(f"\n正样本权重: {weight:.3f}")
+
+        print("外部存储训练 XGBoost...")
+        start = time.time()
+        dtrain = xgb.DMatrix(_ShardIterator(self.shards, 'train'))
+        booster = xgb.train(dict(self.XGB_PARAMS, nthread=threads, scale_pos_weight=weight), dtrain, self.ROUNDS)
+        del dtrain
+        xgb_model = XGBClassifier()
+        xgb_model.load_model(bytearray(booster.save_raw(raw_format='json')))
+        print(f"  用时 {time.time() - start:.1f}s")
+
+        print("分批构造数据集训练 LightGBM...")
+        start = time.time()
+        sequences = [_ShardSequence(self.shards.path(shard, 'X'), self.chunk_rows)
+                     for shard in self.shards.shards('train')]
+        # 分箱采样的行数同样受内存预算限制（每个采样值约占 16 字节）
+        sample_rows = max(self.MIN_CHUNK_ROWS, self.memory_mb * 1024 * 1024 // (16 * len(self.feature_names)))
+        dataset = lgb.Dataset(sequences, label=self.shards.labels('train'), feature_name=self.feature_names,
+                              params={'verbose': -1, 'bin_construct_sample_cnt': min(200000, sample_rows)},
+                              free_raw_data=True)
+        lgbm_booster = lgb.train(dict(self.LGBM_PARAMS, num_threads=threads, scale_pos_weight=weight),
+                                 dataset, self.ROUNDS)
+        del dataset
+        lgbm_model = LightGBMBoosterClassifier(lgbm_booster)
+        print(f"  用时 {time.time() - start:.1f}s")
+
+        return self._assemble({'xgb': xgb_model, 'lgbm': lgbm_model})
+
+    @staticmethod
+    def _assemble(members):
+        """由已训练的成员组装软投票集成模型（与 VotingClassifier.fit 设置的属性相同）"""
+        ensemble = VotingClassifier(estimators=list(members.items()), voting='soft')
+        ensemble.le_ = LabelEncoder().fit([0, 1])
+        ensemble.classes_ = ensemble.le_.classes_
+        ensemble.estimators_ = list(members.values())
+        ensemble.named_estimators_ = Bunch(**members)
+        return ensemble
+
+    def evaluate(self, model):
+        """逐个测试分片预测并计算指标"""
+        y_true, y_proba = [], []
+        for shard in self.shards.shards('test'):
+            X, y = self.shards.load(shard)
+            y_proba.append(model.predict_proba(pd.DataFrame(X, columns=self.feature_names))[:, 1])
+            y_true.append(y)
+        y_true, y_proba = np.concatenate(y_true), np.concatenate(y_proba)
+        y_pred = (y_proba > 0.5).astype(int)
+
+        metrics = {
+            'accuracy': accuracy_score(y_true, y_pred),
+            'precision': precision_score(y_true, y_pred),
+            'recall': recall_score(y_true, y_pred),
+            'f1': f1_score(y_true, y_pred),
+            'roc_auc': roc_auc_score(y_true, y_proba)
+        }
+        print("\n分块训练集成模型测试集表现:")
+        print(f"  准确率: {metrics['accuracy']:.4f}")
+        print(f"  精确率: {metrics['precision']:.4f}")
+        print(f"  召回率: {metrics['recall']:.4f}")
+        print(f"  F1分数: {metrics['f1']:.4f}")
+        print(f"  ROC-AUC: {metrics['roc_auc']:.4f}")
+        return metrics
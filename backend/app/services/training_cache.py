@@ -0,0 +1,243 @@
+"""
+训练缓存模块 - 特征化后的训练/测试集、交叉验证折与已训练模型的磁盘缓存
+"""
+import hashlib
+import json
+import os
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, ClassifierMixin, clone
+from sklearn.ensemble import VotingClassifier
+from sklearn.model_selection import StratifiedKFold
+
+from app.utils import data_processor, oversampling
+
+
+# 只影响训练速度、不影响模型结果的参数，不参与估计器的哈希
+RUNTIME_PARAMS = ('n_jobs', 'verbose', 'verbosity')
+# 决定训练/测试集内容的代码（特征工程、编码表、不平衡处理），源码改动后数据缓存失效
+FEATURE_MODULES = (data_processor, oversampling)
+
+
+def source_version(modules):
+    """模块源码的哈希"""
+    digest = hashlib.sha1()
+    for module in modules:
+        with open(module.__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def fingerprint(*parts):
+    """按内容计算哈希，DataFrame/数组按数据计算（不含行索引），估计器按类名和参数计算"""
+    digest = hashlib.sha1()
+    for part in parts:
+        _update_digest(digest, part)
+    return digest.hexdigest()
+
+
+def _update_digest(digest, value):
+    if isinstance(value, pd.DataFrame):
+        digest.update(b'frame')
+        digest.update(json.dumps([list(map(str, value.columns)), list(map(str, value.dtypes))]).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        digest.update(f'series:{value.dtype}'.encode())
+        digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(f'array:{value.dtype}:{value.shape}'.encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif hasattr(value, 'get_params'):
+        # 估计器所属库的版本不同时训练结果可能不同，一并计入
+        module = type(value).__module__
+        version = getattr(sys.modules.get(module.split('.')[0]), '__version__', '')
+        digest.update(f'estimator:{module}.{type(value).__qualname__}:{version}'.encode())
+        params = value.get_params(deep=False)
+        _update_digest(digest, {k: v for k, v in params.items() if k not in RUNTIME_PARAMS})
+    elif isinstance(value, dict):
+        digest.update(b'dict')
+        for key in sorted(value, key=str):
+            _update_digest(digest, str(key))
+            _update_digest(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(f'seq:{len(value)}'.encode())
+        for item in value:
+            _update_digest(digest, item)
+    else:
+        digest.update(f'{type(value).__name__}:{value!r}'.encode())
+
+
+class TrainingCache:
+    """训练缓存
+
+    目录结构：
+        data/<key>/   特征化并划分（及SMOTE）后的训练/测试集，按 dtype 分组保存为 .npy，读取时内存映射
+        folds/<key>/  交叉验证折的样本下标
+        models/<key>.joblib  已训练的估计器，按类名、库版本、参数与训练数据（特征化后的内容）计算 key
+
+    输入数据、特征工程代码或参数不变时直接复用，重新训练只需读取缓存。
+    """
+
+    CACHE_VERSION = 2
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self.feature_version = source_version(FEATURE_MODULES)
+
+    def _path(self, *parts):
+        return os.path.join(self.cache_dir, *parts)
+
+    # ---- 训练/测试集 ----
+
+    def split_key(self, df, **params):
+        return fingerprint(self.CACHE_VERSION, self.feature_version, df, df.index.to_numpy(), params)
+
+    def load_split(self, key):
+        """读取缓存的数据集，返回 (dict 名称->DataFrame/Series, meta)，不存在时返回 None"""
+        directory = self._path('data', key)
+        meta_path = os.path.join(directory, 'meta.json')
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        split = {name: self._load_frame(directory, name, info) for name, info in meta['frames'].items()}
+        return split, meta.get('extra', {})
+
+    def save_split(self, key, split, extra=None):
+        """保存数据集，meta.json 最后写入，中断时不会留下不完整的缓存"""
+        directory = self._path('data', key)
+        os.makedirs(directory, exist_ok=True)
+        frames = {name: self._save_frame(directory, name, value) for name, value in split.items()}
+        self._write_json(os.path.join(directory, 'meta.json'), {'frames': frames, 'extra': extra or {}})
+
+    @staticmethod
+    def _save_frame(directory, name, value):
+        np.save(os.path.join(directory, f'{name}.index.npy'), value.index.to_numpy())
+        if isinstance(value, pd.Series):
+            np.save(os.path.join(directory, f'{name}.npy'), value.to_numpy())
+            return {'kind': 'series', 'name': value.name}
+
+        # 同一 dtype 的列保存为一个按列存储的二维数组
+        groups = {}
+        for dtype, columns in value.columns.groupby(value.dtypes.astype(str)).items():
+            columns = list(columns)
+            np.save(os.path.join(directory, f'{name}.{dtype}.npy'), np.asfortranarray(value[columns].to_numpy()))
+            groups[dtype] = columns
+        return {'kind': 'frame', 'columns': list(value.columns), 'groups': groups}
+
+    @staticmethod
+    def _load_frame(directory, name, info):
+        index = pd.Index(np.load(os.path.join(directory, f'{name}.index.npy')))
+        if info['kind'] == 'series':
+            values = np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r')
+            return pd.Series(values, index=index, name=info['name'])
+
+        parts = [
+            pd.DataFrame(np.load(os.path.join(directory, f'{name}.{dtype}.npy'), mmap_mode='r'),
+                         columns=columns, index=index)
+            for dtype, columns in info['groups'].items()
+        ]
+        return pd.concat(parts, axis=1)[info['columns']]
+
+    # ---- 交叉验证折 ----
+
+    def folds(self, y, n_splits=5):
+        """StratifiedKFold（与 GridSearchCV(cv=n_splits) 相同的划分）的样本下标，内存映射读取"""
+        key = fingerprint(self.CACHE_VERSION, np.asarray(y), n_splits)
+        directory = self._path('folds', key)
+        done_path = os.path.join(directory, 'done')
+        if not os.path.exists(done_path):
+            os.makedirs(directory, exist_ok=True)
+            splits = StratifiedKFold(n_splits=n_splits).split(np.zeros(len(y)), y)
+            for i, (train_idx, valid_idx) in enumerate(splits):
+                np.save(os.path.join(directory, f'{i}.train.npy'), train_idx)
+                np.save(os.path.join(directory, f'{i}.valid.npy'), valid_idx)
+            open(done_path, 'w').close()
+        return [
+            (np.load(os.path.join(directory, f'{i}.train.npy'), mmap_mode='r'),
+             np.load(os.path.join(directory, f'{i}.valid.npy'), mmap_mode='r'))
+            for i in range(n_splits)
+        ]
+
+    # ---- 估计器 ----
+
+    def fit(self, estimator, X, y):
+        """训练估计器；类名、参数和训练数据都相同的估计器直接从缓存读取
+
+        VotingClassifier 按成员分别缓存，成员参数相同即可复用；集成本身由 VotingClassifier.fit 训练。
+        """
+        if isinstance(estimator, VotingClassifier):
+            return self._fit_voting(estimator, X, y)
+
+        fitted = self.get(estimator, X, y)
+        if fitted is None:
+            fitted = estimator.fit(X, y)
+            self.put(estimator, X, y, fitted)
+        return fitted
+
+    def _model_path(self, estimator, X, y):
+        return self._path('models', fingerprint(self.CACHE_VERSION, estimator, X, np.asarray(y)) + '.joblib')
+
+    def get(self, estimator, X, y):
+        """读取参数和训练数据都相同的已训练估计器，不存在时返回 None"""
+        path = self._model_path(estimator, X, y)
+        if os.path.exists(path):
+            self.hits += 1
+            return joblib.load(path)
+        self.misses += 1
+        return None
+
+    def put(self, estimator, X, y, fitted):
+        """保存已训练的估计器，estimator 为训练前的估计器（用于计算 key）"""
+        path = self._model_path(estimator, X, y)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 先写临时文件再替换，避免中断后留下损坏的缓存
+        joblib.dump(fitted, path + '.tmp')
+        os.replace(path + '.tmp', path)
+
+    def _fit_voting(self, ensemble, X, y):
+        """成员替换为经缓存训练的包装后调用 VotingClassifier.fit，训练完成后换回原成员与训练好的估计器"""
+        estimators = ensemble.estimators
+        ensemble.set_params(estimators=[
+            (name, est if est == 'drop' else _CachedMember(est, self.cache_dir)) for name, est in estimators
+        ])
+        try:
+            ensemble.fit(X, y)
+        finally:
+            ensemble.set_params(estimators=estimators)
+
+        for member in ensemble.estimators_:
+            self.hits += member.hits_
+            self.misses += member.misses_
+        ensemble.estimators_ = [member.estimator_ for member in ensemble.estimators_]
+        for name, est in ensemble.named_estimators_.items():
+            if est != 'drop':
+                ensemble.named_estimators_[name] = est.estimator_
+        return ensemble
+
+    @staticmethod
+    def _write_json(path, data):
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(path + '.tmp', path)
+
+
+class _CachedMember(ClassifierMixin, BaseEstimator):
+    """VotingClassifier 成员的包装：fit 时经训练缓存训练内部估计器（可在 joblib 工作进程中运行）"""
+
+    def __init__(self, estimator=None, cache_dir=None):
+        self.estimator = estimator
+        self.cache_dir = cache_dir
+
+    def fit(self, X, y):
+        cache = TrainingCache(self.cache_dir)
+        self.estimator_ = cache.fit(clone(self.estimator), X, y)
+        self.hits_, self.misses_ = cache.hits, cache.misses
+        if hasattr(self.estimator_, 'feature_names_in_'):
+            self.feature_names_in_ = self.estimator_.feature_names_in_
+        return self
@@ -0,0 +1,188 @@
+"""
+训练调度模块 - 在进程池中并发训练多个模型，按CPU核数分配各模型的线程数
+"""
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+
+from app.services.hyperparameter_search import available_cpus
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def classification_metrics(model, X_test, y_test):
+    """测试集上的分类指标"""
+    y_pred = model.predict(X_test)
+    y_proba = model.predict_proba(X_test)[:, 1]
+    return {
+        'accuracy': accuracy_score(y_test, y_pred),
+        'precision': precision_score(y_test, y_pred),
+        'recall': recall_score(y_test, y_pred),
+        'f1': f1_score(y_test, y_pred),
+        'roc_auc': roc_auc_score(y_test, y_proba)
+    }
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位为 KB，macOS 为字节
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def _thread_cpu_ticks():
+    """本进程各线程已用的CPU时间（时钟周期数，仅 Linux），返回 线程号 -> 周期数"""
+    ticks = {}
+    try:
+        tids = os.listdir('/proc/self/task')
+    except OSError:
+        return None
+    for tid in tids:
+        try:
+            with open(f'/proc/self/task/{tid}/stat') as f:
+                # 线程名中可能含空格，从右括号之后按空格切分：utime、stime 为第 12、13 个字段
+                fields = f.read().rsplit(')', 1)[1].split()
+        except OSError:
+            # 线程已退出
+            continue
+        ticks[tid] = int(fields[11]) + int(fields[12])
+    return ticks
+
+
+class _ThreadSampler:
+    """训练期间在后台线程中定期采样各线程的CPU时间，统计实际参与计算的线程数
+
+    joblib 线程池的调度线程等只占极少CPU，用时不到最忙线程 BUSY_RATIO 的线程不计入。
+    """
+
+    INTERVAL_SECONDS = 0.01
+    BUSY_RATIO = 0.1
+
+    def __init__(self):
+        self.start = _thread_cpu_ticks()
+        self.ticks = dict(self.start or {})
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self):
+        for tid, ticks in _thread_cpu_ticks().items():
+            self.ticks[tid] = max(self.ticks.get(tid, 0), ticks)
+
+    def _run(self):
+        while not self._stop.wait(self.INTERVAL_SECONDS):
+            self._sample()
+
+    def __enter__(self):
+        if self.start is not None:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+            self._sample()
+
+    @property
+    def threads(self):
+        """训练期间实际参与计算的线程数（无法采样或训练过快无法分辨时为 None）"""
+        if self.start is None:
+            return None
+        own = str(self._thread.native_id)
+        used = [ticks - self.start.get(tid, 0) for tid, ticks in self.ticks.items() if tid != own]
+        busiest = max(used, default=0)
+        if busiest == 0:
+            return None
+        return sum(1 for ticks in used if ticks >= busiest * self.BUSY_RATIO)
+
+
+def _fit_task(name, model, X_train, y_train, X_test, y_test):
+    """在工作进程中训练并评估一个模型"""
+    start = time.perf_counter()
+    with _ThreadSampler() as sampler:
+        model.fit(X_train, y_train)
+    seconds = time.perf_counter() - start
+    # 工作进程以 spawn 方式新建、只训练这一个模型，训练结束时的峰值RSS即训练该模型的进程整体峰值
+    # （含解释器、已导入的库与训练/测试数据，不含之后的评估）
+    peak_rss = _peak_rss_mb()
+    return {
+        'name': name,
+        'model': model,
+        'metrics': classification_metrics(model, X_test, y_test),
+        'seconds': seconds,
+        'memory_mb': peak_rss,
+        'fit_threads': sampler.threads
+    }
+
+
+class TrainingScheduler:
+    """并发训练调度器
+
+    单线程模型（SERIAL_ESTIMATORS 或没有 n_jobs 参数）占 1 核，其余核数平均分给多线程模型，
+    只有空闲核数足够时才启动下一个任务，同时运行的线程总数不超过 n_cpus。
+    每个任务在以 spawn 方式新建的工作进程中运行（每个进程只运行一个任务），以便统计各模型的峰值内存；
+    工作进程不是守护进程，joblib 不会把其中的并行度降为 1。
+    """
+
+    THREAD_PARAM = 'n_jobs'
+    # 有 n_jobs 参数但二分类训练时不会并行的模型
+    SERIAL_ESTIMATORS = ('LogisticRegression',)
+
+    def __init__(self, n_cpus=None):
+        self.n_cpus = n_cpus or available_cpus()
+
+    def is_parallel(self, model):
+        return (self.THREAD_PARAM in model.get_params(deep=False)
+                and type(model).__name__ not in self.SERIAL_ESTIMATORS)
+
+    def allocate(self, models):
+        """各模型分配的线程数"""
+        parallel = [name for name, model in models.items() if self.is_parallel(model)]
+        n_serial = len(models) - len(parallel)
+        threads = max(1, (self.n_cpus - n_serial) // len(parallel)) if parallel else 1
+        return {name: threads if name in parallel else 1 for name in models}
+
+    def run(self, models, X_train, y_train, X_test, y_test, on_result=None):
+        """并发训练 models（名称 -> 估计器），每完成一个调用 on_result(result)，返回按原顺序排列的结果"""
+        threads = self.allocate(models)
+        for name, model in models.items():
+            if self.is_parallel(model):
+                model.set_params(**{self.THREAD_PARAM: threads[name]})
+
+        results = {}
+        pending = list(models)
+        running = {}
+        free = self.n_cpus
+        with ProcessPoolExecutor(min(self.n_cpus, len(models)) or 1, mp_context=multiprocessing.get_context('spawn'),
+                                 max_tasks_per_child=1) as pool:
+            while pending or running:
+                # 至少保证一个任务在运行，避免线程数大于核数的任务永远等待
+                while pending and (threads[pending[0]] <= free or not running):
+                    name = pending.pop(0)
+                    future = pool.submit(_fit_task, name, models[name], X_train, y_train, X_test, y_test)
+                    running[future] = name
+                    free -= threads[name]
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    free += threads[name]
+                    result = future.result()
+                    result['threads'] = threads[name]
+                    fit_threads = result['fit_threads']
+                    if fit_threads is not None and fit_threads < threads[name]:
+                        print(f"! {name} 分配了 {threads[name]} 个线程，训练期间只有 {fit_threads} 个线程在运行")
+                    results[name] = result
+                    if on_result is not None:
+                        on_result(result)
+
+        return {name: results[name] for name in models}
@@ -0,0 +1,349 @@
+"""
+树模型推理引擎模块
+"""
+import json
+import os
+
+import numpy as np
+
+
+class TreeEnsemble:
+    """编译后的树集成模型
+
+    把 VotingClassifier 中的 RandomForest、XGBoost、LightGBM 的所有树展开为同一组节点数组
+    （分裂特征、阈值、左右子节点、缺失值方向、叶子值），推理时对一批样本的所有树
+    同时逐层下降，整个集成只需少量 NumPy 运算，且加载时不依赖 sklearn/xgboost/lightgbm。
+
+    各库的比较语义统一为 x <= 阈值：
+        RandomForest  特征按 float32 比较 x <= t
+        XGBoost       特征按 float32 比较 x < t，阈值换成 float32 中 t 的前一个数后等价于 x <= t'
+        LightGBM      特征按 float64 比较 x <= t
+    节点特征编号在 [0, n_features) 时取 float32 特征，在 [n_features, 2*n_features) 时取 float64 特征。
+    """
+
+    FORMAT_VERSION = 1
+
+    # LightGBM 判定为零值的阈值（kZeroThreshold）
+    ZERO_THRESHOLD = 1e-35
+
+    # 分块推理的行数：(树数 x 行数) 的中间数组能放进CPU缓存时最快
+    BLOCK_ROWS = 128
+
+    ARRAY_FIELDS = ['feature', 'threshold', 'child', 'missing_left', 'zero_missing', 'value', 'roots', 'depths']
+
+    def __init__(self, arrays, meta):
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        self.child = arrays['child']
+        self.missing_left = arrays['missing_left']
+        self.zero_missing = arrays['zero_missing']
+        self.value = arrays['value']
+        self.roots = arrays['roots']
+        self.meta = meta
+        self.feature_names = meta['feature_names']
+        self.groups = meta['groups']
+        self.weights = np.asarray(meta['weights'], dtype=np.float64)
+        self.depths = arrays['depths']
+        self.has_zero_missing = bool(self.zero_missing.any())
+        self.depth_order = np.argsort(-self.depths, kind='stable')
+        # 第 i 层仍需下降的树数
+        self.active_trees = [int((self.depths > level).sum()) for level in range(int(self.depths.max(initial=0)))]
+        self.feature_importances = (
+            np.asarray(meta['feature_importances']) if meta.get('feature_importances') is not None else None
+        )
+
+    @classmethod
+    def from_model(cls, model, feature_names):
+        """从训练好的模型编译"""
+        builder = _TreeBuilder(len(feature_names))
+        if hasattr(model, 'voting'):
+            if model.voting != 'soft':
+                raise ValueError('只支持 soft voting 的集成模型')
+            estimators = list(model.estimators_)
+            weights = model.weights if model.weights is not None else [1.0] * len(estimators)
+        else:
+            estimators = [model]
+            weights = [1.0]
+
+        for estimator in estimators:
+            if list(getattr(estimator, 'classes_', [0, 1])) != [0, 1]:
+                raise ValueError('只支持二分类模型')
+            if hasattr(estimator, 'get_booster'):
+                builder.add_xgboost(estimator.get_booster())
+            elif hasattr(estimator, 'booster_'):
+                builder.add_lightgbm(estimator.booster_)
+            elif hasattr(estimator, 'estimators_') and all(hasattr(tree, 'tree_') for tree in estimator.estimators_):
+                builder.add_forest([tree.tree_ for tree in estimator.estimators_])
+            elif hasattr(estimator, 'tree_'):
+                builder.add_forest([estimator.tree_])
+            else:
+                raise ValueError(f'不支持编译的模型: {type(estimator).__name__}')
+
+        meta = {
+            'version': cls.FORMAT_VERSION,
+            'feature_names': list(feature_names),
+            'groups': builder.groups,
+            'weights': [float(w) for w in weights],
+            'feature_importances': _average_importances(estimators)
+        }
+        return cls(builder.arrays(), meta)
+
+    def save(self, path, source=None):
+        """保存为 .npz（元数据以JSON字符串存放，加载时无需 pickle）"""
+        meta = dict(self.meta, source=source)
+        arrays = {name: getattr(self, name) for name in self.ARRAY_FIELDS}
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path, meta=np.array(json.dumps(meta, ensure_ascii=False)), **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """加载编译后的模型"""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            if meta['version'] != cls.FORMAT_VERSION:
+                raise ValueError(f"不支持的模型格式版本: {meta['version']}")
+            arrays = {name: data[name] for name in cls.ARRAY_FIELDS}
+        return cls(arrays, meta)
+
+    def save_arrays(self, directory):
+        """每个节点数组保存为一个 .npy 文件（可内存映射），返回需另行保存的元数据"""
+        os.makedirs(directory, exist_ok=True)
+        for name in self.ARRAY_FIELDS:
+            np.save(os.path.join(directory, name + '.npy'), np.ascontiguousarray(getattr(self, name)))
+        return dict(self.meta)
+
+    @classmethod
+    def load_arrays(cls, directory, meta, mmap_mode='r'):
+        """由 save_arrays 的目录与元数据加载；默认内存映射，多个进程共享同一份页缓存"""
+        if meta['version'] != cls.FORMAT_VERSION:
+            raise ValueError(f"不支持的模型格式版本: {meta['version']}")
+        arrays = {
+            name: np.load(os.path.join(directory, name + '.npy'), mmap_mode=mmap_mode, allow_pickle=False)
+            for name in cls.ARRAY_FIELDS
+        }
+        return cls(arrays, meta)
+
+    def is_fresh(self, model_path):
+        """是否由当前版本的模型文件编译而来"""
+        source = self.meta.get('source')
+        if not source or not os.path.exists(model_path):
+            return True
+        stat = os.stat(model_path)
+        return source['size'] == stat.st_size and source['mtime'] == stat.st_mtime
+
+    def predict_proba(self, X):
+        """预测概率，返回 (n, 2) 数组，与原模型 predict_proba 一致"""
+        X = np.asarray(X, dtype=np.float64)
+        proba = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), self.BLOCK_ROWS):
+            proba[start:start + self.BLOCK_ROWS] = self._predict_block(X[start:start + self.BLOCK_ROWS])
+        return np.column_stack([1 - proba, proba])
+
+    def _predict_block(self, X):
+        """对一块样本同时遍历所有树，返回通过概率"""
+        # float32 特征（RandomForest、XGBoost）与 float64 特征（LightGBM）拼在一起按节点编号取用
+        features = np.concatenate([X.astype(np.float32).astype(np.float64), X], axis=1)
+        n_rows, width = features.shape
+        flat = features.ravel()
+        offsets = np.arange(n_rows, dtype=np.int64) * width
+        # 本块没有缺失值（及 LightGBM 视为缺失的零值）时跳过缺失值分支
+        check_missing = bool(np.isnan(X).any()) or (
+            self.has_zero_missing and bool((np.abs(X) <= self.ZERO_THRESHOLD).any())
+        )
+
+        # 按树深度从深到浅排列，每下降一层只处理尚未到达叶子的那些树（连续的前若干行）
+        nodes = np.repeat(self.roots[self.depth_order][:, None], n_rows, axis=1)
+        for active in self.active_trees:
+            current = nodes[:active]
+            x = flat.take(self.feature.take(current) + offsets)
+            go_right = x > self.threshold.take(current)
+            if check_missing:
+                missing = np.isnan(x) | (self.zero_missing.take(current) & (np.abs(x) <= self.ZERO_THRESHOLD))
+                go_right = np.where(missing, ~self.missing_left.take(current), go_right)
+            nodes[:active] = self.child.take(current) + go_right
+
+        leaves = np.empty((len(self.roots), n_rows), dtype=np.float64)
+        leaves[self.depth_order] = self.value.take(nodes)
+        proba = np.zeros(n_rows, dtype=np.float64)
+        for group, weight in zip(self.groups, self.weights):
+            output = leaves[group['start']:group['stop']].sum(axis=0)
+            if group['kind'] == 'mean':
+                output = output / (group['stop'] - group['start'])
+            else:
+                output = 1.0 / (1.0 + np.exp(-group['scale'] * (output + group['base'])))
+            proba += weight * output
+        return proba / self.weights.sum()
+
+
+class _TreeBuilder:
+    """把各库的树追加到统一的节点数组"""
+
+    def __init__(self, n_features):
+        self.n_features = n_features
+        self.columns = {name: [] for name in TreeEnsemble.ARRAY_FIELDS if name not in ('roots', 'depths')}
+        self.roots = []
+        self.depths = []
+        self.groups = []
+        self.size = 0
+
+    def _add_tree(self, feature, threshold, left, right, missing_left, zero_missing, value):
+        """追加一棵树，left/right 为树内编号，-1 表示叶子
+
+        节点按层重新编号，使每个内部节点的右子节点紧跟在左子节点之后，
+        推理时只需 child + (x > 阈值) 一次取值即可下降一层。
+        叶子节点的子节点指向自身、阈值为 +inf，下降时原地不动。
+        """
+        left = np.asarray(left, dtype=np.int64)
+        right = np.asarray(right, dtype=np.int64)
+        feature = np.asarray(feature, dtype=np.int64)
+        threshold = np.asarray(threshold, dtype=np.float64)
+        missing_left = np.asarray(missing_left, dtype=bool)
+        zero_missing = np.asarray(zero_missing, dtype=bool)
+        value = np.asarray(value, dtype=np.float64)
+        leaf = left < 0
+
+        # 按层遍历，左右子节点分配相邻的新编号
+        order = [0]
+        child = np.zeros(len(left), dtype=np.int64)
+        depth = np.zeros(len(left), dtype=np.int64)
+        for new_id, node in enumerate(order):
+            if leaf[node]:
+                child[new_id] = new_id
+            else:
+                child[new_id] = len(order)
+                order.extend([left[node], right[node]])
+                depth[left[node]] = depth[right[node]] = depth[node] + 1
+        order = np.asarray(order)
+        leaf = leaf[order]
+
+        self.columns['feature'].append(np.where(leaf, 0, feature[order]).astype(np.int32))
+        self.columns['threshold'].append(np.where(leaf, np.inf, threshold[order]))
+        self.columns['child'].append(child[:len(order)] + self.size)
+        self.columns['missing_left'].append(leaf | missing_left[order])
+        self.columns['zero_missing'].append(~leaf & zero_missing[order])
+        self.columns['value'].append(np.where(leaf, value[order], 0.0))
+        self.roots.append(self.size)
+
+        self.depths.append(int(depth.max()))
+        self.size += len(order)
+
+    def _add_group(self, start, **group):
+        self.groups.append(dict(group, start=start, stop=len(self.roots)))
+
+    def add_forest(self, trees):
+        """sklearn 决策树：叶子值为通过类的概率，取平均"""
+        start = len(self.roots)
+        for tree in trees:
+            counts = tree.value[:, 0, :]
+            missing_left = getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count, dtype=np.uint8))
+            self._add_tree(
+                feature=tree.feature,
+                threshold=tree.threshold,
+                left=tree.children_left,
+                right=tree.children_right,
+                missing_left=missing_left,
+                zero_missing=np.zeros(tree.node_count, dtype=bool),
+                value=counts[:, 1] / counts.sum(axis=1)
+            )
+        self._add_group(start, kind='mean')
+
+    def add_xgboost(self, booster):
+        """XGBoost：叶子值求和加基准分后取 sigmoid"""
+        model = json.loads(booster.save_raw(raw_format='json'))
+        learner = model['learner']
+        if learner['objective']['name'] != 'binary:logistic':
+            raise ValueError(f"不支持的 XGBoost 目标函数: {learner['objective']['name']}")
+        if learner['gradient_booster']['name'] != 'gbtree':
+            raise ValueError(f"不支持的 XGBoost 提升器: {learner['gradient_booster']['name']}")
+
+        base_score = float(learner['learner_model_param']['base_score'])
+        start = len(self.roots)
+        for tree in learner['gradient_booster']['model']['trees']:
+            if any(tree['split_type']):
+                raise ValueError('不支持 XGBoost 类别特征分裂')
+            left = np.asarray(tree['left_children'], dtype=np.int64)
+            conditions = np.asarray(tree['split_conditions'], dtype=np.float32)
+            # x < t 等价于 x <= (float32 中小于 t 的最大值)
+            threshold = np.nextafter(conditions, np.float32(-np.inf)).astype(np.float64)
+            self._add_tree(
+                feature=tree['split_indices'],
+                threshold=threshold,
+                left=left,
+                right=tree['right_children'],
+                missing_left=np.asarray(tree['default_left'], dtype=bool),
+                zero_missing=np.zeros(len(left), dtype=bool),
+                value=conditions.astype(np.float64)
+            )
+        self._add_group(start, kind='logistic', base=float(np.log(base_score / (1 - base_score))), scale=1.0)
+
+    def add_lightgbm(self, booster):
+        """LightGBM：叶子值（已含学习率与初始分）求和后取 sigmoid"""
+        model = booster.dump_model()
+        objective = model['objective'].split()
+        if objective[0] != 'binary' or model.get('average_output'):
+            raise ValueError(f"不支持的 LightGBM 目标函数: {model['objective']}")
+        scale = 1.0
+        for option in objective[1:]:
+            if option.startswith('sigmoid:'):
+                scale = float(option.split(':')[1])
+
+        start = len(self.roots)
+        for info in model['tree_info']:
+            nodes = []
+            stack = [(info['tree_structure'], -1, False)]
+            left, right = [], []
+            while stack:
+                node, parent, is_left = stack.pop()
+                node_id = len(nodes)
+                nodes.append(node)
+                left.append(-1)
+                right.append(-1)
+                if parent >= 0:
+                    (left if is_left else right)[parent] = node_id
+                if 'leaf_value' not in node:
+                    if node['decision_type'] != '<=':
+                        raise ValueError('不支持 LightGBM 类别特征分裂')
+                    stack.append((node['right_child'], node_id, False))
+                    stack.append((node['left_child'], node_id, True))
+
+            is_leaf = ['leaf_value' in node for node in nodes]
+            missing_type = [node.get('missing_type', 'None') for node in nodes]
+            threshold = [node.get('threshold', 0.0) for node in nodes]
+            # missing_type 为 None 时缺失值按 0 处理，即走 0 所在的一侧
+            missing_left = [
+                leaf or (node['default_left'] if kind != 'None' else 0.0 <= t)
+                for node, leaf, kind, t in zip(nodes, is_leaf, missing_type, threshold)
+            ]
+            self._add_tree(
+                feature=[node.get('split_feature', 0) + self.n_features for node in nodes],
+                threshold=threshold,
+                left=left,
+                right=right,
+                missing_left=missing_left,
+                zero_missing=[kind == 'Zero' for kind in missing_type],
+                value=[node.get('leaf_value', 0.0) for node in nodes]
+            )
+        self._add_group(start, kind='logistic', base=0.0, scale=scale)
+
+    def arrays(self):
+        arrays = {name: np.concatenate(parts) for name, parts in self.columns.items()}
+        arrays['child'] = arrays['child'].astype(np.int32)
+        arrays['roots'] = np.asarray(self.roots, dtype=np.int32)
+        arrays['depths'] = np.asarray(self.depths, dtype=np.int32)
+        return arrays
+
+
+def _average_importances(estimators):
+    """各子模型特征重要性的平均值，与 ResumePredictor.get_feature_importance 的计算方式一致"""
+    importances = [estimator.feature_importances_ for estimator in estimators
+                   if hasattr(estimator, 'feature_importances_')]
+    if not importances:
+        return None
+    return np.mean(importances, axis=0).tolist()
+
+
+def compiled_model_path(model_path):
+    """模型文件对应的编译后推理文件路径"""
+    return os.path.splitext(model_path)[0] + '.trees.npz'
+
@@ -3,19 +3,73 @@
 """
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import LabelEncoder, StandardScaler
 import re
 
 
 class ResumeDataProcessor:
     """简历数据处理器"""
     
+    # 熟练度到数值的映射，未知熟练度记为1分
+    PROFICIENCY_SCORES = {
+        '精通': 5,
+        '熟练': 4,
+        '掌握': 3,
+        '了解': 2,
+        '无': 0,
+        'NULL': 0
+    }
+    
+    # 类别特征编码，未知取值分别记为1、1、0
+    EDUCATION_MAP = {'专科': 1, '本科': 2, '硕士': 3, '博士': 4}
+    SCHOOL_MAP = {'普通高校': 1, '211高校': 2, '985高校': 3}
+    ENGLISH_MAP = {'无': 0, '英语四级': 1, '英语六级': 2, '英语专业': 3}
+    
+    # 保存到模型产物清单中的编码表（类属性名 -> 清单中的键）
+    ENCODINGS = {
+        'EDUCATION_MAP': 'education',
+        'SCHOOL_MAP': 'school',
+        'ENGLISH_MAP': 'english',
+        'PROFICIENCY_SCORES': 'proficiency'
+    }
+    
+    # 技术栈列及其熟练度列
+    TECH_COLUMNS = [
+        ('前端技术', '前端技术熟练度'),
+        ('后端技术', '后端技术熟练度'),
+        ('数据库', '数据库熟练度'),
+        ('云计算/运维', '云计算/运维熟练度'),
+        ('数据与算法', '数据与算法熟练度'),
+        ('移动开发', '移动开发熟练度'),
+        ('测试工具', '测试工具熟练度')
+    ]
+    
     def __init__(self):
         self.label_encoders = {}
-        self.scaler = StandardScaler()
+        self._scaler = None
         self.skill_list = []
         self.tech_list = []
-        
+
+    def encodings(self):
+        """特征工程使用的编码表，写入模型产物清单"""
+        return {key: dict(getattr(self, attr)) for attr, key in self.ENCODINGS.items()}
+
+    @classmethod
+    def from_encodings(cls, encodings):
+        """按模型产物清单中的编码表创建处理器，保证预测与训练时的编码一致"""
+        processor = cls()
+        for attr, key in cls.ENCODINGS.items():
+            if key in encodings:
+                setattr(processor, attr, dict(encodings[key]))
+        return processor
+
+    @property
+    def scaler(self):
+        """标准化器（按需导入 sklearn，预测服务加载时无需 sklearn）"""
+        if getattr(self, '_scaler', None) is None:
+            from sklearn.preprocessing import StandardScaler
+            self._scaler = StandardScaler()
+        return self._scaler
+    
     def parse_skills(self, skill_str, proficiency_str=None):
         """解析技能列表"""
         if pd.isna(skill_str) or skill_str == 'NULL':
@@ -32,15 +86,69 @@ class ResumeDataProcessor:
     
     def proficiency_to_score(self, proficiency):
         """将熟练度转换为数值"""
-        mapping = {
-            '精通': 5,
-            '熟练': 4,
-            '掌握': 3,
-            '了解': 2,
-            '无': 0,
-            'NULL': 0
-        }
-        return mapping.get(proficiency, 1)
+        return self.PROFICIENCY_SCORES.get(proficiency, 1)
+    
+    def _skill_features(self, skill_series, proficiency_series):
+        """列式计算技能数量与平均熟练度
+        
+        与逐行调用 parse_skills / proficiency_to_score 的结果逐位一致：
+        先对整列做字典编码，只拆分去重后的取值，再通过数组查表映射回每一行。
+        """
+        skill_codes, skill_uniques = pd.factorize(skill_series.to_numpy(dtype=object))
+        prof_codes, prof_uniques = pd.factorize(proficiency_series.to_numpy(dtype=object))
+        
+        # 技能数量：无效取值（空 / 'NULL'）计0，编码 -1 落到末尾的0
+        skill_valid = self._valid_values(skill_uniques)
+        skill_counts = np.zeros(len(skill_uniques) + 1, dtype=np.int64)
+        skill_counts[:-1][skill_valid] = self._split_values(skill_uniques[skill_valid])[0]
+        counts = skill_counts[skill_codes]
+        
+        has_skill = np.append(skill_valid, False)[skill_codes]
+        if not has_skill.any():
+            # 与逐行实现保持一致：全部为空时该列为整数0
+            return counts, np.zeros(len(counts), dtype=np.int64)
+        
+        # 熟练度均值：熟练度缺失时按全部“掌握”计，即3分
+        prof_valid = self._valid_values(prof_uniques) & prof_uniques.astype(bool)
+        prof_means = np.full(len(prof_uniques) + 1, 3.0)
+        if prof_valid.any():
+            token_counts, tokens = self._split_values(prof_uniques[prof_valid])
+            token_codes, token_uniques = pd.factorize(np.asarray(tokens, dtype=object))
+            token_scores = np.array(
+                [self.proficiency_to_score(t.strip()) for t in token_uniques], dtype=np.float64
+            )[token_codes]
+            offsets = np.concatenate(([0], np.cumsum(token_counts)[:-1]))
+            prof_means[:-1][prof_valid] = np.add.reduceat(token_scores, offsets) / token_counts
+        
+        scores = np.where(has_skill, prof_means[prof_codes], 0.0)
+        return counts, scores
+    
+    @staticmethod
+    def _map_unique(series, func):
+        """对去重后的取值逐个计算再按编码映射回整列，结果与 Series.apply 一致"""
+        codes, uniques = pd.factorize(series.to_numpy(dtype=object))
+        results = [func(value) for value in uniques]
+        if (codes == -1).any():
+            results.append(func(np.nan))
+        return np.array(results)[codes] if results else np.zeros(0, dtype=np.int64)
+    
+    @staticmethod
+    def _valid_values(values):
+        """非空且不为 'NULL' 的取值掩码"""
+        mask = pd.notna(values)
+        mask[mask] = values[mask] != 'NULL'
+        return mask
+    
+    @staticmethod
+    def _split_values(values):
+        """批量拆分逗号分隔字符串，返回每个取值的token数及扁平token列表"""
+        joined = '\x1f'.join(pd.Series(values, dtype=object).astype(str))
+        raw = np.frombuffer(joined.encode('utf-8'), dtype=np.uint8)
+        row_ends = np.flatnonzero(raw == 0x1f)
+        comma_rows = np.searchsorted(row_ends, np.flatnonzero(raw == 0x2c))
+        counts = np.bincount(comma_rows, minlength=len(values)) + 1
+        tokens = joined.replace('\x1f', ',').split(',')
+        return counts, tokens
     
     def extract_years(self, year_str):
         """提取工作年限数值"""
@@ -66,70 +174,35 @@ class ResumeDataProcessor:
         features['年龄'] = df['年龄']
         
         # 学历编码
-        education_map = {'专科': 1, '本科': 2, '硕士': 3, '博士': 4}
-        features['学历层次_编码'] = df['学历层次'].map(education_map).fillna(1)
+        features['学历层次_编码'] = df['学历层次'].map(self.EDUCATION_MAP).fillna(1)
         
         # 院校类别编码
-        school_map = {'普通高校': 1, '211高校': 2, '985高校': 3}
-        features['院校类别_编码'] = df['院校类别'].map(school_map).fillna(1)
+        features['院校类别_编码'] = df['院校类别'].map(self.SCHOOL_MAP).fillna(1)
         
         # 专业类别
         features['专业_计算机类'] = (df['专业类别'] == '计算机类').astype(int)
         
         # 英语水平编码
-        english_map = {'无': 0, '英语四级': 1, '英语六级': 2, '英语专业': 3}
-        features['英语水平_编码'] = df['英语水平'].map(english_map).fillna(0)
+        features['英语水平_编码'] = df['英语水平'].map(self.ENGLISH_MAP).fillna(0)
         
         # 编程语言特征
-        features['编程语言_数量'] = df['编程语言'].apply(
-            lambda x: len(str(x).split(',')) if pd.notna(x) and x != 'NULL' else 0
-        )
-        
-        # 编程语言平均熟练度
-        prog_scores = []
-        for idx, row in df.iterrows():
-            skills, profs = self.parse_skills(row['编程语言'], row['编程语言熟练度'])
-            if skills:
-                scores = [self.proficiency_to_score(p) for p in profs]
-                prog_scores.append(np.mean(scores))
-            else:
-                prog_scores.append(0)
+        prog_counts, prog_scores = self._skill_features(df['编程语言'], df['编程语言熟练度'])
+        features['编程语言_数量'] = prog_counts
         features['编程语言_平均熟练度'] = prog_scores
         
         # 技术栈特征
-        tech_columns = [
-            ('前端技术', '前端技术熟练度'),
-            ('后端技术', '后端技术熟练度'),
-            ('数据库', '数据库熟练度'),
-            ('云计算/运维', '云计算/运维熟练度'),
-            ('数据与算法', '数据与算法熟练度'),
-            ('移动开发', '移动开发熟练度'),
-            ('测试工具', '测试工具熟练度')
-        ]
-        
-        for tech_col, prof_col in tech_columns:
+        for tech_col, prof_col in self.TECH_COLUMNS:
             tech_name = tech_col.replace('技术', '').replace('工具', '')
             
-            # 技能数量
-            features[f'{tech_name}_数量'] = df[tech_col].apply(
-                lambda x: len(str(x).split(',')) if pd.notna(x) and x != 'NULL' else 0
-            )
-            
-            # 平均熟练度
-            tech_scores = []
-            for idx, row in df.iterrows():
-                skills, profs = self.parse_skills(row[tech_col], row[prof_col])
-                if skills:
-                    scores = [self.proficiency_to_score(p) for p in profs]
-                    tech_scores.append(np.mean(scores))
-                else:
-                    tech_scores.append(0)
+            # 技能数量与平均熟练度
+            tech_counts, tech_scores = self._skill_features(df[tech_col], df[prof_col])
+            features[f'{tech_name}_数量'] = tech_counts
             features[f'{tech_name}_平均熟练度'] = tech_scores
         
         # 工作经验特征
         work_exp_columns = ['小型企业工作经验', '中型企业工作经验', '大型企业工作经验']
         for col in work_exp_columns:
-            features[col + '_年数'] = df[col].apply(self.extract_years)
+            features[col + '_年数'] = self._map_unique(df[col], self.extract_years)
         
         features['总工作年限'] = (
             features['小型企业工作经验_年数'] + 
@@ -0,0 +1,95 @@
+"""
+过采样模块 - 训练集类别不平衡处理
+"""
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+# 可选的不平衡处理方式：精确SMOTE、近似近邻SMOTE、类别权重（不重采样）、不处理
+BALANCE_METHODS = ('smote', 'approx_smote', 'weight', 'none')
+
+
+class ApproximateSMOTE:
+    """近似最近邻 SMOTE
+
+    与 imblearn 的 SMOTE 相同：少数类样本补足到与多数类一样多，每个合成样本在随机选取的少数类样本
+    与其 k 个近邻之一的连线上随机插值。区别在于近邻的查找方式：
+    先将少数类样本随机投影到 n_components 维，在低维空间用 KD 树取 n_candidates 个候选，
+    再按原始特征的精确距离选出前 k 个。低维 KD 树查询约为 O(n log n)，而高维精确 k 近邻接近 O(n²)。
+    """
+
+    BLOCK_ROWS = 4096
+
+    def __init__(self, k_neighbors=5, n_components=6, n_candidates=None, random_state=None):
+        self.k_neighbors = k_neighbors
+        self.n_components = n_components
+        self.n_candidates = n_candidates or 4 * k_neighbors
+        self.random_state = random_state
+
+    def fit_resample(self, X, y):
+        """返回重采样后的 (X, y)，原样本在前、合成样本在后；DataFrame/Series 输入保持列名与类型"""
+        rng = np.random.default_rng(self.random_state)
+        values = np.asarray(X, dtype=np.float64)
+        labels = np.asarray(y)
+        classes, counts = np.unique(labels, return_counts=True)
+
+        new_X, new_y = [values], [labels]
+        for label, count in zip(classes, counts):
+            n_new = counts.max() - count
+            if n_new == 0 or count < 2:
+                continue
+            minority = values[labels == label]
+            neighbors = self.neighbors(minority, rng)
+            base = rng.integers(0, count, n_new)
+            chosen = neighbors[base, rng.integers(0, neighbors.shape[1], n_new)]
+            gap = rng.random(n_new)[:, None]
+            new_X.append(minority[base] + gap * (minority[chosen] - minority[base]))
+            new_y.append(np.full(n_new, label, dtype=labels.dtype))
+
+        X_resampled, y_resampled = np.concatenate(new_X), np.concatenate(new_y)
+        if isinstance(X, pd.DataFrame):
+            X_resampled = pd.DataFrame(X_resampled, columns=X.columns).astype(X.dtypes)
+        if isinstance(y, pd.Series):
+            y_resampled = pd.Series(y_resampled, name=y.name)
+        return X_resampled, y_resampled
+
+    def neighbors(self, points, rng):
+        """每个样本的 k 个近似最近邻下标"""
+        n = len(points)
+        k = min(self.k_neighbors, n - 1)
+        n_candidates = min(max(self.n_candidates, k), n - 1)
+
+        projection = rng.standard_normal((points.shape[1], self.n_components)) / np.sqrt(self.n_components)
+        projected = points @ projection
+        tree = KDTree(projected)
+
+        result = np.empty((n, k), dtype=np.int64)
+        for start in range(0, n, self.BLOCK_ROWS):
+            rows = np.arange(start, min(start + self.BLOCK_ROWS, n))
+            # 多取一个候选，查询结果通常包含样本自身
+            candidates = tree.query(projected[rows], k=n_candidates + 1, return_distance=False)
+            diff = points[candidates] - points[rows][:, None, :]
+            distances = np.einsum('ijk,ijk->ij', diff, diff)
+            distances[candidates == rows[:, None]] = np.inf
+            nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+            result[rows] = np.take_along_axis(candidates, nearest, axis=1)
+        return result
+
+
+def make_oversampler(method, random_state=42):
+    """按方式创建过采样器；'weight' 与 'none' 不重采样，返回 None"""
+    if method not in BALANCE_METHODS:
+        raise ValueError(f'未知的不平衡处理方式: {method}')
+    if method == 'smote':
+        from imblearn.over_sampling import SMOTE
+        return SMOTE(random_state=random_state)
+    if method == 'approx_smote':
+        return ApproximateSMOTE(random_state=random_state)
+    return None
+
+
+def positive_class_weight(y):
+    """正样本权重：负样本数 / 正样本数"""
+    y = np.asarray(y)
+    positives = int((y == 1).sum())
+    return (len(y) - positives) / max(positives, 1)
@@ -0,0 +1,257 @@
+"""
+列式简历存储模块
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+class ResumeStore:
+    """列式简历存储
+
+    目录结构：
+        meta.json            行数、各列类型、分类字典、源CSV信息
+        colNN.npy            数值列
+        colNN.codes.npy      分类列的字典编码（-1 表示缺失）
+        colNN.offsets.npy    字符串列每行在数据文件中的起始偏移（长度为行数+1）
+        colNN.data.bin       字符串列的UTF-8数据，每个值后跟一个 \\x1f 便于批量解码
+        colNN.nulls.npy      字符串列的缺失标记（无缺失时不生成）
+
+    所有数组均以内存映射方式打开，多个工作进程共享同一份页缓存。
+    """
+
+    FORMAT_VERSION = 1
+    SEPARATOR = '\x1f'
+    DECODE_BLOCK_ROWS = 65536
+
+    # 固定使用字典编码的列；其他文本列取值种类不超过行数的该比例时同样字典编码
+    CATEGORICAL_RATIO = 0.05
+    CATEGORICAL_COLUMNS = [
+        '性别', '意向岗位', '学历层次', '院校类别', '专业类别', '英语水平',
+        '编程语言熟练度', '前端技术熟练度', '后端技术熟练度', '数据库熟练度',
+        '云计算/运维熟练度', '数据与算法熟练度', '移动开发熟练度', '测试工具熟练度',
+        '小型企业工作经验', '中型企业工作经验', '大型企业工作经验', '筛选结果'
+    ]
+
+    def __init__(self, store_dir):
+        """打开存储（只读内存映射）"""
+        self.store_dir = store_dir
+        with open(os.path.join(store_dir, 'meta.json'), encoding='utf-8') as f:
+            self.meta = json.load(f)
+        if self.meta['version'] != self.FORMAT_VERSION:
+            raise ValueError(f"不支持的存储格式版本: {self.meta['version']}")
+
+        self.columns = [col['name'] for col in self.meta['columns']]
+        self._specs = {col['name']: col for col in self.meta['columns']}
+        self._arrays = {}
+
+    def __len__(self):
+        return self.meta['rows']
+
+    @classmethod
+    def write(cls, df, store_dir, source=None):
+        """将 DataFrame 写为列式存储"""
+        os.makedirs(store_dir, exist_ok=True)
+        columns = []
+
+        for i, name in enumerate(df.columns):
+            prefix = os.path.join(store_dir, f'col{i:02d}')
+            series = df[name]
+            spec = {'name': name, 'file': f'col{i:02d}'}
+
+            if series.dtype.kind in 'biuf':
+                spec['kind'] = 'numeric'
+                spec['dtype'] = series.dtype.str
+                np.save(prefix + '.npy', series.to_numpy())
+            else:
+                codes, categories = pd.factorize(series)
+                if name in cls.CATEGORICAL_COLUMNS or len(categories) <= cls.CATEGORICAL_RATIO * len(series):
+                    spec['kind'] = 'categorical'
+                    spec['categories'] = [str(c) for c in categories]
+                    np.save(prefix + '.codes.npy', codes.astype(np.int8 if len(categories) < 128 else np.int32))
+                else:
+                    spec['kind'] = 'string'
+                    cls._write_strings(series, prefix, spec)
+
+            columns.append(spec)
+
+        meta = {
+            'version': cls.FORMAT_VERSION,
+            'rows': len(df),
+            'columns': columns,
+            'source': source
+        }
+        # meta.json 最后写入，存在即表示存储完整
+        tmp_path = os.path.join(store_dir, 'meta.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, os.path.join(store_dir, 'meta.json'))
+        return cls(store_dir)
+
+    @classmethod
+    def _write_strings(cls, series, prefix, spec):
+        """写入偏移编码的字符串列"""
+        nulls = series.isna().to_numpy()
+        values = series.astype(str).where(~nulls, '') + cls.SEPARATOR
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum(values.str.encode('utf-8').str.len().to_numpy(), out=offsets[1:])
+
+        with open(prefix + '.data.bin', 'wb') as f:
+            f.write(''.join(values).encode('utf-8'))
+        np.save(prefix + '.offsets.npy', offsets)
+        if nulls.any():
+            np.save(prefix + '.nulls.npy', nulls)
+            spec['nullable'] = True
+
+    @classmethod
+    def from_csv(cls, csv_path, store_dir):
+        """从CSV转换"""
+        df = pd.read_csv(csv_path)
+        stat = os.stat(csv_path)
+        source = {
+            'path': os.path.abspath(csv_path),
+            'size': stat.st_size,
+            'mtime': stat.st_mtime
+        }
+        return cls.write(df, store_dir, source=source)
+
+    def is_fresh(self, csv_path):
+        """存储是否由当前版本的CSV转换而来"""
+        source = self.meta.get('source')
+        if not source or not os.path.exists(csv_path):
+            return True
+        stat = os.stat(csv_path)
+        return source['size'] == stat.st_size and source['mtime'] == stat.st_mtime
+
+    def _array(self, key, filename, memmap=False, mode='r'):
+        """按需打开内存映射数组"""
+        if key not in self._arrays:
+            path = os.path.join(self.store_dir, filename)
+            if memmap:
+                self._arrays[key] = (
+                    np.memmap(path, dtype=np.uint8, mode=mode) if os.path.getsize(path) else np.zeros(0, np.uint8)
+                )
+            else:
+                self._arrays[key] = np.load(path, mmap_mode=mode)
+        return self._arrays[key]
+
+    def kind(self, name):
+        """列类型：numeric / categorical / string"""
+        return self._specs[name]['kind']
+
+    def codes(self, name):
+        """分类列的字典编码（内存映射，-1 表示缺失）"""
+        spec = self._specs[name]
+        return self._array(name, spec['file'] + '.codes.npy')
+
+    def categories(self, name):
+        """分类列的字典"""
+        return self._specs[name]['categories']
+
+    def column(self, name, start=0, stop=None, copy=True):
+        """读取一列（或其中一段）为 numpy 数组，缺失值为 NaN
+
+        copy=False 时数值列直接返回内存映射（写时复制模式，写入只影响本进程），各进程共享同一份页缓存。
+        """
+        spec = self._specs[name]
+        stop = len(self) if stop is None else min(stop, len(self))
+
+        if spec['kind'] == 'numeric':
+            if not copy:
+                return self._array(name + '.cow', spec['file'] + '.npy', mode='c')[start:stop]
+            return np.array(self._array(name, spec['file'] + '.npy')[start:stop])
+
+        if spec['kind'] == 'categorical':
+            # 缺失编码 -1 恰好取到末尾追加的 NaN，同一取值共享同一个字符串对象
+            lookup = np.array(spec['categories'] + [np.nan], dtype=object)
+            return lookup.take(self.codes(name)[start:stop])
+
+        offsets = self._array(name + '.offsets', spec['file'] + '.offsets.npy')
+        data = self._array(name + '.data', spec['file'] + '.data.bin', memmap=True)
+        values = np.empty(max(stop - start, 0), dtype=object)
+        # 分块整段解码再按分隔符切分，限制解码时的峰值内存
+        for block in range(start, stop, self.DECODE_BLOCK_ROWS):
+            block_stop = min(block + self.DECODE_BLOCK_ROWS, stop)
+            text = data[offsets[block]:offsets[block_stop]].tobytes().decode('utf-8')
+            values[block - start:block_stop - start] = text.split(self.SEPARATOR)[:-1]
+        if spec.get('nullable'):
+            values[self._array(name + '.nulls', spec['file'] + '.nulls.npy')[start:stop]] = np.nan
+        return values
+
+    def value(self, name, row):
+        """读取单个单元格"""
+        spec = self._specs[name]
+        if spec['kind'] != 'string':
+            return self.column(name, row, row + 1)[0]
+        if spec.get('nullable') and self._array(name + '.nulls', spec['file'] + '.nulls.npy')[row]:
+            return np.nan
+        offsets = self._array(name + '.offsets', spec['file'] + '.offsets.npy')
+        data = self._array(name + '.data', spec['file'] + '.data.bin', memmap=True)
+        return data[offsets[row]:offsets[row + 1] - 1].tobytes().decode('utf-8')
+
+    def to_dataframe(self, columns=None, start=0, stop=None):
+        """读取为 DataFrame，结果与 pd.read_csv 读取源CSV一致；数值列不复制，直接引用内存映射"""
+        columns = self.columns if columns is None else columns
+        return pd.DataFrame({name: self.column(name, start, stop, copy=False) for name in columns}, copy=False)
+
+    def iter_chunks(self, chunk_rows, columns=None):
+        """按行分块读取"""
+        for start in range(0, len(self), chunk_rows):
+            yield self.to_dataframe(columns, start, start + chunk_rows)
+
+
+def share_strings(df, columns=None):
+    """文本列（或指定的列）去重：取值相同的单元格共享同一个字符串对象，返回新的 DataFrame
+
+    减少逐行的 Python 对象，预先 fork 的工作进程读取数据时只改动少量对象的引用计数，
+    不会逐页触发写时复制。其他列原样引用，不复制（列式存储的数值列仍为内存映射）。
+    """
+    names = df.columns if columns is None else columns
+    columns = {}
+    for name in df.columns:
+        values = df[name]
+        if values.dtype == object and name in names:
+            codes, uniques = pd.factorize(values)
+            # 缺失编码 -1 恰好取到末尾追加的 NaN
+            lookup = np.append(uniques.to_numpy(dtype=object), np.nan)
+            values = pd.Series(lookup.take(codes), index=df.index, name=name)
+        columns[name] = values
+    return pd.DataFrame(columns, copy=False)
+
+
+def default_store_dir(csv_path):
+    """CSV 对应的默认列式存储目录"""
+    return os.path.splitext(csv_path)[0] + '.store'
+
+
+def load_resume_data(csv_path, store_dir=None, shared=False):
+    """加载简历数据：优先使用与CSV一致的列式存储，否则直接读取CSV
+
+    shared=True 时文本列中相同取值共享同一个字符串对象（见 share_strings）；
+    列式存储的分类列本身已共享字典中的字符串，只需处理字符串列。
+    """
+    store_dir = store_dir or default_store_dir(csv_path)
+    if os.path.exists(os.path.join(store_dir, 'meta.json')):
+        store = ResumeStore(store_dir)
+        if store.is_fresh(csv_path):
+            df = store.to_dataframe()
+            if shared:
+                df = share_strings(df, [name for name in store.columns if store.kind(name) == 'string'])
+            return df
+        print(f"! 列式存储已过期，改为读取CSV（可运行 python build_store.py 重新生成）: {store_dir}")
+    df = pd.read_csv(csv_path)
+    return share_strings(df) if shared else df
+
+
+def iter_resume_chunks(csv_path, chunk_rows, columns=None, store_dir=None):
+    """按行分块加载简历数据：优先使用与CSV一致的列式存储，否则分块读取CSV"""
+    store_dir = store_dir or default_store_dir(csv_path)
+    if os.path.exists(os.path.join(store_dir, 'meta.json')):
+        store = ResumeStore(store_dir)
+        if store.is_fresh(csv_path):
+            yield from store.iter_chunks(chunk_rows, columns)
+            return
+        print(f"! 列式存储已过期，改为读取CSV（可运行 python build_store.py 重新生成）: {store_dir}")
+    yield from pd.read_csv(csv_path, usecols=columns, chunksize=chunk_rows)
@@ -0,0 +1,70 @@
+"""
+简历流式读取模块 - 从 NDJSON 或 CSV 输入流中按固定行数分块读取简历，内存占用与输入大小无关
+"""
+import json
+
+import pandas as pd
+
+NDJSON = 'ndjson'
+CSV = 'csv'
+
+# 每次从输入流读取的字节数
+READ_BYTES = 1 << 16
+
+
+def iter_lines(stream):
+    """按块读取输入流并切分为行（请求体等无缓冲的流逐行读取时会逐字节读取）"""
+    pending = b''
+    while True:
+        block = stream.read(READ_BYTES)
+        if not block:
+            break
+        lines = (pending + block).split(b'\n')
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+
+def iter_ndjson_chunks(stream, chunk_rows):
+    """按行解析 NDJSON（每行一份简历JSON对象），每 chunk_rows 条产出一个列表
+
+    无法解析的行以 None 占位，由预测时的校验返回错误，保证结果与输入逐行对应；空行跳过。
+    """
+    chunk = []
+    for line in iter_lines(stream):
+        if not line.strip():
+            continue
+        try:
+            chunk.append(json.loads(line))
+        except ValueError:
+            chunk.append(None)
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_csv_chunks(stream, chunk_rows):
+    """分块解析与 Chinese_resume_data.csv 列格式相同的 CSV（'NULL' 与空单元格为缺失），每 chunk_rows 行产出一个列表"""
+    for df in pd.read_csv(stream, chunksize=chunk_rows):
+        # 缺失值统一为 None，与前端提交的 JSON 一致；按列取值再拼为记录，比 to_dict('records') 快
+        values = df.astype(object).where(df.notna(), None)
+        columns = list(df.columns)
+        yield [dict(zip(columns, row)) for row in zip(*(values[col].tolist() for col in columns))]
+
+
+def iter_stream_chunks(stream, input_format, chunk_rows):
+    """按输入格式分块读取简历"""
+    if input_format == NDJSON:
+        return iter_ndjson_chunks(stream, chunk_rows)
+    if input_format == CSV:
+        return iter_csv_chunks(stream, chunk_rows)
+    raise ValueError(f'不支持的输入格式: {input_format}')
+
+
+def stream_format(content_type):
+    """由 Content-Type 判断输入格式：text/csv 为 CSV，其余（application/x-ndjson 等）按 NDJSON 处理"""
+    mimetype = (content_type or '').split(';')[0].strip().lower()
+    return CSV if mimetype in ('text/csv', 'application/csv') else NDJSON
@@ -0,0 +1,84 @@
+"""
+综合排序基准测试 - 对比只按规则匹配度排序与规则匹配度、模型通过概率加权综合排序的单次匹配延迟，
+并统计对整个候选池批量计算通过概率的用时
+
+用法:
+    python benchmarks/benchmark_blended_match.py --sizes 5000 100000 1000000 --ml-weight 0.3
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from app.services.candidate_index import CandidateIndex
+from app.services.predictor import ResumePredictor
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'Chinese_resume_data.csv')
+REGISTRY_DIR = os.path.join(os.path.dirname(__file__), '..', 'trained_models', 'registry')
+LEGACY_MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', 'trained_models', 'resume_model.pkl')
+
+QUERIES = [
+    {'position': '后端开发工程师', 'education': '本科', 'school': '211高校',
+     'experience_years': 2, 'skills': ['Python', 'Java', 'MySQL']},
+    {'education': '硕士', 'school': '985高校', 'experience_years': 3,
+     'skills': ['Python', 'TensorFlow/PyTorch']},
+    {'position': '前端开发工程师', 'skills': ['Vue.js', 'React']},
+]
+
+
+def make_dataset(base_df, n_rows):
+    """按行重采样生成指定规模的候选池"""
+    rng = np.random.default_rng(42)
+    return base_df.iloc[rng.integers(0, len(base_df), n_rows)].reset_index(drop=True)
+
+
+def median_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def default_model_path():
+    from app.services.model_registry import ModelRegistry
+    version = ModelRegistry(REGISTRY_DIR).current()
+    return ModelRegistry(REGISTRY_DIR).path(version) if version else LEGACY_MODEL_PATH
+
+
+def main():
+    parser = argparse.ArgumentParser(description='综合排序基准测试')
+    parser.add_argument('--model', default=None, help='模型产物目录或旧版 .pkl 文件（默认为注册表当前版本）')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5000, 100000, 1000000])
+    parser.add_argument('--ml-weight', type=float, default=0.3)
+    parser.add_argument('--top-n', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    predictor = ResumePredictor(args.model or default_model_path())
+    base_df = pd.read_csv(DATA_PATH)
+    print(f"{'候选池':>10} {'通过概率(s)':>12} {'规则排序(ms)':>14} {'综合排序(ms)':>14} {'比值':>8}")
+    for n_rows in args.sizes:
+        df = make_dataset(base_df, n_rows)
+        # 不使用匹配结果缓存，只比较排序本身的开销
+        index = CandidateIndex(df, cache_size=0)
+        start = time.perf_counter()
+        index.set_pass_probabilities(predictor.predict_pool(df), predictor.cache_namespace)
+        pool_seconds = time.perf_counter() - start
+
+        blended_queries = [dict(query, ml_weight=args.ml_weight) for query in QUERIES]
+        rule_ms = np.mean([median_ms(lambda: index.match(query, args.top_n), args.repeat) for query in QUERIES])
+        blended_ms = np.mean([
+            median_ms(lambda: index.match(query, args.top_n), args.repeat) for query in blended_queries
+        ])
+        print(f"{n_rows:>10} {pool_seconds:>12.2f} {rule_ms:>14.2f} {blended_ms:>14.2f} {blended_ms / rule_ms:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+冷启动基准测试 - 在全新的子进程中统计导入预测模块、加载模型与首次预测的用时和峰值内存
+
+用法:
+    python benchmarks/benchmark_cold_start.py --models trained_models/resume_model trained_models/resume_model.pkl
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BACKEND_DIR, '..', 'Chinese_resume_data.csv')
+TRAINED_MODELS_DIR = os.path.join(BACKEND_DIR, 'trained_models')
+
+# 子进程中执行：每次都是全新的解释器，模块与页缓存之外没有任何预热
+CHILD_SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {backend!r})
+from app.services.predictor import ResumePredictor
+imported = time.perf_counter()
+predictor = ResumePredictor({model!r})
+loaded = time.perf_counter()
+import pandas as pd
+resume = pd.read_csv({data!r}, nrows=1).iloc[0].to_dict()
+predictor.predict_single(resume)
+predicted = time.perf_counter()
+print(json.dumps({{
+    'import_ms': (imported - start) * 1000,
+    'load_ms': (loaded - imported) * 1000,
+    'first_predict_ms': (predicted - loaded) * 1000,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'heavy_modules': sorted(m for m in ('sklearn', 'xgboost', 'lightgbm', 'joblib') if m in sys.modules)
+}}))
+"""
+
+
+def cold_start(model_path):
+    script = CHILD_SCRIPT.format(backend=BACKEND_DIR, model=model_path, data=DATA_PATH)
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='模型冷启动基准测试')
+    parser.add_argument('--models', nargs='+', default=[
+        os.path.join(TRAINED_MODELS_DIR, 'resume_model'),
+        os.path.join(TRAINED_MODELS_DIR, 'resume_model.pkl')
+    ])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'模型':>20} {'导入(ms)':>10} {'加载(ms)':>10} {'首次预测(ms)':>12} {'合计(ms)':>10} {'峰值内存(MB)':>12}  已导入的重型库")
+    for model_path in args.models:
+        if not os.path.exists(model_path):
+            print(f"! 跳过不存在的模型: {model_path}")
+            continue
+        runs = [cold_start(model_path) for _ in range(args.repeat)]
+        median = {key: float(np.median([run[key] for run in runs]))
+                  for key in ('import_ms', 'load_ms', 'first_predict_ms', 'rss_mb')}
+        total = median['import_ms'] + median['load_ms'] + median['first_predict_ms']
+        print(f"{os.path.basename(model_path):>20} {median['import_ms']:>10.1f} {median['load_ms']:>10.1f} "
+              f"{median['first_predict_ms']:>12.1f} {total:>10.1f} {median['rss_mb']:>12.1f}  "
+              f"{', '.join(runs[-1]['heavy_modules']) or '-'}")
+
+
+if __name__ == '__main__':
+    main()
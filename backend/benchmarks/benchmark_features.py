@@ -0,0 +1,83 @@
+"""
+特征工程基准测试 - 对比逐行实现与列式实现的耗时，并校验结果逐位一致
+
+用法:
+    python benchmarks/benchmark_features.py --sizes 5000 100000 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from app.utils.data_processor import ResumeDataProcessor
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'Chinese_resume_data.csv')
+
+
+class RowwiseResumeDataProcessor(ResumeDataProcessor):
+    """逐行基线：按原实现对每个技能列执行一次 iterrows"""
+
+    def process_training_data(self, df):
+        self._rows = df
+        return super().process_training_data(df)
+
+    def _skill_features(self, skill_series, proficiency_series):
+        counts = skill_series.apply(
+            lambda x: len(str(x).split(',')) if pd.notna(x) and x != 'NULL' else 0
+        )
+        scores = []
+        for idx, row in self._rows.iterrows():
+            skills, profs = self.parse_skills(row[skill_series.name], row[proficiency_series.name])
+            if skills:
+                scores.append(np.mean([self.proficiency_to_score(p) for p in profs]))
+            else:
+                scores.append(0)
+        return counts.to_numpy(), scores
+
+    @staticmethod
+    def _map_unique(series, func):
+        return series.apply(func)
+
+
+def make_dataset(base_df, n_rows):
+    """按行重采样生成指定规模的数据集"""
+    rng = np.random.default_rng(42)
+    return base_df.iloc[rng.integers(0, len(base_df), n_rows)].reset_index(drop=True)
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='特征工程基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5000, 100000, 1000000])
+    parser.add_argument('--rowwise-max-rows', type=int, default=100000,
+                        help='超过该规模时跳过逐行基线（耗时过长）')
+    args = parser.parse_args()
+
+    base_df = pd.read_csv(DATA_PATH)
+    print(f"{'行数':>10} {'逐行(s)':>10} {'列式(s)':>10} {'加速比':>8}  一致性")
+
+    for n_rows in args.sizes:
+        df = make_dataset(base_df, n_rows)
+        vec_time, (vec_features, _) = time_call(ResumeDataProcessor().process_training_data, df)
+
+        if n_rows <= args.rowwise_max_rows:
+            row_time, (row_features, _) = time_call(
+                RowwiseResumeDataProcessor().process_training_data, df
+            )
+            pd.testing.assert_frame_equal(row_features, vec_features, check_exact=True)
+            print(f"{n_rows:>10} {row_time:>10.2f} {vec_time:>10.3f} {row_time / vec_time:>7.1f}x  逐位一致")
+        else:
+            print(f"{n_rows:>10} {'-':>10} {vec_time:>10.3f} {'-':>8}  (跳过逐行基线)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+匹配结果缓存基准测试 - 模拟匹配页面的重复查询（技能顺序不同、top_n 与翻页不同），对比有无缓存的平均延迟
+
+用法:
+    python benchmarks/benchmark_match_cache.py --sizes 5000 100000 1000000 --requests 500
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from app.services.candidate_index import CandidateIndex
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'Chinese_resume_data.csv')
+
+BASE_QUERIES = [
+    {'position': '后端开发工程师', 'education': '本科', 'school': '211高校',
+     'experience_years': 2, 'skills': ['Python', 'Java', 'MySQL']},
+    {'education': '硕士', 'school': '985高校', 'experience_years': 3,
+     'skills': ['Python', 'TensorFlow/PyTorch']},
+    {'position': '移动开发工程师', 'education': '本科', 'experience_years': 1,
+     'skills': ['iOS (Swift)', 'Android (Kotlin)']},
+    {'education': '本科', 'school': '211高校', 'experience_years': 2,
+     'skills': ['Ansible', 'Terraform', 'Docker/Kubernetes']},
+    {'position': '前端开发工程师', 'skills': ['Vue.js', 'React']},
+]
+
+
+def make_dataset(base_df, n_rows):
+    """按行重采样生成指定规模的候选池"""
+    rng = np.random.default_rng(42)
+    return base_df.iloc[rng.integers(0, len(base_df), n_rows)].reset_index(drop=True)
+
+
+def make_requests(n_requests, seed=7):
+    """从少量基础查询生成请求流：技能随机排序，top_n 与页码随机"""
+    rng = np.random.default_rng(seed)
+    requests = []
+    for _ in range(n_requests):
+        query = dict(BASE_QUERIES[rng.integers(len(BASE_QUERIES))])
+        query['skills'] = list(rng.permutation(query['skills']))
+        top_n = int(rng.choice([10, 20, 50]))
+        requests.append((query, top_n, top_n * int(rng.integers(0, 3))))
+    return requests
+
+
+def mean_ms(index, requests):
+    start = time.perf_counter()
+    for query, top_n, offset in requests:
+        index.match(query, top_n, offset)
+    return (time.perf_counter() - start) * 1000 / len(requests)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='匹配结果缓存基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5000, 100000, 1000000])
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    base_df = pd.read_csv(DATA_PATH)
+    requests = make_requests(args.requests)
+    print(f"{'候选池':>10} {'请求数':>8} {'无缓存(ms)':>12} {'缓存(ms)':>10} {'命中率':>8} {'加速比':>8}")
+    for n_rows in args.sizes:
+        df = make_dataset(base_df, n_rows)
+        uncached = CandidateIndex(df, cache_size=0)
+        cached = CandidateIndex(df)
+        for query, top_n, offset in requests[:20]:
+            assert cached.match(query, top_n, offset) == uncached.match(query, top_n, offset)
+        cached = CandidateIndex(df)
+
+        plain_ms = mean_ms(uncached, requests)
+        cached_ms = mean_ms(cached, requests)
+        hit_rate = cached.cache_hits / (cached.cache_hits + cached.cache_misses)
+        print(f"{n_rows:>10} {len(requests):>8} {plain_ms:>12.3f} {cached_ms:>10.3f} {hit_rate:>8.1%} "
+              f"{plain_ms / cached_ms:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+单条预测合批压测 - 多个并发客户端（线程或 asyncio 协程）持续发送单条预测请求，
+对比逐条预测与合批预测的吞吐量和 p50/p99 延迟
+
+用法:
+    python benchmarks/benchmark_micro_batching.py --concurrency 1 8 32 --requests 2000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from app.services.micro_batcher import MicroBatcher
+from app.services.predictor import ResumePredictor
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'Chinese_resume_data.csv')
+REGISTRY_DIR = os.path.join(os.path.dirname(__file__), '..', 'trained_models', 'registry')
+LEGACY_MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', 'trained_models', 'resume_model.pkl')
+
+
+def default_model_path():
+    from app.services.model_registry import ModelRegistry
+    version = ModelRegistry(REGISTRY_DIR).current()
+    return ModelRegistry(REGISTRY_DIR).path(version) if version else LEGACY_MODEL_PATH
+
+
+def run_threads(predict, records, concurrency):
+    """concurrency 个线程各自依次发送请求，返回 (总用时秒, 每个请求的延迟毫秒)"""
+    latencies = [[] for _ in range(concurrency)]
+
+    def client(i):
+        for record in records[i::concurrency]:
+            start = time.perf_counter()
+            predict(record)
+            latencies[i].append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, np.concatenate(latencies)
+
+
+def run_asyncio(predict, records, concurrency):
+    """concurrency 个协程各自依次发送请求（模拟 ASGI 服务），返回 (总用时秒, 每个请求的延迟毫秒)"""
+    async def client(i, latencies):
+        for record in records[i::concurrency]:
+            start = time.perf_counter()
+            await predict(record)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    async def main():
+        latencies = []
+        start = time.perf_counter()
+        await asyncio.gather(*(client(i, latencies) for i in range(concurrency)))
+        return time.perf_counter() - start, np.array(latencies)
+
+    return asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='单条预测合批压测')
+    parser.add_argument('--model', default=None, help='模型产物目录或旧版 .pkl 文件（默认为注册表当前版本）')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--max-wait-ms', type=float, default=MicroBatcher.MAX_WAIT_MS)
+    parser.add_argument('--max-batch-size', type=int, default=MicroBatcher.MAX_BATCH_SIZE)
+    args = parser.parse_args()
+
+    # 不使用预测结果缓存，每个请求都真正预测
+    predictor = ResumePredictor(args.model or default_model_path())
+    batcher = MicroBatcher(lambda: predictor, args.max_batch_size, args.max_wait_ms)
+    df = pd.read_csv(DATA_PATH)
+    records = [{k: (None if pd.isna(v) else v) for k, v in row.items()} for row in df.to_dict('records')]
+    records = [records[i % len(records)] for i in range(args.requests)]
+
+    async def direct_async(record):
+        # 逐条预测会阻塞事件循环，按 ASGI 服务的常见做法放到线程池执行
+        return await asyncio.get_running_loop().run_in_executor(None, predictor.predict_single, record)
+
+    modes = [
+        ('线程', '逐条', lambda c: run_threads(predictor.predict_single, records, c)),
+        ('线程', '合批', lambda c: run_threads(batcher.predict, records, c)),
+        ('asyncio', '逐条', lambda c: run_asyncio(direct_async, records, c)),
+        ('asyncio', '合批', lambda c: run_asyncio(batcher.predict_async, records, c)),
+    ]
+    print(f"{'服务':>8} {'方式':>6} {'并发':>6} {'吞吐(请求/s)':>14} {'p50(ms)':>10} {'p99(ms)':>10} {'平均批大小':>10}")
+    for concurrency in args.concurrency:
+        for server, mode, run in modes:
+            before = batcher.stats()
+            seconds, latencies = run(concurrency)
+            after = batcher.stats()
+            batches = after['batches'] - before['batches']
+            batch_size = (after['requests'] - before['requests']) / batches if batches else 1.0
+            print(f"{server:>8} {mode:>6} {concurrency:>6} {len(records) / seconds:>14.0f} "
+                  f"{np.percentile(latencies, 50):>10.2f} {np.percentile(latencies, 99):>10.2f} {batch_size:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
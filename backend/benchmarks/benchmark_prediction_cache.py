@@ -0,0 +1,83 @@
+"""
+预测结果缓存基准测试 - 对比无缓存、缓存未命中、进程内命中与（另一进程写入的）SQLite 共享存储命中的批量预测用时
+
+用法:
+    python benchmarks/benchmark_prediction_cache.py --batch-sizes 1 100 1000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from app.services.prediction_cache import PredictionCache
+from app.services.predictor import ResumePredictor
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'Chinese_resume_data.csv')
+REGISTRY_DIR = os.path.join(os.path.dirname(__file__), '..', 'trained_models', 'registry')
+LEGACY_MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', 'trained_models', 'resume_model.pkl')
+
+
+def median_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def default_model_path():
+    from app.services.model_registry import ModelRegistry
+    version = ModelRegistry(REGISTRY_DIR).current()
+    return ModelRegistry(REGISTRY_DIR).path(version) if version else LEGACY_MODEL_PATH
+
+
+def main():
+    parser = argparse.ArgumentParser(description='预测结果缓存基准测试')
+    parser.add_argument('--model', default=None, help='模型产物目录或旧版 .pkl 文件（默认为注册表当前版本）')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    model_path = args.model or default_model_path()
+    df = pd.read_csv(DATA_PATH)
+    records = [{k: (None if pd.isna(v) else v) for k, v in row.items()} for row in df.to_dict('records')]
+    plain = ResumePredictor(model_path)
+
+    print(f"{'批大小':>8} {'无缓存(ms)':>12} {'未命中(ms)':>12} {'进程内命中(ms)':>14} {'共享存储命中(ms)':>16} {'加速比':>8}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for batch_size in args.batch_sizes:
+            batch = records[:batch_size]
+            expected = plain.predict_batch(batch)
+            no_cache_ms = median_ms(lambda: plain.predict_batch(batch), args.repeat)
+
+            # 每次都使用新的缓存，统计未命中（含写入共享存储）的开销
+            db_path = os.path.join(tmp_dir, f'cache_{batch_size}.sqlite')
+
+            def cold():
+                ResumePredictor(model_path, cache=PredictionCache(db_path=db_path)).predict_batch(batch)
+                os.remove(db_path)
+            miss_ms = median_ms(cold, args.repeat)
+
+            writer = ResumePredictor(model_path, cache=PredictionCache(db_path=db_path))
+            writer.predict_batch(batch)
+            hit_ms = median_ms(lambda: writer.predict_batch(batch), args.repeat)
+            assert writer.predict_batch(batch) == expected
+
+            # 模拟另一个工作进程：进程内缓存为空，从共享存储读取
+            def shared():
+                ResumePredictor(model_path, cache=PredictionCache(db_path=db_path)).predict_batch(batch)
+            shared_ms = median_ms(shared, args.repeat)
+
+            print(f"{batch_size:>8} {no_cache_ms:>12.2f} {miss_ms:>12.2f} {hit_ms:>14.2f} {shared_ms:>16.2f} "
+                  f"{no_cache_ms / hit_ms:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
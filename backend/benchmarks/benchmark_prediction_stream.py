@@ -0,0 +1,113 @@
+"""
+流式批量预测基准测试 - 在全新的子进程中分别通过 /api/predict/batch（整体JSON）与 /api/predict/stream（NDJSON/CSV）
+预测同一批简历，统计用时与峰值内存
+
+用法:
+    python benchmarks/benchmark_prediction_stream.py --sizes 10000 50000 100000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BACKEND_DIR, '..', 'Chinese_resume_data.csv')
+REGISTRY_DIR = os.path.join(BACKEND_DIR, 'trained_models', 'registry')
+LEGACY_MODEL_PATH = os.path.join(BACKEND_DIR, 'trained_models', 'resume_model.pkl')
+
+# 子进程中执行：只加载模型，不加载简历数据；预测结果缓存关闭
+CHILD_SCRIPT = """
+import importlib.util, json, os, sys, time
+
+def peak_rss_mb():
+    # 进程的内存峰值（VmHWM 随 exec 重置，不含父进程 fork 时的内存）
+    with open('/proc/self/status') as f:
+        return next(int(line.split()[1]) for line in f if line.startswith('VmHWM')) / 1024
+
+sys.path.insert(0, {backend!r})
+spec = importlib.util.spec_from_file_location('resume_api', os.path.join({backend!r}, 'app.py'))
+api = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(api)
+api.predictor = api.ResumePredictor({model!r})
+client = api.app.test_client()
+base_rss = peak_rss_mb()
+
+start = time.perf_counter()
+if {mode!r} == 'batch':
+    with open({path!r}, 'rb') as f:
+        response = client.post('/api/predict/batch', data=f.read(), content_type='application/json')
+    rows = len(response.get_json()['results'])
+else:
+    with open({path!r}, 'rb') as f:
+        response = client.post('/api/predict/stream', input_stream=f, content_length=os.path.getsize({path!r}),
+                               content_type={content_type!r}, buffered=False)
+        rows = sum(chunk.count(b'\\n') for chunk in response.response)
+print(json.dumps({{
+    'seconds': time.perf_counter() - start,
+    'rows': rows,
+    'base_rss_mb': base_rss,
+    'peak_rss_mb': peak_rss_mb()
+}}))
+"""
+
+
+def default_model_path():
+    sys.path.append(BACKEND_DIR)
+    from app.services.model_registry import ModelRegistry
+    version = ModelRegistry(REGISTRY_DIR).current()
+    return ModelRegistry(REGISTRY_DIR).path(version) if version else LEGACY_MODEL_PATH
+
+
+def make_dataset(base_df, n_rows):
+    """按行重采样生成指定规模的数据集"""
+    rng = np.random.default_rng(42)
+    return base_df.iloc[rng.integers(0, len(base_df), n_rows)].reset_index(drop=True)
+
+
+def run(model_path, mode, path, content_type=None):
+    script = CHILD_SCRIPT.format(backend=BACKEND_DIR, model=model_path, mode=mode, path=path,
+                                 content_type=content_type)
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='流式批量预测基准测试')
+    parser.add_argument('--model', default=None, help='模型产物目录或旧版 .pkl 文件（默认为注册表当前版本）')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 50000, 100000])
+    args = parser.parse_args()
+
+    model_path = args.model or default_model_path()
+    base_df = pd.read_csv(DATA_PATH)
+    print(f"{'简历数':>8} {'方式':>14} {'用时(s)':>8} {'吞吐(条/s)':>12} {'基线内存(MB)':>12} {'峰值内存(MB)':>12}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_rows in args.sizes:
+            df = make_dataset(base_df, n_rows)
+            csv_path = os.path.join(tmp_dir, 'resumes.csv')
+            df.to_csv(csv_path, index=False)
+            records = df.astype(object).where(df.notna(), None).to_dict('records')
+            json_path = os.path.join(tmp_dir, 'resumes.json')
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump({'resumes': records}, f, ensure_ascii=False)
+            ndjson_path = os.path.join(tmp_dir, 'resumes.ndjson')
+            with open(ndjson_path, 'w', encoding='utf-8') as f:
+                f.writelines(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+            del records
+
+            for mode, result in [
+                ('batch JSON', run(model_path, 'batch', json_path)),
+                ('stream NDJSON', run(model_path, 'stream', ndjson_path, 'application/x-ndjson')),
+                ('stream CSV', run(model_path, 'stream', csv_path, 'text/csv')),
+            ]:
+                assert result['rows'] == n_rows, result
+                print(f"{n_rows:>8} {mode:>14} {result['seconds']:>8.2f} {n_rows / result['seconds']:>12.0f} "
+                      f"{result['base_rss_mb']:>12.1f} {result['peak_rss_mb']:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
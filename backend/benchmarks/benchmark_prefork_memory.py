@@ -0,0 +1,156 @@
+"""
+预先 fork 服务内存基准测试 - 分别以主进程预加载（写时复制共享）和每个工作进程各自初始化两种方式启动 serve.py，
+发送一轮混合请求后统计每个工作进程的独占内存（USS）与全部进程的总内存（PSS 之和）
+
+用法:
+    python benchmarks/benchmark_prefork_memory.py --workers 1 4 16 --requests 400
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BACKEND_DIR, '..', 'Chinese_resume_data.csv')
+
+SKILLS = ['Python', 'Java', 'MySQL', 'Vue.js', 'React', 'Docker/Kubernetes', 'TensorFlow/PyTorch']
+
+
+def smaps_rollup(pid):
+    """进程内存统计（kB）"""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                values[parts[0].rstrip(':')] = int(parts[1])
+    return values
+
+
+def children(pid):
+    with open(f'/proc/{pid}/task/{pid}/children') as f:
+        return [int(child) for child in f.read().split()]
+
+
+def request(base_url, path, payload=None):
+    data = None if payload is None else json.dumps(payload).encode('utf-8')
+    req = urllib.request.Request(base_url + path, data=data, headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(req, timeout=60) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def make_dataset(base_df, n_rows):
+    """按行重采样生成指定规模的候选池（简历编号重新编排）"""
+    rng = np.random.default_rng(42)
+    df = base_df.iloc[rng.integers(0, len(base_df), n_rows)].reset_index(drop=True)
+    df['简历编号'] = np.arange(n_rows)
+    return df
+
+
+def make_requests(df, n_requests, seed=0):
+    """混合请求：简历列表翻页、简历详情、岗位匹配、单条预测、统计"""
+    rng = np.random.default_rng(seed)
+    records = [{k: (None if pd.isna(v) else v) for k, v in row.items()} for row in df.to_dict('records')]
+    requests = []
+    for i in range(n_requests):
+        kind = i % 5
+        if kind == 0:
+            requests.append((f'/api/resume/list?page={rng.integers(1, len(df) // 20)}&page_size=20', None))
+        elif kind == 1:
+            requests.append((f'/api/resume/{int(df["简历编号"].iloc[rng.integers(len(df))])}', None))
+        elif kind == 2:
+            skills = list(rng.choice(SKILLS, size=2, replace=False))
+            requests.append(('/api/match/candidates', {'skills': skills, 'top_n': 20, 'ml_weight': 0.3}))
+        elif kind == 3:
+            requests.append(('/api/predict/single', records[rng.integers(len(records))]))
+        else:
+            requests.append(('/api/statistics/overview', None))
+    return requests
+
+
+def measure(data_path, workers, preload, requests, port, clients):
+    command = [sys.executable, os.path.join(BACKEND_DIR, 'serve.py'), '--workers', str(workers),
+               '--bind', f'127.0.0.1:{port}', '--data', data_path]
+    if not preload:
+        command.append('--no-preload')
+    base_url = f'http://127.0.0.1:{port}'
+    start = time.perf_counter()
+    server = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+    try:
+        # 等待全部工作进程启动并就绪
+        while True:
+            try:
+                if request(base_url, '/api/health')[0] == 200 and len(children(server.pid)) == workers:
+                    break
+            except OSError:
+                pass
+            if server.poll() is not None:
+                raise RuntimeError('服务启动失败')
+            time.sleep(0.2)
+        startup_seconds = time.perf_counter() - start
+
+        errors = []
+
+        def client(i):
+            for path, payload in requests[i::clients]:
+                status, _ = request(base_url, path, payload)
+                if status != 200:
+                    errors.append((path, status))
+
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise RuntimeError(f'请求失败: {errors[:3]}')
+        time.sleep(1)
+
+        master = smaps_rollup(server.pid)
+        stats = [smaps_rollup(pid) for pid in children(server.pid)]
+        uss = [s['Private_Clean'] + s['Private_Dirty'] for s in stats]
+        total_pss = master['Pss'] + sum(s['Pss'] for s in stats)
+        return startup_seconds, float(np.mean(uss)) / 1024, total_pss / 1024, master['Rss'] / 1024
+    finally:
+        os.killpg(server.pid, signal.SIGTERM)
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='预先 fork 服务内存基准测试')
+    parser.add_argument('--rows', type=int, default=100000, help='候选池规模（由数据集重采样生成）')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--port', type=int, default=5101)
+    args = parser.parse_args()
+
+    df = make_dataset(pd.read_csv(DATA_PATH), args.rows)
+    requests = make_requests(df, args.requests)
+    print(f"候选池: {len(df)} 条记录")
+    print(f"{'方式':>10} {'工作进程':>8} {'启动(s)':>8} {'每进程独占(MB)':>16} {'总内存(MB)':>12} {'主进程RSS(MB)':>14}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_path = os.path.join(tmp_dir, 'resumes.csv')
+        df.to_csv(data_path, index=False)
+        for workers in args.workers:
+            for preload, mode in [(False, '各自初始化'), (True, '预加载')]:
+                startup, uss, total, master_rss = measure(
+                    data_path, workers, preload, requests, args.port, args.clients
+                )
+                print(f"{mode:>10} {workers:>8} {startup:>8.1f} {uss:>16.1f} {total:>12.1f} {master_rss:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
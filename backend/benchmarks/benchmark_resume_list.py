@@ -0,0 +1,87 @@
+"""
+简历列表分页基准测试 - 对比复制过滤 DataFrame 与简历列表索引的单页延迟
+
+用法:
+    python benchmarks/benchmark_resume_list.py --sizes 5000 100000 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from app.services.resume_index import ResumeIndex
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'Chinese_resume_data.csv')
+
+QUERIES = [
+    ('全部-首页', {}, 1),
+    ('岗位-首页', {'position': '后端开发工程师'}, 1),
+    ('岗位-深页', {'position': '后端开发工程师'}, 2000),
+    ('多字段-首页', {'position': '算法工程师', 'education': '本科', 'english': '英语四级', 'result': '通过'}, 1),
+    ('多字段-深页', {'position': '算法工程师', 'education': '本科', 'english': '英语四级', 'result': '通过'}, 500),
+]
+
+PAGE_SIZE = 20
+
+
+def make_dataset(base_df, n_rows):
+    """按行重采样生成指定规模的简历库"""
+    rng = np.random.default_rng(42)
+    return base_df.iloc[rng.integers(0, len(base_df), n_rows)].reset_index(drop=True)
+
+
+def median_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def copy_filter_page(df, filters, page):
+    """原实现：复制整个 DataFrame，布尔过滤后切片"""
+    filtered_df = df.copy()
+    for field, value in filters.items():
+        filtered_df = filtered_df[filtered_df[ResumeIndex.FILTER_COLUMNS[field]] == value]
+    start_idx = (page - 1) * PAGE_SIZE
+    return filtered_df.iloc[start_idx:start_idx + PAGE_SIZE].fillna('NULL').to_dict('records'), len(filtered_df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='简历列表分页基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    base_df = pd.read_csv(DATA_PATH)
+    print(f"{'简历数':>10} {'查询':>10} {'索引构建(s)':>12} {'复制过滤(ms)':>12} {'页码(ms)':>10} {'游标(ms)':>10}")
+
+    for n_rows in args.sizes:
+        df = make_dataset(base_df, n_rows)
+        start = time.perf_counter()
+        index = ResumeIndex(df)
+        build_time = time.perf_counter() - start
+
+        for name, filters, page in QUERIES:
+            expected, total = copy_filter_page(df, filters, page)
+            records, index_total = index.page(filters, page, PAGE_SIZE)
+            assert records == expected and index_total == total
+
+            # 游标取为目标页第一条的行号，模拟逐页翻到该页后的请求
+            rows = index.filter_rows(filters)
+            first = (page - 1) * PAGE_SIZE
+            cursor = first if rows is None else int(rows[min(first, len(rows) - 1)])
+
+            copy_ms = median_ms(lambda: copy_filter_page(df, filters, page), max(args.repeat // 4, 1))
+            page_ms = median_ms(lambda: index.page(filters, page, PAGE_SIZE), args.repeat)
+            cursor_ms = median_ms(lambda: index.page_after(filters, cursor, PAGE_SIZE), args.repeat)
+            print(f"{n_rows:>10} {name:>10} {build_time:>12.2f} {copy_ms:>12.2f} {page_ms:>10.2f} {cursor_ms:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+简历详情查询基准测试 - 对比全表比较过滤与主键索引的单条/批量查询延迟
+
+用法:
+    python benchmarks/benchmark_resume_lookup.py --sizes 5000 100000 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from app.services.resume_index import ResumeIndex
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'Chinese_resume_data.csv')
+
+
+def make_dataset(base_df, n_rows):
+    """按行重采样生成指定规模的简历库，简历编号重新连续编号"""
+    rng = np.random.default_rng(42)
+    df = base_df.iloc[rng.integers(0, len(base_df), n_rows)].reset_index(drop=True)
+    df['简历编号'] = np.arange(n_rows)
+    return df
+
+
+def median_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='简历详情查询基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5000, 100000, 1000000])
+    parser.add_argument('--batch', type=int, default=100, help='批量查询的编号个数')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    base_df = pd.read_csv(DATA_PATH)
+    print(f"{'简历数':>10} {'索引构建(s)':>12} {'全表过滤(ms)':>12} {'主键单条(ms)':>12} "
+          f"{'逐条x' + str(args.batch) + '(ms)':>14} {'批量(ms)':>10}")
+
+    for n_rows in args.sizes:
+        df = make_dataset(base_df, n_rows)
+        start = time.perf_counter()
+        index = ResumeIndex(df)
+        build_time = time.perf_counter() - start
+
+        rng = np.random.default_rng(0)
+        resume_id = int(rng.integers(0, n_rows))
+        batch_ids = rng.integers(0, n_rows, args.batch).tolist()
+
+        scan_ms = median_ms(lambda: df[df['简历编号'] == resume_id].to_dict('records'), args.repeat)
+        single_ms = median_ms(lambda: index.to_json(index.lookup_rows([resume_id])), args.repeat)
+        loop_ms = median_ms(
+            lambda: [index.to_json(index.lookup_rows([value])) for value in batch_ids], max(args.repeat // 4, 1)
+        )
+        bulk_ms = median_ms(lambda: index.to_json(index.lookup_rows(batch_ids)), args.repeat)
+        print(f"{n_rows:>10} {build_time:>12.2f} {scan_ms:>12.2f} {single_ms:>12.3f} {loop_ms:>14.2f} {bulk_ms:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+后台批量打分任务基准测试 - 统计任务吞吐，以及任务运行期间在线单条预测的延迟（对比工作进程是否降低调度优先级）
+
+用法:
+    python benchmarks/benchmark_scoring_jobs.py --rows 200000 --requests 300
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+from app.services.model_registry import ModelRegistry
+from app.services.predictor import ResumePredictor
+from app.services.scoring_jobs import FINISHED, ScoringJobs
+
+DATA_PATH = os.path.join(BACKEND_DIR, '..', 'Chinese_resume_data.csv')
+REGISTRY_DIR = os.path.join(BACKEND_DIR, 'trained_models', 'registry')
+LEGACY_MODEL_PATH = os.path.join(BACKEND_DIR, 'trained_models', 'resume_model.pkl')
+
+
+def default_model_path():
+    version = ModelRegistry(REGISTRY_DIR).current()
+    return ModelRegistry(REGISTRY_DIR).path(version) if version else LEGACY_MODEL_PATH
+
+
+def make_dataset(base_df, n_rows):
+    """按行重采样生成指定规模的数据集"""
+    rng = np.random.default_rng(42)
+    return base_df.iloc[rng.integers(0, len(base_df), n_rows)].reset_index(drop=True)
+
+
+def single_latencies(predictor, records, n_requests):
+    """逐条预测（与 /api/predict/single 相同的路径），返回每次的用时（ms）"""
+    latencies = []
+    for i in range(n_requests):
+        start = time.perf_counter()
+        predictor.predict_records([records[i % len(records)]])
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.array(latencies)
+
+
+def run_job(predictor, df, records, n_requests, nice):
+    """提交一个任务，在其运行期间测量单条预测延迟，返回（任务用时, 延迟数组）"""
+    with tempfile.TemporaryDirectory() as root:
+        jobs = ScoringJobs(root, poll_seconds=0.05)
+        jobs.NICE = nice
+        start = time.perf_counter()
+        job = jobs.submit_frame(df, predictor)
+        jobs.start()
+        # 等待工作进程开始打分后再测量
+        while jobs.get(job['id'])['completed_chunks'] == 0:
+            time.sleep(0.01)
+        latencies = single_latencies(predictor, records, n_requests)
+        while jobs.get(job['id'])['status'] not in FINISHED:
+            time.sleep(0.05)
+        seconds = time.perf_counter() - start
+        jobs.stop()
+        assert jobs.get(job['id'])['completed_rows'] == len(df)
+        return seconds, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='后台批量打分任务基准测试')
+    parser.add_argument('--model', default=None, help='模型产物目录或旧版 .pkl 文件（默认为注册表当前版本）')
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--requests', type=int, default=300, help='任务运行期间发送的单条预测数')
+    args = parser.parse_args()
+
+    predictor = ResumePredictor(args.model or default_model_path())
+    df = make_dataset(pd.read_csv(DATA_PATH), args.rows)
+    records = df.head(1000).astype(object).where(df.head(1000).notna(), None).to_dict('records')
+    single_latencies(predictor, records, 50)
+
+    print(f"任务规模: {len(df)} 条，CPU 核数: {os.cpu_count()}")
+    print(f"{'场景':>16} {'任务用时(s)':>12} {'任务吞吐(条/s)':>14} {'单条p50(ms)':>12} {'单条p99(ms)':>12}")
+    idle = single_latencies(predictor, records, args.requests)
+    print(f"{'无任务':>16} {'-':>12} {'-':>14} {np.percentile(idle, 50):>12.2f} {np.percentile(idle, 99):>12.2f}")
+    for nice, name in [(0, '任务 nice=0'), (ScoringJobs.NICE, f'任务 nice={ScoringJobs.NICE}')]:
+        seconds, latencies = run_job(predictor, df, records, args.requests, nice)
+        print(f"{name:>16} {seconds:>12.2f} {len(df) / seconds:>14.0f} "
+              f"{np.percentile(latencies, 50):>12.2f} {np.percentile(latencies, 99):>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+看板统计基准测试 - 对比每次请求重新计算与增量统计引擎的耗时
+
+用法:
+    python benchmarks/benchmark_statistics.py --sizes 5000 100000 1000000
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from app.services.statistics import ResumeStatistics
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'Chinese_resume_data.csv')
+
+
+def make_dataset(base_df, n_rows, seed=42):
+    """按行重采样生成指定规模的简历库"""
+    rng = np.random.default_rng(seed)
+    return base_df.iloc[rng.integers(0, len(base_df), n_rows)].reset_index(drop=True)
+
+
+def median_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def recompute_all(df):
+    """原实现：看板加载时三个接口各自从 DataFrame 重新计算"""
+    skill_stats = {}
+    for col in ResumeStatistics.SKILL_COLUMNS:
+        skills = []
+        for value in df[col].dropna():
+            if value != 'NULL':
+                skills.extend([s.strip() for s in str(value).split(',')])
+        skill_stats[col] = Counter(skills).most_common(10)
+
+    position_stats = df['意向岗位'].value_counts().to_dict()
+    for position in position_stats:
+        pos_df = df[df['意向岗位'] == position]
+        (pos_df['筛选结果'] == '通过').sum() / len(pos_df)
+
+    (df['筛选结果'] == '通过').sum()
+    df['学历层次'].value_counts().to_dict()
+    df['院校类别'].value_counts().to_dict()
+    df['年龄'].describe().to_dict()
+
+
+def read_all(statistics):
+    statistics.skill_stats()
+    statistics.position_stats()
+    statistics.overview()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='看板统计基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5000, 100000, 1000000])
+    parser.add_argument('--delta', type=int, default=100, help='每次增量追加的简历数')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    base_df = pd.read_csv(DATA_PATH)
+    print(f"{'简历数':>10} {'重新计算(ms)':>12} {'引擎构建(s)':>12} {'首次读取(ms)':>12} "
+          f"{'缓存读取(ms)':>12} {'追加+读取(ms)':>14}")
+
+    for n_rows in args.sizes:
+        df = make_dataset(base_df, n_rows)
+        recompute_ms = median_ms(lambda: recompute_all(df), max(args.repeat // 2, 1))
+
+        start = time.perf_counter()
+        statistics = ResumeStatistics(df)
+        build_time = time.perf_counter() - start
+
+        first_ms = median_ms(lambda: read_all(statistics), 1)
+        cached_ms = median_ms(lambda: read_all(statistics), args.repeat * 20)
+
+        delta = make_dataset(base_df, args.delta, seed=7)
+
+        def add_and_read():
+            statistics.add(delta)
+            read_all(statistics)
+
+        delta_ms = median_ms(add_and_read, args.repeat)
+        print(f"{n_rows:>10} {recompute_ms:>12.1f} {build_time:>12.2f} {first_ms:>12.2f} "
+              f"{cached_ms:>12.4f} {delta_ms:>14.2f}")
+
+
+if __name__ == '__main__':
+    main()
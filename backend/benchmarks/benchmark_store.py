@@ -0,0 +1,103 @@
+"""
+列式存储基准测试 - 对比CSV与列式存储的冷启动耗时和每个工作进程的内存占用
+
+每种方式同时启动 N 个工作进程，按服务启动时的路径 load_resume_data(..., shared=True) 各自加载数据，
+全部加载完成后读取 /proc/<pid>/smaps_rollup：RSS 为驻留内存，PSS 按共享进程数均摊共享页，Private 为进程独占内存。
+列式存储中只有数值列以内存映射方式在进程间共享，文本列仍在每个进程中物化为 Python 对象。
+
+用法:
+    python benchmarks/benchmark_store.py --rows 1000000 --workers 4
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+import numpy as np
+import pandas as pd
+from app.utils.resume_store import ResumeStore
+
+DATA_PATH = os.path.join(BACKEND_DIR, '..', 'Chinese_resume_data.csv')
+
+
+def memory_kb(pid):
+    """读取进程的 RSS / PSS / 独占内存（KB）"""
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ('Rss:', 'Pss:', 'Private_Clean:', 'Private_Dirty:'):
+                fields[parts[0][:-1]] = int(parts[1])
+    return fields['Rss'], fields['Pss'], fields['Private_Clean'] + fields['Private_Dirty']
+
+
+def child(csv_path, store_dir):
+    """工作进程：与服务启动时相同的方式加载数据，报告耗时后等待父进程采样内存"""
+    start = time.perf_counter()
+    from app.utils.resume_store import load_resume_data
+
+    df = load_resume_data(csv_path, store_dir, shared=True)
+    # 访问全部数值，确保内存映射的页面已读入
+    df.select_dtypes('number').sum()
+
+    print(json.dumps({'seconds': time.perf_counter() - start}), flush=True)
+    sys.stdin.readline()
+
+
+def run_mode(csv_path, store_dir, workers):
+    """同时启动 workers 个进程加载数据并采样内存"""
+    procs = [
+        subprocess.Popen(
+            [sys.executable, __file__, '--child', csv_path, store_dir],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, cwd=BACKEND_DIR
+        )
+        for _ in range(workers)
+    ]
+    seconds = [json.loads(p.stdout.readline())['seconds'] for p in procs]
+    memory = np.array([memory_kb(p.pid) for p in procs]) / 1024
+    for p in procs:
+        p.stdin.write('\n')
+        p.stdin.flush()
+        p.wait()
+    return float(np.median(seconds)), memory.mean(axis=0), memory[:, 1].sum()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='列式存储基准测试')
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--child', nargs=2, metavar=('CSV', 'STORE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    base_df = pd.read_csv(DATA_PATH)
+    rng = np.random.default_rng(42)
+    df = base_df.iloc[rng.integers(0, len(base_df), args.rows)].reset_index(drop=True)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, 'resumes.csv')
+        df.to_csv(csv_path, index=False)
+        del base_df, df
+        start = time.perf_counter()
+        ResumeStore.from_csv(csv_path, os.path.join(tmp_dir, 'resumes.store'))
+        print(f"数据规模: {args.rows} 行, 转换耗时 {time.perf_counter() - start:.2f}s, 工作进程数 {args.workers}")
+
+        print(f"{'方式':<14} {'冷启动(s)':>10} {'RSS(MB)':>10} {'PSS(MB)':>10} {'独占(MB)':>10} {'PSS合计(MB)':>12}")
+        # 指向不存在的存储目录时 load_resume_data 直接读取CSV
+        for mode, store_dir in [('csv', os.path.join(tmp_dir, 'missing.store')),
+                                ('store', os.path.join(tmp_dir, 'resumes.store'))]:
+            seconds, (rss, pss, private), total_pss = run_mode(csv_path, store_dir, args.workers)
+            print(f"{mode:<14} {seconds:>10.2f} {rss:>10.1f} {pss:>10.1f} {private:>10.1f} {total_pss:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+树模型推理基准测试 - 对比原集成模型 predict_proba 与编译后的树模型推理引擎
+
+用法:
+    python benchmarks/benchmark_tree_engine.py --model trained_models/resume_model.pkl --batch-sizes 1 100 5000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import joblib
+import numpy as np
+import pandas as pd
+from app.services.tree_engine import TreeEnsemble
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'Chinese_resume_data.csv')
+MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', 'trained_models', 'resume_model.pkl')
+
+
+def median_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='树模型推理基准测试')
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 100, 5000])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    data = joblib.load(args.model)
+    model, feature_names = data['model'], data['feature_names']
+    df = pd.read_csv(DATA_PATH)
+    features, _ = data['data_processor'].process_training_data(df)
+    features = features.reindex(columns=feature_names, fill_value=0)
+
+    start = time.perf_counter()
+    engine = TreeEnsemble.from_model(model, feature_names)
+    print(f"编译: {len(engine.roots)} 棵树, {len(engine.feature)} 个节点, {time.perf_counter() - start:.2f}s")
+
+    expected = model.predict_proba(features)
+    actual = engine.predict_proba(features.to_numpy(dtype=np.float64))
+    print(f"概率最大误差: {np.abs(expected - actual).max():.2e}")
+
+    print(f"{'批大小':>8} {'原模型(ms)':>12} {'推理引擎(ms)':>12} {'加速比':>8}")
+    for batch_size in args.batch_sizes:
+        batch = features.iloc[:batch_size]
+        matrix = batch.to_numpy(dtype=np.float64)
+        model_ms = median_ms(lambda: model.predict_proba(batch), args.repeat)
+        engine_ms = median_ms(lambda: engine.predict_proba(matrix), args.repeat)
+        print(f"{batch_size:>8} {model_ms:>12.2f} {engine_ms:>12.2f} {model_ms / engine_ms:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""
+列式存储转换脚本 - 将CSV数据集转换为内存映射的列式存储
+"""
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.resume_store import ResumeStore, default_store_dir
+
+
+def main():
+    default_csv = os.path.join(os.path.dirname(__file__), '..', 'Chinese_resume_data.csv')
+    parser = argparse.ArgumentParser(description='将CSV数据集转换为列式存储')
+    parser.add_argument('--csv', default=default_csv, help='源CSV文件路径')
+    parser.add_argument('--out', default=None, help='输出目录（默认与CSV同名的 .store 目录）')
+    args = parser.parse_args()
+
+    store_dir = args.out or default_store_dir(args.csv)
+
+    print("=" * 60)
+    print("列式存储转换")
+    print("=" * 60)
+    print(f"源文件: {args.csv}")
+
+    start = time.time()
+    store = ResumeStore.from_csv(args.csv, store_dir)
+    print(f"✓ 转换完成: {len(store)} 条记录, {len(store.columns)} 列, 用时 {time.time() - start:.2f}s")
+    print(f"  输出目录: {store_dir}")
+
+    for name in store.columns:
+        print(f"  - {name}: {store.kind(name)}")
+
+
+if __name__ == '__main__':
+    main()
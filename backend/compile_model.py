@@ -0,0 +1,70 @@
+"""
+模型编译脚本 - 将已训练的模型（旧版 .pkl 文件或模型产物目录）导出为模型注册表中的新版本
+（或单独的模型产物目录），其中的树模型推理数组不依赖 sklearn/xgboost/lightgbm
+"""
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from app.services.model_artifact import ModelArtifact
+from app.services.model_registry import ModelRegistry
+from app.services.model_trainer import ResumeModelTrainer
+from app.utils.resume_store import load_resume_data
+
+
+def main():
+    trained_models_dir = os.path.join(os.path.dirname(__file__), 'trained_models')
+    default_model = os.path.join(trained_models_dir, 'resume_model.pkl')
+    default_csv = os.path.join(os.path.dirname(__file__), '..', 'Chinese_resume_data.csv')
+    parser = argparse.ArgumentParser(description='将已训练的模型编译并导出为模型产物目录')
+    parser.add_argument('--model', default=default_model, help='模型产物目录或旧版 .pkl 模型文件')
+    parser.add_argument('--registry', default=os.path.join(trained_models_dir, 'registry'), help='模型注册表目录')
+    parser.add_argument('--no-promote', action='store_true', help='只保存为新版本，不发布')
+    parser.add_argument('--output', default=None, help='改为输出到单独的模型产物目录（不写入注册表）')
+    parser.add_argument('--csv', default=default_csv, help='用于校验编译结果的数据集')
+    parser.add_argument('--check-rows', type=int, default=5000, help='校验使用的行数（0 表示不校验）')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("树模型编译")
+    print("=" * 60)
+
+    trainer = ResumeModelTrainer(None)
+    model = trainer.load_model(args.model)
+    feature_names = trainer.feature_names
+    metrics = ModelArtifact.load(args.model).metrics if os.path.isdir(args.model) else None
+
+    start = time.time()
+    if args.output:
+        output = args.output
+        ModelArtifact.write(output, model, feature_names, trainer.data_processor, metrics=metrics)
+    else:
+        registry = ModelRegistry(args.registry)
+        output = registry.path(trainer.publish_model(model, registry, metrics=metrics, promote=not args.no_promote))
+    artifact = ModelArtifact.load(output)
+    engine = artifact.engine
+    if engine is None:
+        print("✗ 模型不支持编译")
+        sys.exit(1)
+    print(f"✓ 编译完成: {len(engine.roots)} 棵树, {len(engine.feature)} 个节点, 用时 {time.time() - start:.2f}s")
+    print(f"  输出目录: {output}（版本 {artifact.version}）")
+
+    if args.check_rows and os.path.exists(args.csv):
+        df = load_resume_data(args.csv).head(args.check_rows)
+        features, _ = trainer.data_processor.process_training_data(df)
+        features = features.reindex(columns=feature_names, fill_value=0)
+        expected = model.predict_proba(features)
+        actual = engine.predict_proba(features.to_numpy(dtype=np.float64))
+        max_diff = float(np.abs(expected - actual).max())
+        print(f"  校验 {len(df)} 条: 概率最大误差 {max_diff:.2e}")
+        if max_diff > 1e-6:
+            print("✗ 编译结果与原模型不一致")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
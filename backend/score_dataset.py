@@ -0,0 +1,212 @@
+"""
+离线批量打分脚本 - 用保存的模型为整个数据集（CSV 或列式存储）计算通过概率
+
+输入按行切分为多个分区，由进程池并行处理：每个分区读取所需的列，用 ResumeDataProcessor 做一次特征工程、
+一次批量 predict_proba，结果（简历编号、通过概率）写为一个列式存储分区 part-NNNNN/，
+全部完成后写入 manifest.json（模型版本、判定阈值、各分区行数）。分区可用 ResumeStore(路径).to_dataframe() 读取。
+
+用法:
+    python score_dataset.py --workers 8
+    python score_dataset.py --data other_resumes.csv --out scores/other --partition-rows 100000
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from app.services.hyperparameter_search import available_cpus
+from app.services.model_registry import ModelRegistry, default_model_path
+from app.services.predictor import ResumePredictor
+from app.utils.resume_store import ResumeStore, default_store_dir
+
+TRAINED_MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'trained_models')
+ID_COLUMN = '简历编号'
+PROBABILITY_COLUMN = 'probability_pass'
+STAGES = [('read', '读取'), ('featurize', '特征工程'), ('infer', '推理'), ('write', '写入')]
+# 估算 CSV 每行字节数时采样的行数
+SAMPLE_LINES = 1000
+
+# 工作进程中的预测器，由进程池初始化函数加载，每个进程只加载一次
+_worker = {}
+
+
+def _init_worker(model_path):
+    _worker['predictor'] = ResumePredictor(model_path)
+
+
+def _read_partition(source, columns):
+    """读取一个分区：列式存储按行号范围读取；CSV 按字节范围读取（范围的起止都在行首）"""
+    if source['kind'] == 'store':
+        return ResumeStore(source['path']).to_dataframe(columns, source['start'], source['stop'])
+    with open(source['path'], 'rb') as f:
+        f.seek(source['start'])
+        data = f.read(source['stop'] - source['start'])
+    return pd.read_csv(io.BytesIO(data), header=None, names=source['header'], usecols=columns)
+
+
+def _score_partition(task):
+    """在工作进程中为一个分区打分，返回行数与各阶段用时"""
+    index, source, out_dir = task
+    predictor = _worker['predictor']
+    timings = {}
+
+    start = time.perf_counter()
+    df = _read_partition(source, [ID_COLUMN] + ResumePredictor.REQUIRED_FIELDS)
+    timings['read'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    features = predictor.featurize(df)
+    timings['featurize'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    probabilities = predictor.predict_features(features)[:, 1]
+    timings['infer'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scores = pd.DataFrame({ID_COLUMN: df[ID_COLUMN].to_numpy(), PROBABILITY_COLUMN: probabilities})
+    ResumeStore.write(scores, os.path.join(out_dir, f'part-{index:05d}'))
+    timings['write'] = time.perf_counter() - start
+
+    return index, len(df), timings
+
+
+def store_partitions(store_dir, partition_rows):
+    """列式存储按行号切分"""
+    total = len(ResumeStore(store_dir))
+    return [{'kind': 'store', 'path': store_dir, 'start': start, 'stop': min(start + partition_rows, total)}
+            for start in range(0, total, partition_rows)]
+
+
+def csv_partitions(csv_path, partition_rows):
+    """CSV 按字节切分，每个分区约 partition_rows 行，分界对齐到行首（要求字段中不含换行）"""
+    size = os.path.getsize(csv_path)
+    with open(csv_path, 'rb') as f:
+        header = pd.read_csv(io.BytesIO(f.readline()), nrows=0).columns.tolist()
+        data_start = f.tell()
+        sample = [line for _, line in zip(range(SAMPLE_LINES), f)]
+        if not sample:
+            return []
+        partition_bytes = max(1, partition_rows * sum(len(line) for line in sample) // len(sample))
+
+        bounds = [data_start]
+        while bounds[-1] < size:
+            f.seek(min(bounds[-1] + partition_bytes, size))
+            if f.tell() < size:
+                # 跳到下一行行首
+                f.readline()
+            bounds.append(f.tell())
+    return [{'kind': 'csv', 'path': csv_path, 'header': header, 'start': start, 'stop': stop}
+            for start, stop in zip(bounds, bounds[1:])]
+
+
+def main():
+    default_csv = os.path.join(os.path.dirname(__file__), '..', 'Chinese_resume_data.csv')
+    parser = argparse.ArgumentParser(description='用保存的模型为整个数据集离线打分')
+    parser.add_argument('--data', default=default_csv, help='简历数据CSV（存在与之一致的列式存储时读取列式存储）')
+    parser.add_argument('--store', default=None, help='直接指定列式存储目录')
+    parser.add_argument('--model', default=None, help='模型产物目录或旧版 .pkl 文件（默认与服务相同：注册表当前版本，其次为 trained_models/resume_model 目录或 .pkl）')
+    parser.add_argument('--out', default=None, help='输出目录（默认为 trained_models/scores/<数据集名>）')
+    parser.add_argument('--workers', type=int, default=None, help='工作进程数（默认为可用CPU核数）')
+    parser.add_argument('--partition-rows', type=int, default=ResumePredictor.POOL_CHUNK_ROWS,
+                        help='每个分区的行数，决定每个工作进程一次特征工程的内存占用')
+    args = parser.parse_args()
+
+    model_path = args.model or default_model_path(
+        ModelRegistry(os.path.join(TRAINED_MODELS_DIR, 'registry')), os.path.join(TRAINED_MODELS_DIR, 'resume_model')
+    )
+    workers = args.workers or available_cpus()
+    store_dir = args.store or default_store_dir(args.data)
+    if not os.path.exists(os.path.join(store_dir, 'meta.json')):
+        store_dir = None
+    elif args.store is None and not ResumeStore(store_dir).is_fresh(args.data):
+        print(f"! 列式存储已过期，改为读取CSV（可运行 python build_store.py 重新生成）: {store_dir}")
+        store_dir = None
+    source_path = store_dir or args.data
+    out_dir = args.out or os.path.join(
+        TRAINED_MODELS_DIR, 'scores', os.path.splitext(os.path.basename(os.path.normpath(source_path)))[0]
+    )
+
+    print("=" * 60)
+    print("离线批量打分")
+    print("=" * 60)
+    if not os.path.exists(model_path):
+        print(f"✗ 模型文件不存在: {model_path}")
+        print("  请先运行 python train_model.py 训练模型")
+        return
+    if not os.path.exists(source_path):
+        print(f"✗ 数据文件不存在: {source_path}")
+        return
+
+    start = time.perf_counter()
+    if store_dir:
+        partitions = store_partitions(store_dir, args.partition_rows)
+    else:
+        partitions = csv_partitions(args.data, args.partition_rows)
+    predictor = ResumePredictor(model_path)
+    print(f"模型: {model_path}")
+    print(f"数据: {source_path}（{'列式存储' if store_dir else 'CSV'}，{len(partitions)} 个分区）")
+    print(f"工作进程: {workers}")
+
+    # 清理上次的输出，manifest.json 最后写入，存在即表示输出完整
+    if os.path.isdir(out_dir):
+        for name in os.listdir(out_dir):
+            if name.startswith('part-') or name == 'manifest.json':
+                path = os.path.join(out_dir, name)
+                shutil.rmtree(path) if os.path.isdir(path) else os.remove(path)
+    os.makedirs(out_dir, exist_ok=True)
+
+    tasks = [(index, source, out_dir) for index, source in enumerate(partitions)]
+    rows = [0] * len(tasks)
+    timings = {stage: 0.0 for stage, _ in STAGES}
+    if workers == 1:
+        _init_worker(model_path)
+        results = map(_score_partition, tasks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(model_path,))
+        results = pool.imap_unordered(_score_partition, tasks)
+    try:
+        for done, (index, n_rows, partition_timings) in enumerate(results, 1):
+            rows[index] = n_rows
+            for stage, seconds in partition_timings.items():
+                timings[stage] += seconds
+            print(f"\r  已完成 {done}/{len(tasks)} 个分区", end='', flush=True)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    print()
+
+    manifest = {
+        'model_path': os.path.abspath(model_path),
+        'model_version': predictor.version,
+        'threshold': predictor.threshold,
+        'source': os.path.abspath(source_path),
+        'rows': sum(rows),
+        'columns': [ID_COLUMN, PROBABILITY_COLUMN],
+        'parts': [{'dir': f'part-{index:05d}', 'rows': n_rows} for index, n_rows in enumerate(rows)]
+    }
+    tmp_path = os.path.join(out_dir, 'manifest.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, os.path.join(out_dir, 'manifest.json'))
+    seconds = time.perf_counter() - start
+
+    total_rows = manifest['rows']
+    print(f"✓ 打分完成: {total_rows} 条记录, 用时 {seconds:.2f}s, {total_rows / seconds:.0f} 条/s")
+    print(f"  输出目录: {out_dir}")
+    print("  各阶段用时（全部工作进程合计）:")
+    stage_total = sum(timings.values()) or 1.0
+    for stage, name in STAGES:
+        print(f"    {name:<8} {timings[stage]:>8.2f}s {timings[stage] / stage_total:>7.1%}")
+
+
+if __name__ == '__main__':
+    main()
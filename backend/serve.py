@@ -0,0 +1,117 @@
+"""
+生产服务入口 - 主进程加载一次模型与简历数据，再 fork 出多个工作进程，以写时复制方式共享
+
+用法:
+    python serve.py --workers 4 --threads 8 --bind 0.0.0.0:5001
+"""
+import argparse
+import gc
+import importlib.util
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from gunicorn.app.base import BaseApplication
+
+from app.utils.resume_store import default_store_dir
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+# 预热用的匹配条件
+WARMUP_QUERY = {'position': '后端开发工程师', 'skills': ['Python', 'Java'], 'top_n': 10}
+
+
+def load_api():
+    """导入 app.py（与 app 包同名，按文件路径导入）"""
+    spec = importlib.util.spec_from_file_location('resume_api', APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def warm_up(api):
+    """在主进程中把各接口的惰性初始化（按需导入、首次调用时构建的结构）都走一遍，避免在每个工作进程中各做一次"""
+    client = api.app.test_client()
+    client.get('/api/health')
+    client.get('/api/resume/list?page=1&page_size=10')
+    if api.resume_df is not None and len(api.resume_df):
+        client.get(f"/api/resume/{int(api.resume_df[api.ResumeIndex.ID_COLUMN].iloc[0])}")
+    client.get('/api/statistics/skills')
+    client.post('/api/match/candidates', json=WARMUP_QUERY)
+    if api.predictor is not None and api.resume_df is not None:
+        api.predictor.predict_pool(api.resume_df.head(1))
+
+
+class PreforkApplication(BaseApplication):
+    """gunicorn 预先 fork 的服务
+
+    preload 为 True 时主进程执行 init_app 并预热，随后整理垃圾回收并 gc.freeze()：
+    此后 fork 出的工作进程共享主进程的全部对象，垃圾回收不再扫描（改写）这些对象所在的内存页。
+    模型热加载与批量打分任务调度线程在每个工作进程中各自启动。preload 为 False 时每个工作进程各自初始化（用于对比内存占用）。
+    """
+
+    def __init__(self, options, preload=True, data_path=None):
+        self.options = options
+        self.preload = preload
+        self.data_path = data_path
+        self.api = None
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+        self.cfg.set('preload_app', self.preload)
+        self.cfg.set('pre_fork', self.pre_fork)
+        self.cfg.set('post_fork', self.post_fork)
+
+    def load(self):
+        if self.api is None:
+            start = time.perf_counter()
+            self.api = load_api()
+            if self.data_path:
+                self.api.DATA_PATH = self.data_path
+                self.api.STORE_DIR = default_store_dir(self.data_path)
+            self.api.init_app(watch=not self.preload)
+            warm_up(self.api)
+            if self.preload:
+                gc.collect()
+                gc.freeze()
+            print(f"✓ 初始化完成（进程 {os.getpid()}，用时 {time.perf_counter() - start:.2f}s）")
+        return self.api.app
+
+    def pre_fork(self, server, worker):
+        # 重启工作进程前主进程中新建的对象同样冻结
+        gc.freeze()
+
+    def post_fork(self, server, worker):
+        if self.preload:
+            self.api.model_watcher.start()
+            self.api.scoring_jobs.start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='启动预先 fork 的生产服务')
+    parser.add_argument('--bind', default='0.0.0.0:5001')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=8, help='每个工作进程的线程数（单条预测在进程内合批）')
+    parser.add_argument('--timeout', type=int, default=60)
+    parser.add_argument('--data', default=None, help='简历数据CSV（默认为 app.py 中的 DATA_PATH）')
+    parser.add_argument('--no-preload', action='store_true', help='不在主进程中加载，每个工作进程各自初始化')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("智能简历筛选系统 - 生产服务")
+    print("=" * 60)
+    options = {
+        'bind': args.bind,
+        'workers': args.workers,
+        'threads': args.threads,
+        'worker_class': 'gthread',
+        'timeout': args.timeout,
+    }
+    PreforkApplication(options, preload=not args.no_preload, data_path=args.data).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,40 +1,92 @@
 """
 训练脚本 - 训练模型并保存
 """
+import argparse
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import pandas as pd
 from app.utils.data_processor import ResumeDataProcessor
+from app.utils.oversampling import BALANCE_METHODS
+from app.utils.resume_store import load_resume_data
+from app.services.model_registry import ModelRegistry
 from app.services.model_trainer import ResumeModelTrainer
+from app.services.streaming_trainer import StreamingModelTrainer
+
+TRAINED_MODELS_DIR = os.path.join(os.path.dirname(__file__), 'trained_models')
+REGISTRY_DIR = os.path.join(TRAINED_MODELS_DIR, 'registry')
+
+
+def train_streaming(args, data_path, registry):
+    """分块训练：数据不整体载入内存"""
+    data_processor = ResumeDataProcessor()
+    streaming = StreamingModelTrainer(
+        data_processor, os.path.join(TRAINED_MODELS_DIR, 'shards'),
+        memory_mb=args.memory_mb, balance=args.balance or 'weight'
+    )
+    streaming.prepare_shards(data_path)
+    model = streaming.train()
+    metrics = streaming.evaluate(model)
+    
+    trainer = ResumeModelTrainer(data_processor)
+    trainer.feature_names = streaming.feature_names
+    trainer.publish_model(model, registry, metrics=metrics, promote=not args.no_promote)
 
 
 def main():
+    parser = argparse.ArgumentParser(description='训练简历筛选模型')
+    parser.add_argument('--search', choices=['grid', 'halving', 'hyperband'], default='halving',
+                        help='XGBoost 超参数搜索方式（grid 为原穷举网格搜索）')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='不使用训练缓存（trained_models/cache），全部重新训练')
+    parser.add_argument('--csv', default=os.path.join(os.path.dirname(__file__), '..', 'Chinese_resume_data.csv'),
+                        help='训练数据集')
+    parser.add_argument('--streaming', action='store_true',
+                        help='分块训练（数据量超过内存时使用），只训练 XGBoost 与 LightGBM 集成')
+    parser.add_argument('--memory-mb', type=int, default=512, help='分块训练时每块数据的内存预算（MB）')
+    parser.add_argument('--balance', choices=BALANCE_METHODS, default=None,
+                        help='不平衡处理：smote（默认）/ approx_smote（近似近邻，大数据集）/ weight（类别权重）/ none；'
+                             '分块训练默认 weight，SMOTE 在块内进行')
+    parser.add_argument('--no-promote', action='store_true',
+                        help='只保存为注册表中的新版本，不发布（之后可通过 /api/models/rollback 发布）')
+    args = parser.parse_args()
+
     print("=" * 60)
     print("智能简历筛选系统 - 模型训练")
     print("=" * 60)
     
+    data_path = args.csv
+    registry = ModelRegistry(REGISTRY_DIR)
+    if args.streaming:
+        train_streaming(args, data_path, registry)
+        print("\n" + "=" * 60)
+        print("模型训练完成！")
+        print("=" * 60)
+        return
+    
     # 加载数据
     print("\n加载数据...")
-    data_path = os.path.join(os.path.dirname(__file__), '..', 'Chinese_resume_data.csv')
-    df = pd.read_csv(data_path)
+    df = load_resume_data(data_path)
     print(f"数据加载完成: {len(df)} 条记录")
     
     # 初始化数据处理器
     data_processor = ResumeDataProcessor()
     
     # 初始化训练器
-    trainer = ResumeModelTrainer(data_processor)
+    cache_dir = None if args.no_cache else os.path.join(TRAINED_MODELS_DIR, 'cache')
+    trainer = ResumeModelTrainer(data_processor, cache_dir=cache_dir)
     
     # 准备数据
-    X_train, X_test, y_train, y_test = trainer.prepare_data(df, use_smote=True)
+    X_train, X_test, y_train, y_test = trainer.prepare_data(df, balance=args.balance or 'smote')
     
     # 训练基线模型
     results = trainer.train_baseline_models(X_train, y_train, X_test, y_test)
     
     # 优化最佳模型
-    optimized_model = trainer.optimize_best_model(X_train, y_train, X_test, y_test)
+    journal_path = os.path.join(TRAINED_MODELS_DIR, 'xgb_search.journal.jsonl')
+    optimized_model = trainer.optimize_best_model(
+        X_train, y_train, X_test, y_test, search=args.search, journal_path=journal_path
+    )
     
     # 创建集成模型
     ensemble_model = trainer.create_ensemble_model(X_train, y_train, X_test, y_test)
@@ -51,8 +103,10 @@ def main():
         print(feature_imp.to_string(index=False))
     
     # 保存模型
-    model_path = os.path.join(os.path.dirname(__file__), 'trained_models', 'resume_model.pkl')
-    trainer.save_model(ensemble_model, model_path)
+    trainer.publish_model(ensemble_model, registry, promote=not args.no_promote)
+    
+    if trainer.cache is not None:
+        print(f"训练缓存: 复用 {trainer.cache.hits} 个模型, 新训练 {trainer.cache.misses} 个")
     
     print("\n" + "=" * 60)
     print("模型训练完成！")
@@ -1,8 +1,11 @@
 """
 数据集验证脚本 - 快速检查数据集
 """
-import pandas as pd
 import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.resume_store import default_store_dir, load_resume_data
 
 def validate_dataset():
     """验证数据集"""
@@ -12,14 +15,15 @@ def validate_dataset():
     
     data_path = os.path.join(os.path.dirname(__file__), '..', 'Chinese_resume_data.csv')
     
-    if not os.path.exists(data_path):
+    store_dir = default_store_dir(data_path)
+    if not os.path.exists(data_path) and not os.path.exists(store_dir):
         print(f"❌ 数据集文件不存在: {data_path}")
         return False
     
-    print(f"✅ 数据集文件存在: {data_path}")
+    print(f"✅ 数据集文件存在: {data_path if os.path.exists(data_path) else store_dir}")
     
     try:
-        df = pd.read_csv(data_path)
+        df = load_resume_data(data_path, store_dir)
         print(f"✅ 数据集加载成功")
         print(f"\n📊 数据集信息:")
         print(f"  - 总行数: {len(df)}")